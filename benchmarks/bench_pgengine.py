@@ -0,0 +1,191 @@
+"""End-to-end benchmarks of PGEngine against a PostgreSQL database with pgvector.
+
+Measures table provisioning latency, COPY ingest throughput, top-k search
+latency and recall@k per dimension and index type, and the cost of hybrid
+search fusion. Recall is measured against exact neighbours computed with
+NumPy on the generated data. Tables are created with a "bench_" prefix and
+dropped at the end.
+
+    docker run -d -e POSTGRES_PASSWORD=postgres -p 5432:5432 pgvector/pgvector:pg16
+    python benchmarks/bench_pgengine.py --rows 20000 --output pgengine.json
+
+Vectors of more than 2000 dimensions (3072 by default) are stored as halfvec,
+the only type pgvector can index at that size.
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+
+from common import (
+    clustered_vectors,
+    database_url,
+    exact_neighbors,
+    load_module,
+    recall_at_k,
+    summarize,
+    time_calls,
+    write_results,
+)
+
+
+def bench_provisioning(engine, modules, repeats: int) -> dict:
+    """Latency of creating a table with an HNSW index and a full-text search column."""
+    indexes = modules["indexes"]
+    hybrid_search_config = modules["hybrid_search_config"]
+    samples = time_calls(
+        lambda: engine.init_vectorstore_table(
+            "bench_provisioning",
+            384,
+            overwrite_existing=True,
+            vector_index=indexes.HNSWIndex(),
+            hybrid_search_config=hybrid_search_config.HybridSearchConfig(
+                tsv_column="content_tsv", index_name="bench_provisioning_tsv_index"
+            ),
+        ),
+        repeats,
+        warmup=1,
+    )
+    engine.drop_table("bench_provisioning")
+    return summarize(samples)
+
+
+def search_latency_and_recall(engine, table_name, queries, expected_ids, k, **search_options) -> dict:
+    """One query at a time for latency, then recall over all queries."""
+    found_ids = []
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        rows = engine.similarity_search_batch(table_name, [query], k, **search_options)[0]
+        samples.append(time.perf_counter() - start)
+        found_ids.append([str(row["langchain_id"]) for row in rows])
+    result = summarize(samples)
+    result["recall_at_k"] = recall_at_k(found_ids, expected_ids)
+    return result
+
+
+def bench_dimensions(engine, modules, dimensions: int, args) -> dict:
+    """Ingest, then search the table without an index and with each index type."""
+    indexes = modules["indexes"]
+    ingest = modules["ingest"]
+    storage_type = (
+        indexes.VectorStorageType.VECTOR
+        if dimensions <= indexes.INDEX_MAX_DIMENSIONS[indexes.VectorStorageType.VECTOR]
+        else indexes.VectorStorageType.HALFVEC
+    )
+    table_name = f"bench_search_{dimensions}"
+    data = clustered_vectors(args.rows, dimensions, seed=dimensions)
+    ids = [uuid.uuid4() for _ in range(args.rows)]
+    queries = clustered_vectors(args.queries, dimensions, seed=dimensions)
+    expected_ids = [
+        [str(ids[row]) for row in neighbors]
+        for neighbors in exact_neighbors(data, queries, args.k)
+    ]
+    results = {"storage_type": storage_type.value, "rows": args.rows}
+
+    engine.init_vectorstore_table(
+        table_name, dimensions, overwrite_existing=True, storage_type=storage_type
+    )
+    batches = [
+        ingest.EmbeddingBatch(
+            contents=[f"document {i}" for i in range(start, min(start + args.batch_size, args.rows))],
+            embeddings=data[start : start + args.batch_size],
+            ids=ids[start : start + args.batch_size],
+        )
+        for start in range(0, args.rows, args.batch_size)
+    ]
+    stats = engine.add_embeddings(table_name, batches)
+    results["ingest"] = {"rows": stats.rows, "seconds": stats.seconds, "rows_per_second": stats.rows_per_second}
+
+    search = dict(storage_type=storage_type)
+    results["exact"] = search_latency_and_recall(
+        engine, table_name, queries, expected_ids, args.k, **search
+    )
+
+    lists = max(10, int(math.sqrt(args.rows)))
+    index_configs = {
+        "hnsw": (
+            indexes.HNSWIndex(m=16, ef_construction=64),
+            indexes.HNSWQueryOptions(ef_search=args.ef_search),
+        ),
+        "ivfflat": (
+            indexes.IVFFlatIndex(lists=lists),
+            indexes.IVFFlatQueryOptions(probes=max(1, int(math.sqrt(lists)))),
+        ),
+    }
+    for index_type, (index, query_options) in index_configs.items():
+        start = time.perf_counter()
+        engine.apply_vector_index(table_name, index, storage_type=storage_type)
+        build_seconds = time.perf_counter() - start
+        results[index_type] = search_latency_and_recall(
+            engine, table_name, queries, expected_ids, args.k, query_options=query_options, **search
+        )
+        results[index_type]["build_seconds"] = build_seconds
+        results[index_type]["query_options"] = query_options.to_parameter()
+        engine.drop_secondary_indexes(table_name)
+
+    engine.drop_table(table_name)
+    return results
+
+
+def bench_fusion(modules, sizes: list[int], repeat: int) -> dict:
+    """CPU cost of fusing the vector and full-text results of one hybrid query."""
+    hybrid_search_config = modules["hybrid_search_config"]
+    results = {}
+    for size in sizes:
+        ids = [str(uuid.uuid4()) for _ in range(2 * size)]
+        # Half of each result list is found by both searches
+        primary = [
+            {"langchain_id": row_id, "content": "", "distance": random.random()}
+            for row_id in ids[:size]
+        ]
+        secondary = [
+            {"langchain_id": row_id, "content": "", "distance": random.random()}
+            for row_id in ids[size // 2 : size // 2 + size]
+        ]
+        for name in ("reciprocal_rank_fusion", "weighted_sum_ranking"):
+            fusion = getattr(hybrid_search_config, name)
+            results[f"{name}_{size}"] = summarize(
+                time_calls(lambda: fusion(primary, secondary, fetch_top_k=10), repeat)
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="SQLAlchemy URL of the database (default: $PGVECTOR_BENCH_URL or localhost)")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[384, 1536, 3072])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--provision-repeats", type=int, default=20)
+    parser.add_argument("--fusion-sizes", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    modules = {
+        name: load_module(name)
+        for name in ("engine", "indexes", "ingest", "hybrid_search_config")
+    }
+    engine = modules["engine"].PGEngine.from_connection_string(database_url(args.url))
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("url", "output")},
+        "provisioning": bench_provisioning(engine, modules, args.provision_repeats),
+        "search": {
+            str(dimensions): bench_dimensions(engine, modules, dimensions, args)
+            for dimensions in args.dimensions
+        },
+        "fusion": bench_fusion(modules, args.fusion_sizes, repeat=1000),
+        "statement_cache": engine.statement_cache_stats().to_dict(),
+    }
+    engine._run_as_sync(engine.close())
+    write_results("pgengine", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
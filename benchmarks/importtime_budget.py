@@ -0,0 +1,99 @@
+"""Import time budget of a Lambda handler module.
+
+Imports the handler in fresh interpreters with `python -X importtime`, which
+is what a Lambda cold start pays before the first invocation, and checks the
+result against importtime_budget.json: a ceiling on the median total import
+time and modules that must not be imported at all. Exits with status 1 when
+the budget is exceeded, so it can gate CI.
+
+    python benchmarks/importtime_budget.py --runs 5 --output importtime.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from common import INIT_PACKAGE, LAMBDAS_DIR, write_results
+
+BUDGET_FILE = Path(__file__).resolve().parent / "importtime_budget.json"
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import module in a fresh interpreter.
+
+    Args:
+        module (str): Dotted module name. An empty name imports nothing, which
+            gives the modules the interpreter loads at startup.
+
+    Returns:
+        dict[str, int]: Module name to its own import time in microseconds, for
+            every module loaded by the interpreter.
+    """
+    code = f"import importlib, sys; sys.path.insert(0, {str(LAMBDAS_DIR)!r})"
+    if module:
+        code += f"; importlib.import_module({module!r})"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default=f"{INIT_PACKAGE}.index")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to report")
+    parser.add_argument("--budget", default=str(BUDGET_FILE))
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    budget = json.loads(Path(args.budget).read_text())
+    startup = set(import_times(""))
+    # Only count what the handler import adds to a bare interpreter start
+    runs = [
+        {name: self_us for name, self_us in import_times(args.module).items() if name not in startup}
+        for _ in range(args.runs)
+    ]
+    totals = [sum(times.values()) for times in runs]
+    last = runs[-1]
+    slowest = sorted(last.items(), key=lambda item: item[1], reverse=True)[: args.top]
+    loaded_forbidden = sorted(
+        name
+        for name in last
+        if any(name == f or name.startswith(f + ".") for f in budget["forbidden_modules"])
+    )
+    total_ms = statistics.median(totals) / 1000
+
+    results = {
+        "module": args.module,
+        "runs": args.runs,
+        "total_ms": total_ms,
+        "modules_loaded": len(last),
+        "slowest_self_us": dict(slowest),
+        "budget": budget,
+        "forbidden_loaded": loaded_forbidden,
+        "within_budget": total_ms <= budget["max_total_ms"] and not loaded_forbidden,
+    }
+    write_results("importtime_budget", results, args.output)
+    if not results["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Tune hnsw.ef_search or ivfflat.probes of one vector store table.
+
+Samples query embeddings from the table (or loads them from a .npy file),
+computes their exact top-k neighbours with a sequential scan, then measures
+recall@k and p50/p99 latency for each value of the search parameter and
+prints the Pareto frontier. With --save, the fastest value reaching
+--target-recall is stored with PGEngine.save_query_options, and searches of
+the table without query options use it from then on; the other settings of
+the table's search profile are kept.
+
+    python benchmarks/tune_search.py --table document_embeddings --index-type hnsw --save
+"""
+
+import argparse
+import dataclasses
+
+from common import database_url, load_module, write_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="SQLAlchemy URL of the database (default: $PGVECTOR_BENCH_URL or localhost)")
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--schema", default="public")
+    parser.add_argument("--index-type", required=True, choices=["hnsw", "ivfflat"])
+    parser.add_argument("--values", type=int, nargs="+", help="ef_search or probes values to measure")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200, help="Number of embeddings to sample from the table")
+    parser.add_argument("--queries-file", help=".npy file of query embeddings to use instead of a sample")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--distance", default="cosine", help="l2, cosine, ip, hamming or jaccard")
+    parser.add_argument("--storage-type", default="vector")
+    parser.add_argument("--embedding-column", default="embedding")
+    parser.add_argument("--id-column", default="langchain_id")
+    parser.add_argument("--save", action="store_true", help="Save the recommended setting for the table")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    engine_module = load_module("engine")
+    indexes = load_module("indexes")
+    tuning = load_module("tuning")
+    engine = engine_module.PGEngine.from_connection_string(database_url(args.url))
+    storage_type = indexes.STORAGE_TYPE_ALIASES[args.storage_type]
+    columns = dict(
+        schema_name=args.schema,
+        embedding_column=args.embedding_column,
+        id_column=args.id_column,
+        storage_type=storage_type,
+    )
+
+    if args.queries_file:
+        import numpy as np
+
+        queries = np.load(args.queries_file)
+    else:
+        queries = tuning.sample_query_embeddings(
+            engine,
+            args.table,
+            args.queries,
+            # Only the embeddings are needed
+            metadata_json_column=None,
+            **columns,
+        )
+    result = tuning.sweep_query_options(
+        engine,
+        args.table,
+        queries,
+        tuning.query_options_grid(args.index_type, args.values),
+        args.k,
+        target_recall=args.target_recall,
+        distance_strategy=indexes.DISTANCE_STRATEGY_ALIASES[args.distance],
+        # Recall only needs the ids
+        metadata_json_column=None,
+        **columns,
+    )
+    results = result.to_dict()
+
+    recommended = result.recommended
+    results["saved"] = False
+    if args.save and recommended is not None:
+        # Keep the other settings of the table's saved search profile
+        saved = engine._run_as_sync(
+            engine._aload_query_options(args.table, schema_name=args.schema)
+        )
+        profile = dataclasses.replace(
+            indexes.SearchProfile.from_query_options(saved),
+            **dataclasses.asdict(recommended.query_options),
+        )
+        engine.save_query_options(
+            args.table,
+            profile,
+            schema_name=args.schema,
+            k=args.k,
+            recall=recommended.recall,
+        )
+        results["saved"] = True
+    engine._run_as_sync(engine.close())
+    write_results("tune_search", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import * as ec2 from 'aws-cdk-lib/aws-ec2';
 import * as path from 'path';
 import { PythonFunction } from '@aws-cdk/aws-lambda-python-alpha';
 import { Architecture } from "aws-cdk-lib/aws-lambda";
+import * as lambda from 'aws-cdk-lib/aws-lambda';
 import * as kms from 'aws-cdk-lib/aws-kms';
 
 export interface AwsAuroraPgvectorExtensionCreatorNestedStackProps extends NestedStackProps, AwsAuroraPgvectorExtensionCreatorBaseStackProps {
@@ -33,6 +34,7 @@ export interface AwsAuroraPgvectorExtensionCreatorNestedStackProps extends Neste
 
 export class AwsAuroraPgvectorExtensionCreatorNestedStack extends NestedStack {
     public readonly rdsPgExtensionInitFn: PythonFunction;
+    public readonly rdsPgOperatorsFn: lambda.Function;
 
     constructor(scope: Construct, id: string, props: AwsAuroraPgvectorExtensionCreatorNestedStackProps) {
         super(scope, id, props);
@@ -140,5 +142,53 @@ export class AwsAuroraPgvectorExtensionCreatorNestedStack extends NestedStack {
             vpcSubnets: vpcSubnetSelection,
         });
         this.rdsPgExtensionInitFn.applyRemovalPolicy(cdk.RemovalPolicy.DESTROY);
+
+        // Function to run similarity searches against the vector tables. Its handler
+        // imports PGEngine and friends relatively, so the bundle places the modules of
+        // the init function and the operators index.py in one package.
+        const operatorsPackage = 'aurora_pgvector_operators';
+        this.rdsPgOperatorsFn = new lambda.Function(this, `${props.resourcePrefix}-rdsPgOperatorsFn`, {
+            runtime: cdk.aws_lambda.Runtime.PYTHON_3_13,
+            code: lambda.Code.fromAsset(path.join(__dirname, '../src/lambdas'), {
+                exclude: ['api-key-authorizer', '**/__pycache__'],
+                bundling: {
+                    image: cdk.aws_lambda.Runtime.PYTHON_3_13.bundlingImage,
+                    platform: props.lambdaArchitecture.dockerPlatform,
+                    command: [
+                        'bash', '-c', [
+                            'pip install --no-cache-dir -r aurora-pgvector-operators/requirements.txt -t /asset-output',
+                            `mkdir -p /asset-output/${operatorsPackage}`,
+                            `touch /asset-output/${operatorsPackage}/__init__.py`,
+                            `find aurora-pgvector-extension-init -maxdepth 1 -name '*.py' ! -name index.py -exec cp {} /asset-output/${operatorsPackage}/ \\;`,
+                            `cp aurora-pgvector-operators/index.py /asset-output/${operatorsPackage}/index.py`,
+                        ].join(' && '),
+                    ],
+                },
+            }),
+            handler: `${operatorsPackage}.index.handler`,
+            architecture: props.lambdaArchitecture,
+            memorySize: 1024,
+            timeout: cdk.Duration.seconds(30),
+            logGroup: new cdk.aws_logs.LogGroup(this, `${props.resourcePrefix}-rdsPgOperatorsFn-LogGroup`, {
+                logGroupName: `${props.resourcePrefix}-rdsPgOperatorsFn-LogGroup`,
+                removalPolicy: cdk.RemovalPolicy.DESTROY,
+                retention: cdk.aws_logs.RetentionDays.ONE_WEEK,
+            }),
+            environment: {
+                DB_NAME: props.rdsDatabaseName,
+                DB_USER: props.rdsUsername,
+                DB_HOST: props.rdsHost,
+                DB_PORT: props.rdsPort,
+                DB_PASSWORD: props.rdsPassword,
+                PGVECTOR_DRIVER: props.pgvectorDriver,
+                EMBEDDING_MODEL_DIMENSIONS: props.embeddingModelDimensions,
+            },
+            environmentEncryption: environmentEncryptionKmsKey,
+            role: lambdaRole,
+            vpc: vpc,
+            securityGroups: [lambdaFnSecGrp],
+            vpcSubnets: vpcSubnetSelection,
+        });
+        this.rdsPgOperatorsFn.applyRemovalPolicy(cdk.RemovalPolicy.DESTROY);
     }
 }
@@ -0,0 +1,240 @@
+"""Reading Parquet and Arrow IPC files for bulk import into vector store tables.
+
+Files are memory-mapped and read one record batch at a time, so importing a
+file never holds more than a batch of it in memory. Each record batch is
+mapped onto the layout init_vectorstore_table creates: an id field, a content
+field, an embedding field (a list or fixed size list of floats) and metadata
+fields, which PGEngine.add_embeddings stores in matching metadata columns or
+in the JSON metadata column.
+
+pyarrow is optional; it is only imported when a file is read.
+
+Import progress is kept in a JSON checkpoint file, so an interrupted import
+resumes with the first batch that was not committed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+import numpy as np
+
+from .ingest import EmbeddingBatch
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ARROW_IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Importing Parquet or Arrow files requires pyarrow: pip install pyarrow"
+        )
+    return pyarrow
+
+
+@dataclass
+class ArrowFieldMapping:
+    """Fields of the source files holding each part of a row.
+
+    Attributes:
+        id_field (Optional[str]): Field of the row ids, or None to generate
+            random UUIDs. Default: "id".
+        content_field (str): Field of the document content. Default: "content".
+        embedding_field (str): Field of the embeddings, a list or fixed size list
+            of floats. Default: "embedding".
+        metadata_fields (Optional[list[str]]): Fields stored as metadata. None
+            means every other field. Default: None.
+        uuid_ids (bool): Convert string or 16 byte binary ids to uuid.UUID, for
+            the default UUID id column. Default: True.
+    """
+
+    id_field: Optional[str] = "id"
+    content_field: str = "content"
+    embedding_field: str = "embedding"
+    metadata_fields: Optional[list[str]] = None
+    uuid_ids: bool = True
+
+    def columns(self, schema: pa.Schema) -> list[str]:
+        """Names of the fields to read from a file with the given schema."""
+        columns = [self.content_field, self.embedding_field]
+        if self.id_field:
+            columns.insert(0, self.id_field)
+        missing = [name for name in columns if name not in schema.names]
+        if missing:
+            raise ValueError(f"Fields {missing} are missing from the file schema.")
+        if self.metadata_fields is None:
+            return columns + [name for name in schema.names if name not in columns]
+        return columns + list(self.metadata_fields)
+
+
+def embedding_matrix(column: Union[pa.Array, pa.ChunkedArray]) -> np.ndarray:
+    """2-D array of a list or fixed size list column of equal length vectors.
+
+    Fixed size lists of float32 are returned without copying.
+
+    Raises:
+        ValueError: If the column has nulls or vectors of different lengths.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.compute as pc
+
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    rows = len(column)
+    if column.null_count:
+        raise ValueError("The embedding field has null values.")
+    if rows == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    if pa.types.is_fixed_size_list(column.type):
+        dimensions = column.type.list_size
+    else:
+        lengths = pc.list_value_length(column)
+        dimensions = pc.min(lengths).as_py()
+        if pc.max(lengths).as_py() != dimensions:
+            raise ValueError("The embedding field has vectors of different lengths.")
+    # flatten() honours the offsets of sliced list arrays
+    values = column.flatten().to_numpy(zero_copy_only=False)
+    return values.reshape(rows, dimensions)
+
+
+def _ids(column: pa.Array, uuid_ids: bool) -> list[Any]:
+    pa = _import_pyarrow()
+    ids = column.to_pylist()
+    if not uuid_ids:
+        return ids
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return [uuid.UUID(row_id) for row_id in ids]
+    if pa.types.is_fixed_size_binary(column.type) and column.type.byte_width == 16:
+        return [uuid.UUID(bytes=row_id) for row_id in ids]
+    return ids
+
+
+def record_batch_to_embedding_batch(
+    batch: pa.RecordBatch, mapping: ArrowFieldMapping
+) -> EmbeddingBatch:
+    """Map a record batch onto the rows of a vector store table."""
+    metadata_fields = [
+        name
+        for name in batch.schema.names
+        if name not in (mapping.id_field, mapping.content_field, mapping.embedding_field)
+    ]
+    metadata_values = [batch.column(name).to_pylist() for name in metadata_fields]
+    return EmbeddingBatch(
+        contents=batch.column(mapping.content_field).to_pylist(),
+        embeddings=embedding_matrix(batch.column(mapping.embedding_field)),
+        ids=_ids(batch.column(mapping.id_field), mapping.uuid_ids)
+        if mapping.id_field
+        else None,
+        metadatas=[dict(zip(metadata_fields, values)) for values in zip(*metadata_values)]
+        if metadata_fields
+        else None,
+    )
+
+
+def iter_record_batches(
+    path: Union[str, Path], mapping: ArrowFieldMapping, batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """Memory-map a Parquet or Arrow IPC file and read it in record batches.
+
+    Parquet files are read in batches of batch_size rows; Arrow IPC files
+    (.arrow, .feather, .ipc) in the record batches they were written with.
+    """
+    pa = _import_pyarrow()
+    path = Path(path)
+    if path.suffix.lower() in ARROW_IPC_SUFFIXES:
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            columns = mapping.columns(reader.schema)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).select(columns)
+        return
+
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(str(path), memory_map=True)
+    columns = mapping.columns(parquet_file.schema_arrow)
+    yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+
+@dataclass
+class ImportCheckpoint:
+    """Progress of an import, saved as JSON after every committed batch.
+
+    Attributes:
+        path (Optional[Path]): The checkpoint file, or None to keep progress in
+            memory only.
+        batch_size (int): Batch size of the import; resuming with another batch
+            size would skip the wrong rows.
+        completed (dict[str, set[int]]): Indexes of the committed batches of each file.
+        dropped_indexes (list[str]): CREATE INDEX statements of the indexes
+            dropped for the load, to recreate them even after a crash.
+        finished (bool): All files were loaded and the indexes recreated.
+    """
+
+    path: Optional[Path]
+    batch_size: int
+    completed: dict[str, set[int]] = field(default_factory=dict)
+    dropped_indexes: list[str] = field(default_factory=list)
+    finished: bool = False
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]], batch_size: int) -> ImportCheckpoint:
+        """Load the checkpoint at path, or start a new one if it doesn't exist.
+
+        Raises:
+            ValueError: If the checkpoint was written with another batch size.
+        """
+        if path is None:
+            return cls(path=None, batch_size=batch_size)
+        path = Path(path)
+        if not path.exists():
+            return cls(path=path, batch_size=batch_size)
+        state = json.loads(path.read_text())
+        if state["batch_size"] != batch_size:
+            raise ValueError(
+                f"Checkpoint {path} was written with batch_size={state['batch_size']}, "
+                f"resume with the same batch size."
+            )
+        return cls(
+            path=path,
+            batch_size=batch_size,
+            completed={name: set(batches) for name, batches in state["completed"].items()},
+            dropped_indexes=state["dropped_indexes"],
+            finished=state["finished"],
+        )
+
+    def is_done(self, file_key: str, batch_index: int) -> bool:
+        return batch_index in self.completed.get(file_key, ())
+
+    def mark_done(self, file_key: str, batch_index: int) -> None:
+        self.completed.setdefault(file_key, set()).add(batch_index)
+        self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint atomically, so a crash never leaves it half written."""
+        if self.path is None:
+            return
+        state = {
+            "batch_size": self.batch_size,
+            "completed": {name: sorted(batches) for name, batches in self.completed.items()},
+            "dropped_indexes": self.dropped_indexes,
+            "finished": self.finished,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, self.path)
+
+
+def file_key(path: Union[str, Path]) -> str:
+    """Key of a file in a checkpoint."""
+    return str(Path(path).resolve())
@@ -0,0 +1,72 @@
+"""asyncpg type codecs for pgvector columns.
+
+vector and halfvec values are exchanged in pgvector's binary format and
+decoded straight into NumPy arrays with np.frombuffer, which is several times
+faster than parsing their text format for result sets of embeddings. bit and
+sparsevec values keep their text format, the same strings the psycopg driver
+sends.
+"""
+
+import struct
+from typing import Any
+
+import numpy as np
+
+# Big-endian int16 dimension count and an unused int16, then the values
+_VECTOR_HEADER = struct.Struct(">HH")
+
+# Session settings of asyncpg connections. Top-k queries are short; JIT
+# compiling them costs more than it saves once ef_search-sized scans get
+# costed above jit_above_cost on large tables.
+ASYNCPG_SERVER_SETTINGS = {"jit": "off"}
+
+
+def _encoder(dtype: str) -> Any:
+    def encode(value: Any) -> bytes:
+        values = np.asarray(value, dtype=dtype)
+        if values.ndim != 1:
+            raise ValueError("expected a 1-D embedding")
+        return _VECTOR_HEADER.pack(values.size, 0) + values.tobytes()
+
+    return encode
+
+
+def _decoder(dtype: str) -> Any:
+    def decode(data: bytes) -> np.ndarray:
+        dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+        return np.frombuffer(
+            data, dtype=dtype, count=dimensions, offset=_VECTOR_HEADER.size
+        ).astype(np.float32)
+
+    return decode
+
+
+encode_vector = _encoder(">f4")
+decode_vector = _decoder(">f4")
+encode_halfvec = _encoder(">f2")
+decode_halfvec = _decoder(">f2")
+
+# (type name, schema, format, encoder, decoder)
+_CODECS = (
+    ("vector", "public", "binary", encode_vector, decode_vector),
+    ("halfvec", "public", "binary", encode_halfvec, decode_halfvec),
+    ("sparsevec", "public", "text", str, str),
+    ("bit", "pg_catalog", "text", str, str),
+)
+
+
+async def register_vector_codecs(conn: Any) -> None:
+    """Register the pgvector codecs on an asyncpg connection.
+
+    Query embeddings for vector and halfvec columns are then passed as
+    sequences or NumPy arrays, and selected embeddings come back as float32
+    NumPy arrays. Types missing from the database, e.g. halfvec before
+    pgvector 0.7, are skipped.
+    """
+    for type_name, schema, format, encoder, decoder in _CODECS:
+        try:
+            await conn.set_type_codec(
+                type_name, schema=schema, encoder=encoder, decoder=decoder, format=format
+            )
+        except ValueError:
+            pass
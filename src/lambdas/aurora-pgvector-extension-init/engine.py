@@ -1,30 +1,239 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from threading import Thread
-from typing import Any, Awaitable, Optional, TypedDict, TypeVar, Union
+import hashlib
+import json
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from threading import Lock, Thread
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import text
-from sqlalchemy.engine import URL
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError
 
-from .hybrid_search_config import HybridSearchConfig
+from .filters import CompiledFilter, compile_filter
+from .hybrid_search_config import DEFAULT_TSV_LANG, HybridSearchConfig
+from .indexes import (
+    DEFAULT_DISTANCE_STRATEGY,
+    DEFAULT_INDEX_NAME_SUFFIX,
+    DEFAULT_STORAGE_TYPE,
+    HNSW_MAX_EF_SEARCH,
+    INDEX_MAX_DIMENSIONS,
+    BaseIndex,
+    BinaryQuantizedHNSWIndex,
+    DistanceStrategy,
+    ExactNearestNeighbor,
+    HNSWQueryOptions,
+    IterativeScan,
+    QueryOptions,
+    SearchProfile,
+    VectorStorageType,
+    query_options_from_dict,
+    validate_identifier,
+    validate_memory_setting,
+    validate_storage_type,
+)
+from .native_pool import NativePool, native_pool_from_url
+from .partitions import BasePartitioning
+from .statement_cache import (
+    DEFAULT_STATEMENT_CACHE_SIZE,
+    StatementCache,
+    StatementCacheStats,
+)
+
+# numpy, pgvector, psycopg and the asyncio extension of SQLAlchemy are imported
+# where they are used: provisioning tables, the common case in a Lambda cold
+# start, needs none of them.
+if TYPE_CHECKING:
+    import numpy as np
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+    from .arrow_import import ArrowFieldMapping
+    from .ingest import EmbeddingBatch, IngestStats, RowBatch
 
 T = TypeVar("T")
 
+# Runs a query on the connection of a search batch and returns its first value
+ValueFetcher = Callable[[TextClause, dict[str, Any]], Awaitable[Any]]
+# Picks the query, bind parameters and settings of a search batch, with a
+# ValueFetcher on the connection the batch then runs on
+SearchPlanner = Callable[
+    [ValueFetcher],
+    Awaitable[tuple[TextClause, Sequence[dict[str, Any]], Sequence[str]]],
+]
+
+# Table holding the query options saved per vector store table, in the schema
+# of the tables it tunes.
+SEARCH_SETTINGS_TABLE = "pgvector_search_settings"
+# How long searches reuse saved query options before reading them again, so
+# options saved by another process are picked up.
+SEARCH_SETTINGS_TTL_SECONDS = 60.0
+# Filtered searches whose filter the planner estimates to match less than this
+# share of the table's rows skip the vector index: an index scan would have to
+# visit most of the index to find k matching rows, while the matching rows are
+# quickly found through indexes on the filtered columns and sorted exactly.
+EXACT_SEARCH_SELECTIVITY = 0.01
+# Longest identifier PostgreSQL keeps (NAMEDATALEN - 1)
+MAX_IDENTIFIER_BYTES = 63
+# maintenance_work_mem of each index rebuilt after import_parquet. Index
+# builds that do not fit in it, HNSW graphs in particular, are much slower.
+DEFAULT_REBUILD_MAINTENANCE_WORK_MEM = "512MB"
+# Index access methods a metadata column can be indexed with.
+METADATA_INDEX_TYPES = ("btree", "hash", "gin", "brin")
+
+
+def _generated_identifier(name: str) -> str:
+    """name, shortened to fit PostgreSQL's 63 byte identifiers if needed.
+
+    PostgreSQL truncates longer identifiers, so two generated names sharing
+    their first 63 bytes would collide. Long names instead keep a prefix and
+    end in a hash of the full name.
+    """
+    encoded = name.encode()
+    if len(encoded) <= MAX_IDENTIFIER_BYTES:
+        return name
+    digest = hashlib.sha1(encoded).hexdigest()[:8]
+    prefix = encoded[: MAX_IDENTIFIER_BYTES - len(digest) - 1].decode(errors="ignore")
+    return f"{prefix}_{digest}"
+
+
+def _lru_get(cache: OrderedDict, key: Any) -> Any:
+    """The entry of key in an LRU cache, or None, marking it recently used."""
+    if key not in cache:
+        return None
+    cache.move_to_end(key)
+    return cache[key]
+
+
+def _lru_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    """Store an entry in an LRU cache of DEFAULT_STATEMENT_CACHE_SIZE entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > DEFAULT_STATEMENT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _query_embedding_text(
+    embedding: Sequence[float], storage_type: VectorStorageType
+) -> str:
+    """Text format of a query embedding for a column of the given storage type."""
+    from pgvector import Bit, HalfVector, SparseVector, Vector
+
+    if storage_type is VectorStorageType.BIT:
+        import numpy as np
+
+        # Non-zero values are 1 bits, as in ingest.encode_bits.
+        return Bit(np.asarray(embedding) != 0).to_text()
+    embedding_type = {
+        VectorStorageType.VECTOR: Vector,
+        VectorStorageType.HALFVEC: HalfVector,
+        VectorStorageType.SPARSEVEC: SparseVector,
+    }[storage_type]
+    return embedding_type(embedding).to_text()
+
+
+def _query_embedding_param(
+    embedding: Sequence[float], storage_type: VectorStorageType, driver: str
+) -> Any:
+    """Bind parameter of a query embedding for the driver running the query."""
+    if driver == "asyncpg" and storage_type in (
+        VectorStorageType.VECTOR,
+        VectorStorageType.HALFVEC,
+    ):
+        # Sent in the binary format by asyncpg_codecs.register_vector_codecs
+        return embedding
+    return _query_embedding_text(embedding, storage_type)
+
+
+def _asyncpg_connect_args(
+    connect_args: dict[str, Any], statement_cache_size: int
+) -> dict[str, Any]:
+    """connect_args of an asyncpg engine, with defaults tuned for search queries."""
+    from .asyncpg_codecs import ASYNCPG_SERVER_SETTINGS
+
+    connect_args = dict(connect_args)
+    # SQLAlchemy's cache of prepared statements per connection, and asyncpg's
+    # own; 0 turns prepared statements off, e.g. behind PgBouncer
+    connect_args.setdefault("prepared_statement_cache_size", statement_cache_size)
+    connect_args.setdefault("statement_cache_size", statement_cache_size)
+    connect_args.setdefault("server_settings", ASYNCPG_SERVER_SETTINGS)
+    return connect_args
+
+
+def _register_asyncpg_codecs_on_connect(engine: AsyncEngine) -> None:
+    """Register the pgvector codecs on every connection the engine opens."""
+    from sqlalchemy import event
+
+    from .asyncpg_codecs import register_vector_codecs
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def register(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.run_async(register_vector_codecs)
+
+
+# Engines shared across warm Lambda invocations, keyed by connection URL and
+# engine kwargs. Guarded by _ENGINE_REGISTRY_LOCK.
+_ENGINE_REGISTRY: dict[tuple[str, tuple[tuple[str, str], ...]], PGEngine] = {}
+_ENGINE_REGISTRY_LOCK = Lock()
+
+
+async def _anext_or_none(iterator: AsyncIterator[T]) -> Optional[T]:
+    """The next item of an async iterator, or None once it is exhausted."""
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _aclose_iterator(iterator: Any) -> None:
+    """Close an async generator; aclose() itself is not a coroutine."""
+    await iterator.aclose()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The event loop running in the current thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
 
-class ColumnDict(TypedDict):
+class _RequiredColumnDict(TypedDict):
     name: str
     data_type: str
     nullable: bool
 
 
+class ColumnDict(_RequiredColumnDict, total=False):
+    index: Optional[str]
+
+
 @dataclass
 class Column:
     name: str
     data_type: str
     nullable: bool = True
+    # Access method of an index to build on the column, one of METADATA_INDEX_TYPES
+    index: Optional[str] = None
 
     def __post_init__(self) -> None:
         """Check if initialization parameters are valid.
@@ -32,12 +241,53 @@ class Column:
         Raises:
             ValueError: If Column name is not string.
             ValueError: If data_type is not type string.
+            ValueError: If index is not one of METADATA_INDEX_TYPES.
         """
 
         if not isinstance(self.name, str):
             raise ValueError("Column name must be type string")
         if not isinstance(self.data_type, str):
             raise ValueError("Column data_type must be type string")
+        if self.index is not None and self.index not in METADATA_INDEX_TYPES:
+            raise ValueError(
+                f"Column index must be one of {METADATA_INDEX_TYPES}, got '{self.index}'"
+            )
+
+
+@dataclass
+class VectorStoreTable:
+    """Settings of one table to create with PGEngine.init_vectorstore_tables.
+
+    Fields match the arguments of PGEngine.init_vectorstore_table.
+    """
+
+    table_name: str
+    vector_size: int
+    schema_name: str = "public"
+    content_column: str = "content"
+    embedding_column: str = "embedding"
+    metadata_columns: Optional[list[Union[Column, ColumnDict]]] = None
+    metadata_json_column: str = "langchain_metadata"
+    id_column: Union[str, Column, ColumnDict] = "langchain_id"
+    overwrite_existing: bool = False
+    store_metadata: bool = True
+    metadata_json_index: bool = False
+    hybrid_search_config: Optional[HybridSearchConfig] = None
+    vector_index: Optional[BaseIndex] = None
+    defer_index_build: bool = False
+    storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE
+    partitioning: Optional[BasePartitioning] = None
+    search_profile: Optional[SearchProfile] = None
+
+
+@dataclass
+class TableProvisioningResult:
+    """Outcome of creating one table with PGEngine.init_vectorstore_tables."""
+
+    table_name: str
+    schema_name: str
+    created: bool
+    error: Optional[str] = None
 
 
 class PGEngine:
@@ -73,6 +323,28 @@ class PGEngine:
         self._pool = pool
         self._loop = loop
         self._thread = thread
+        self._statements = StatementCache(DEFAULT_STATEMENT_CACHE_SIZE)
+        # Send hot search queries as server-side prepared statements. Turn off
+        # behind poolers that don't support them, e.g. PgBouncer in
+        # transaction mode.
+        self._prepare_statements = True
+        # Extensions known to be installed, so provisioning skips CREATE
+        # EXTENSION and the catalog lock it takes.
+        self._installed_extensions: set[str] = set()
+        # Raw driver pool for hot search queries; None runs them on the engine
+        self._native_pool: Optional[NativePool] = None
+        # Saved query options by (schema, table), with the time they were read
+        self._saved_query_options: dict[
+            tuple[str, str], tuple[float, Optional[QueryOptions]]
+        ] = {}
+        # Estimated selectivity of search filters, with the time it was estimated
+        self._filter_selectivity: OrderedDict[
+            tuple[str, ...], tuple[float, float]
+        ] = OrderedDict()
+        # Row estimate of unfiltered scans by (schema, table), with the time it was read
+        self._table_rows: OrderedDict[tuple[str, str], tuple[float, float]] = (
+            OrderedDict()
+        )
 
     @classmethod
     def from_engine(
@@ -87,12 +359,30 @@ class PGEngine:
     def from_connection_string(
         cls,
         url: str | URL,
+        *,
+        statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+        prepare_statements: bool = True,
+        native_driver: Optional[str] = None,
+        native_pool_options: Optional[dict[str, Any]] = None,
         **kwargs: Any,
     ) -> PGEngine:
         """Create an PGEngine instance from arguments
 
         Args:
             url (Optional[str]): the URL used to connect to a database. Use url or set other arguments.
+            statement_cache_size (int): Most rendered statements to keep in the
+                engine's LRU statement cache. 0 disables it. Default: 256.
+            prepare_statements (bool): Send hot search queries as server-side
+                prepared statements. Default: True.
+            native_driver (Optional[str]): "psycopg" or "asyncpg" to run searches
+                on a pool of that driver directly, bypassing SQLAlchemy. DDL and
+                bulk loading still use the SQLAlchemy engine. Default: None.
+            native_pool_options (Optional[dict[str, Any]]): Extra arguments of
+                the native pool, e.g. min_size and max_size. Default: None.
+            **kwargs: Extra arguments passed to ``create_async_engine``. For
+                asyncpg URLs, connect_args default to statement caches of
+                statement_cache_size entries and JIT turned off, and every
+                connection registers the pgvector codecs of asyncpg_codecs.
 
         Raises:
             ValueError: If not all database url arguments are specified
@@ -109,13 +399,100 @@ class PGEngine:
             )
             cls._default_thread.start()
 
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = make_url(url)
+        asyncpg = url.get_driver_name() == "asyncpg"
+        if asyncpg:
+            kwargs["connect_args"] = _asyncpg_connect_args(
+                kwargs.get("connect_args", {}),
+                statement_cache_size if prepare_statements else 0,
+            )
         engine = create_async_engine(url, **kwargs)
-        return cls(cls.__create_key, engine, cls._default_loop, cls._default_thread)
+        if asyncpg:
+            _register_asyncpg_codecs_on_connect(engine)
+        pg_engine = cls(
+            cls.__create_key, engine, cls._default_loop, cls._default_thread
+        )
+        pg_engine._statements = StatementCache(statement_cache_size)
+        pg_engine._prepare_statements = prepare_statements
+        if native_driver:
+            pg_engine._native_pool = native_pool_from_url(
+                url,
+                native_driver,
+                prepare_statements=prepare_statements,
+                **(native_pool_options or {}),
+            )
+        return pg_engine
+
+    @classmethod
+    def get_or_create(
+        cls,
+        url: str | URL,
+        **kwargs: Any,
+    ) -> PGEngine:
+        """Return a shared PGEngine for the url, creating it on first use.
+
+        Engines are kept in a module-level registry keyed by the full
+        connection URL (including credentials) and the engine kwargs, so
+        warm Lambda invocations reuse the same connection pool instead of
+        paying connection setup again. Pooled connections are health-checked
+        on checkout (``pool_pre_ping``) unless the caller overrides it.
+
+        When the credentials for a database change, e.g. after a secret
+        rotation, a new engine is built and the engines previously registered
+        for the same host and database with the old user or password are
+        disposed in the background. Engines for other hosts, or differing
+        only in their kwargs, are kept.
+
+        Args:
+            url (str | URL): the URL used to connect to a database.
+            **kwargs: Extra arguments passed to ``from_connection_string``.
+
+        Returns:
+            PGEngine
+        """
+        kwargs.setdefault("pool_pre_ping", True)
+        url = make_url(url)
+        key = (
+            url.render_as_string(hide_password=False),
+            tuple(sorted((name, repr(value)) for name, value in kwargs.items())),
+        )
+        with _ENGINE_REGISTRY_LOCK:
+            engine = _ENGINE_REGISTRY.get(key)
+            if engine is not None:
+                return engine
+
+            for stale_key, stale_engine in list(_ENGINE_REGISTRY.items()):
+                stale_url = make_url(stale_key[0])
+                same_database = (
+                    stale_url.drivername,
+                    stale_url.host,
+                    stale_url.port,
+                    stale_url.database,
+                ) == (url.drivername, url.host, url.port, url.database)
+                if same_database and (stale_url.username, stale_url.password) != (
+                    url.username,
+                    url.password,
+                ):
+                    del _ENGINE_REGISTRY[stale_key]
+                    stale_engine._dispose_in_background()
+
+            engine = cls.from_connection_string(url, **kwargs)
+            _ENGINE_REGISTRY[key] = engine
+            return engine
+
+    def _dispose_in_background(self) -> None:
+        """Dispose of the connection pool without waiting for it to finish."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._aclose(), self._loop)
 
     async def _run_as_async(self, coro: Awaitable[T]) -> T:
         """Run an async coroutine asynchronously"""
-        # If a loop has not been provided, attempt to run in current thread
-        if not self._loop:
+        # If a loop has not been provided, or the caller already runs on it
+        # (e.g. inside run_batch), await in place without a thread handoff
+        if not self._loop or asyncio.get_running_loop() is self._loop:
             return await coro
         # Otherwise, run in the background thread
         return await asyncio.wrap_future(
@@ -128,11 +505,203 @@ class PGEngine:
             raise Exception(
                 "Engine was initialized without a background loop and cannot call sync methods."
             )
+        if _running_loop() is self._loop:
+            # Blocking the loop on its own future would never return
+            raise RuntimeError(
+                "Sync methods cannot be called from the engine's event loop; use the async methods."
+            )
         return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
 
+    async def _arun_batch(
+        self,
+        coros: Sequence[Awaitable[T]],
+        concurrency: Optional[int],
+        return_exceptions: bool,
+    ) -> list[Union[T, BaseException]]:
+        if concurrency is None:
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(coro: Awaitable[T]) -> T:
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(
+            *(bounded(coro) for coro in coros), return_exceptions=return_exceptions
+        )
+
+    def run_batch(
+        self,
+        coros: Iterable[Awaitable[T]],
+        *,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list[Union[T, BaseException]]:
+        """
+        Run many async engine calls from synchronous code with a single thread handoff.
+
+        Each sync method hands its coroutine to the background loop and blocks
+        on the result, which costs two thread switches per call. run_batch
+        hands over all coroutines at once and gathers them on the loop, where
+        the async methods run without further handoffs.
+
+        Example:
+            engine.run_batch(
+                engine.aadd_embeddings("docs", batch) for batch in batches
+            )
+
+        Args:
+            coros (Iterable[Awaitable[T]]): Awaitables of this engine's async
+                methods, e.g. engine.aadd_embeddings(...).
+            concurrency (Optional[int]): Most awaitables to run at once, e.g. the
+                connection pool size. Default: None (all at once).
+            return_exceptions (bool): Return exceptions in place of results
+                instead of raising the first one. Default: False.
+
+        Returns:
+            list: The results, in the order of coros.
+
+        Raises:
+            ValueError: If concurrency is not positive.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        return self._run_as_sync(
+            self._arun_batch(list(coros), concurrency, return_exceptions)
+        )
+
+    def statement_cache_stats(self) -> StatementCacheStats:
+        """Hit, miss and eviction counters of the statement cache, and the
+        number of queries sent as server-side prepared statements."""
+        return self._statements.stats
+
+    def _cached_text(self, key: tuple[Any, ...], build: Callable[[], str]) -> TextClause:
+        """TextClause of the statement for key, rendered by build on a cache miss."""
+        return self._statements.get(key, lambda: text(build()))
+
+    @property
+    def _search_driver(self) -> str:
+        """Name of the driver that runs search queries."""
+        if self._native_pool is not None:
+            return self._native_pool.driver
+        return self._pool.dialect.driver
+
+    async def _afetch_batch(
+        self,
+        query: TextClause,
+        params: Sequence[dict[str, Any]],
+        settings: Sequence[str] = (),
+    ) -> list[list[dict[str, Any]]]:
+        """Run a read-only query once per params on one pooled connection.
+
+        Uses the native driver pool if the engine has one. Otherwise, with the
+        psycopg driver the queries are sent in a single pipeline.
+
+        Args:
+            query (TextClause): The query, with :name bind parameters.
+            params (Sequence[dict[str, Any]]): Bind parameters of each query.
+            settings (Sequence[str]): "name = value" settings applied with SET
+                LOCAL before the queries.
+
+        Returns:
+            list[list[dict[str, Any]]]: The rows of each query, in params order.
+        """
+
+        async def planner(fetch_value: ValueFetcher) -> tuple[
+            TextClause, Sequence[dict[str, Any]], Sequence[str]
+        ]:
+            return query, params, settings
+
+        return await self._afetch_planned_batch(planner)
+
+    async def _afetch_planned_batch(
+        self, planner: SearchPlanner
+    ) -> list[list[dict[str, Any]]]:
+        """Like _afetch_batch, with the batch chosen by planner on its connection.
+
+        Lets a search look something up, such as a plan estimate, without
+        checking out a second connection.
+        """
+        if self._native_pool is not None:
+            native_pool = self._native_pool
+
+            def statement(clause: TextClause) -> Any:
+                return self._statements.get(
+                    ("native_sql", native_pool.driver, clause.text),
+                    lambda: native_pool.statement(clause.text),
+                )
+
+            async with native_pool.aconnect() as native_conn:
+
+                async def fetch_native_value(
+                    clause: TextClause, values: dict[str, Any]
+                ) -> Any:
+                    return await native_pool.afetch_value(
+                        native_conn, statement(clause), values
+                    )
+
+                query, params, settings = await planner(fetch_native_value)
+                results = await native_pool.afetch_batch(
+                    statement(query), params, settings, conn=native_conn
+                )
+            if self._prepare_statements:
+                self._statements.record_prepared(len(params))
+            return [result.to_dicts() for result in results]
+
+        async with self._pool.connect() as conn:
+
+            async def fetch_value(clause: TextClause, values: dict[str, Any]) -> Any:
+                return (await conn.execute(clause, values)).scalar()
+
+            query, params, settings = await planner(fetch_value)
+            if self._pool.dialect.driver != "psycopg":
+                for setting in settings:
+                    await conn.execute(text(f"SET LOCAL {setting}"))
+                results = []
+                for param in params:
+                    result = await conn.execute(query, param)
+                    results.append([dict(row) for row in result.mappings()])
+                if self._pool.dialect.driver == "asyncpg":
+                    # asyncpg prepares every statement and caches it per connection
+                    self._statements.record_prepared(len(params))
+                return results
+
+            from psycopg.rows import dict_row
+
+            driver_conn = await self._driver_connection(conn)
+            compiled_query = self._cached_driver_sql(query)
+            # prepare=None leaves it to psycopg's prepare_threshold
+            prepare = True if self._prepare_statements else None
+            cursors = []
+            async with driver_conn.pipeline():
+                for setting in settings:
+                    await driver_conn.execute(f"SET LOCAL {setting}")
+                for param in params:
+                    cursor = driver_conn.cursor(row_factory=dict_row)
+                    await cursor.execute(compiled_query, param, prepare=prepare)
+                    cursors.append(cursor)
+            results = [await cursor.fetchall() for cursor in cursors]
+            await driver_conn.rollback()
+            if self._prepare_statements:
+                self._statements.record_prepared(len(params))
+            return results
+
+    def _cached_driver_sql(self, clause: TextClause) -> str:
+        """The clause compiled to the driver's paramstyle, for raw driver cursors."""
+        return self._statements.get(
+            ("driver_sql", self._pool.dialect.name, clause.text),
+            lambda: str(clause.compile(dialect=self._pool.dialect)),
+        )
+
+    async def _aclose(self) -> None:
+        await self._pool.dispose()
+        if self._native_pool is not None:
+            await self._native_pool.aclose()
+
     async def close(self) -> None:
         """Dispose of connection pool"""
-        await self._run_as_async(self._pool.dispose())
+        await self._run_as_async(self._aclose())
 
     def _escape_postgres_identifier(self, name: str) -> str:
         return name.replace('"', '""')
@@ -144,6 +713,44 @@ class PGEngine:
             raise TypeError("The 'data_type' field must be a string.")
         if not isinstance(col.get("nullable"), bool):
             raise TypeError("The 'nullable' field must be a boolean.")
+        if col.get("index") not in (None, *METADATA_INDEX_TYPES):
+            raise ValueError(
+                f"The 'index' field must be one of {METADATA_INDEX_TYPES}."
+            )
+
+    async def _aensure_extensions(
+        self, conn: AsyncConnection, extension_names: Iterable[str]
+    ) -> list[str]:
+        """
+        Create the extensions that are not installed yet, within the current transaction.
+
+        Extensions found in pg_extension are remembered on the engine, so later
+        calls need no round trip for them. Extensions created here are only
+        returned; the caller marks them installed once its transaction commits.
+
+        Args:
+            conn (AsyncConnection): Connection to run the check and DDL on.
+            extension_names (Iterable[str]): Names of the required extensions.
+
+        Returns:
+            list[str]: Names of the extensions created by this call.
+        """
+        missing = sorted(set(extension_names) - self._installed_extensions)
+        if not missing:
+            return []
+        for extension_name in missing:
+            validate_identifier(extension_name)
+
+        result = await conn.execute(
+            text("SELECT extname FROM pg_extension WHERE extname = ANY(:names)"),
+            {"names": missing},
+        )
+        self._installed_extensions.update(result.scalars().all())
+
+        created = [name for name in missing if name not in self._installed_extensions]
+        for extension_name in created:
+            await conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension_name}"))
+        return created
 
     async def _ainit_vectorstore_table(
         self,
@@ -158,11 +765,22 @@ class PGEngine:
         id_column: Union[str, Column, ColumnDict] = "langchain_id",
         overwrite_existing: bool = False,
         store_metadata: bool = True,
+        metadata_json_index: bool = False,
         hybrid_search_config: Optional[HybridSearchConfig] = None,
+        vector_index: Optional[BaseIndex] = None,
+        defer_index_build: bool = False,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        partitioning: Optional[BasePartitioning] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> None:
         """
         Create a table for saving of vectors to be used with PGVectorStore.
 
+        The extension check, drop, create and non-concurrent index builds all
+        run in one transaction on one connection, so a failed step leaves no
+        half-provisioned table behind. Concurrent vector indexes are built
+        after that transaction commits.
+
         Args:
             table_name (str): The database table name.
             vector_size (int): Vector size for the embedding model to be used.
@@ -173,7 +791,8 @@ class PGEngine:
             embedding_column (str) : Name of the column to store vector embeddings.
                 Default: "embedding".
             metadata_columns (Optional[list[Union[Column, ColumnDict]]]): A list of Columns to create for custom
-                metadata. Default: None. Optional.
+                metadata. Columns with an index get a btree, hash, gin or brin
+                index on them. Default: None. Optional.
             metadata_json_column (str): The column to store extra metadata in JSON format.
                 Default: "langchain_metadata". Optional.
             id_column (Union[str, Column, ColumnDict]) :  Column to store ids.
@@ -181,46 +800,148 @@ class PGEngine:
             overwrite_existing (bool): Whether to drop existing table. Default: False.
             store_metadata (bool): Whether to store metadata in the table.
                 Default: True.
+            metadata_json_index (bool): Build a GIN jsonb_path_ops index on the
+                metadata JSON column, for metadata filters on its keys.
+                Default: False.
             hybrid_search_config (HybridSearchConfig): Hybrid search configuration.
+                Adds a generated TSVECTOR column (tsv_column, default "<content_column>_tsv")
+                computed from the content column, and the index_name/index_type index on it.
+                Default: None.
+            vector_index (Optional[BaseIndex]): ANN index to build on the embedding
+                column once the table exists, e.g. HNSWIndex or IVFFlatIndex.
                 Default: None.
+            defer_index_build (bool): Skip building the vector, full-text and
+                metadata indexes, e.g. to build them after a bulk load with
+                apply_vector_index, apply_hybrid_search_index and
+                apply_metadata_indexes. Default: False.
+            storage_type (VectorStorageType): Column type of the embeddings:
+                vector (float4), halfvec (float2), bit or sparsevec. Vector
+                indexes use the matching operator classes.
+                Default: VectorStorageType.VECTOR.
+            partitioning (Optional[BasePartitioning]): Partition the table with
+                HashPartitioning, ListPartitioning or RangePartitioning. The
+                child partitions are created with the table, and each gets its
+                own vector and full-text index. Default: None.
+            search_profile (Optional[SearchProfile]): Settings for the table's
+                searches, e.g. hnsw.ef_search and work_mem, saved with the table
+                as by save_query_options. Default: None.
 
         Raises:
             :class:`DuplicateTableError <asyncpg.exceptions.DuplicateTableError>`: if table already exists.
             :class:`UndefinedObjectError <asyncpg.exceptions.UndefinedObjectError>`: if the data type of the id column is not a postgreSQL data type.
         """
 
-        schema_name = self._escape_postgres_identifier(schema_name)
-        table_name = self._escape_postgres_identifier(table_name)
-        hybrid_search_default_column_name = content_column + "_tsv"
-        content_column = self._escape_postgres_identifier(content_column)
-        embedding_column = self._escape_postgres_identifier(embedding_column)
-        if metadata_columns is None:
-            metadata_columns = []
-        else:
-            for col in metadata_columns:
-                if isinstance(col, Column):
-                    col.name = self._escape_postgres_identifier(col.name)
-                elif isinstance(col, dict):
-                    self._validate_column_dict(col)
-                    col["name"] = self._escape_postgres_identifier(col["name"])
-        if isinstance(id_column, str):
-            id_column = self._escape_postgres_identifier(id_column)
-        elif isinstance(id_column, Column):
-            id_column.name = self._escape_postgres_identifier(id_column.name)
-        else:
-            self._validate_column_dict(id_column)
-            id_column["name"] = self._escape_postgres_identifier(id_column["name"])
+        table = VectorStoreTable(
+            table_name=table_name,
+            vector_size=vector_size,
+            schema_name=schema_name,
+            content_column=content_column,
+            embedding_column=embedding_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+            overwrite_existing=overwrite_existing,
+            store_metadata=store_metadata,
+            metadata_json_index=metadata_json_index,
+            hybrid_search_config=hybrid_search_config,
+            vector_index=vector_index,
+            defer_index_build=defer_index_build,
+            storage_type=storage_type,
+            partitioning=partitioning,
+            search_profile=search_profile,
+        )
+        table, concurrent_index = self._split_concurrent_index(table)
+        statements = self._vectorstore_table_clauses(table)
 
         async with self._pool.connect() as conn:
-            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            created = await self._aensure_extensions(
+                conn, self._required_extensions(table)
+            )
+            for statement in statements:
+                await conn.execute(statement)
             await conn.commit()
+        self._installed_extensions.update(created)
+        if search_profile is not None:
+            self._saved_query_options[(schema_name, table_name)] = (
+                time.monotonic(),
+                search_profile,
+            )
 
-        if overwrite_existing:
-            async with self._pool.connect() as conn:
-                await conn.execute(
-                    text(f'DROP TABLE IF EXISTS "{schema_name}"."{table_name}"')
-                )
-                await conn.commit()
+        if concurrent_index is not None:
+            await self._aapply_vector_index(
+                table_name,
+                concurrent_index,
+                schema_name=schema_name,
+                embedding_column=embedding_column,
+                storage_type=storage_type,
+            )
+
+    def _split_concurrent_index(
+        self, table: VectorStoreTable
+    ) -> tuple[VectorStoreTable, Optional[BaseIndex]]:
+        """Take a vector index to build concurrently out of a table's provisioning.
+
+        CREATE INDEX CONCURRENTLY cannot run inside the provisioning
+        transaction, so such an index is built once the table is committed.
+
+        Returns:
+            The table without that index, and the index, or the table and None.
+
+        Raises:
+            ValueError: If the table is partitioned.
+        """
+        index = table.vector_index
+        if index is None or not index.concurrently or table.defer_index_build:
+            return table, None
+        if table.partitioning:
+            raise ValueError("Indexes on partitioned tables cannot be built concurrently.")
+        return replace(table, vector_index=None), index
+
+    def _apply_hybrid_search_defaults(
+        self, hybrid_search_config: HybridSearchConfig, content_column: str
+    ) -> None:
+        """Fill in the tsv_column and tsv_lang defaults of a table's hybrid search config."""
+        hybrid_search_config.tsv_column = (
+            hybrid_search_config.tsv_column or content_column + "_tsv"
+        )
+        # A stored generated column needs an immutable expression, which
+        # to_tsvector only is with an explicit text search configuration.
+        hybrid_search_config.tsv_lang = hybrid_search_config.tsv_lang or DEFAULT_TSV_LANG
+
+    def _drop_table_statement(self, table_name: str, *, schema_name: str) -> str:
+        return f'DROP TABLE IF EXISTS "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+
+    def _create_table_statement(
+        self,
+        table_name: str,
+        vector_size: int,
+        *,
+        schema_name: str,
+        content_column: str,
+        embedding_column: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        metadata_json_column: str,
+        id_column: Union[str, Column, ColumnDict],
+        store_metadata: bool,
+        hybrid_search_config: Optional[HybridSearchConfig],
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        partitioning: Optional[BasePartitioning] = None,
+    ) -> str:
+        """Build the CREATE TABLE statement of a vector store table.
+
+        Fills in the tsv_column and tsv_lang defaults of hybrid_search_config.
+        A partitioned table's primary key also covers the partition key, as
+        PostgreSQL requires.
+
+        Raises:
+            ValueError: If the partition key is neither the id nor a metadata column.
+        """
+        if hybrid_search_config:
+            self._apply_hybrid_search_defaults(hybrid_search_config, content_column)
+        schema_name = self._escape_postgres_identifier(schema_name)
+        table_name = self._escape_postgres_identifier(table_name)
+        content_column = self._escape_postgres_identifier(content_column)
+        embedding_column = self._escape_postgres_identifier(embedding_column)
 
         if isinstance(id_column, str):
             id_data_type = "UUID"
@@ -229,111 +950,569 @@ class PGEngine:
             id_data_type = id_column.data_type
             id_column_name = id_column.name
         else:
+            self._validate_column_dict(id_column)
             id_data_type = id_column["data_type"]
             id_column_name = id_column["name"]
 
+        primary_key = f'"{self._escape_postgres_identifier(id_column_name)}"'
+        partition_clause = ""
+        if partitioning:
+            partition_column = partitioning.column or id_column_name
+            metadata_column_names = [
+                column.name if isinstance(column, Column) else column["name"]
+                for column in metadata_columns or []
+            ]
+            if partition_column not in (id_column_name, *metadata_column_names):
+                raise ValueError(
+                    f"Partition key {partition_column} must be the id column or a metadata column."
+                )
+            partition_column = self._escape_postgres_identifier(partition_column)
+            if partition_column != self._escape_postgres_identifier(id_column_name):
+                primary_key += f', "{partition_column}"'
+            partition_clause = f' PARTITION BY {partitioning.method} ("{partition_column}")'
+        id_column_name = self._escape_postgres_identifier(id_column_name)
+
         hybrid_search_column = ""  # Default is no TSV column for hybrid search
         if hybrid_search_config:
-            hybrid_search_column_name = (
-                hybrid_search_config.tsv_column or hybrid_search_default_column_name
+            tsv_lang = hybrid_search_config.tsv_lang.replace("'", "''")
+            hybrid_search_column = (
+                f',"{self._escape_postgres_identifier(hybrid_search_config.tsv_column)}" TSVECTOR '
+                f"GENERATED ALWAYS AS (to_tsvector('{tsv_lang}'::regconfig, \"{content_column}\")) STORED"
             )
-            hybrid_search_column_name = self._escape_postgres_identifier(
-                hybrid_search_column_name
-            )
-            hybrid_search_config.tsv_column = hybrid_search_column_name
-            hybrid_search_column = f',"{self._escape_postgres_identifier(hybrid_search_column_name)}" TSVECTOR NOT NULL'
 
         query = f"""CREATE TABLE "{schema_name}"."{table_name}"(
-            "{id_column_name}" {id_data_type} PRIMARY KEY,
+            "{id_column_name}" {id_data_type} NOT NULL,
             "{content_column}" TEXT NOT NULL,
-            "{embedding_column}" vector({vector_size}) NOT NULL
+            "{embedding_column}" {storage_type.value}({vector_size}) NOT NULL
             {hybrid_search_column}"""
-        for column in metadata_columns:
+        for column in metadata_columns or []:
             if isinstance(column, Column):
                 nullable = "NOT NULL" if not column.nullable else ""
-                query += f',\n"{column.name}" {column.data_type} {nullable}'
+                query += f',\n"{self._escape_postgres_identifier(column.name)}" {column.data_type} {nullable}'
             elif isinstance(column, dict):
+                self._validate_column_dict(column)
                 nullable = "NOT NULL" if not column["nullable"] else ""
-                query += f',\n"{column["name"]}" {column["data_type"]} {nullable}'
+                query += f',\n"{self._escape_postgres_identifier(column["name"])}" {column["data_type"]} {nullable}'
         if store_metadata:
-            query += f""",\n"{metadata_json_column}" JSON"""
-        query += "\n);"
+            query += f""",\n"{self._escape_postgres_identifier(metadata_json_column)}" JSON"""
+        query += f",\nPRIMARY KEY ({primary_key})\n){partition_clause};"
+        return query
 
-        async with self._pool.connect() as conn:
-            await conn.execute(text(query))
-            await conn.commit()
+    def _partition_statements(
+        self, table_name: str, partitioning: BasePartitioning, *, schema_name: str
+    ) -> list[str]:
+        """Build the CREATE TABLE ... PARTITION OF statement of each child partition."""
+        parent = f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        return [
+            f'CREATE TABLE "{self._escape_postgres_identifier(schema_name)}".'
+            f'"{self._escape_postgres_identifier(f"{table_name}_{suffix}")}" '
+            f"PARTITION OF {parent} {bound};"
+            for suffix, bound in partitioning.partition_bounds()
+        ]
 
-    async def ainit_vectorstore_table(
+    def _hybrid_search_index_statement(
         self,
         table_name: str,
-        vector_size: int,
+        hybrid_search_config: HybridSearchConfig,
         *,
-        schema_name: str = "public",
-        content_column: str = "content",
-        embedding_column: str = "embedding",
-        metadata_columns: Optional[list[Union[Column, ColumnDict]]] = None,
-        metadata_json_column: str = "langchain_metadata",
-        id_column: Union[str, Column, ColumnDict] = "langchain_id",
-        overwrite_existing: bool = False,
-        store_metadata: bool = True,
-        hybrid_search_config: Optional[HybridSearchConfig] = None,
-    ) -> None:
-        """
-        Create a table for saving of vectors to be used with PGVectorStore.
+        schema_name: str,
+        content_column: str,
+        concurrently: bool = False,
+    ) -> str:
+        """Build the CREATE INDEX statement of the full-text search index."""
+        validate_identifier(hybrid_search_config.index_type)
+        if hybrid_search_config.tsv_column:
+            tsv_expression = f'"{self._escape_postgres_identifier(hybrid_search_config.tsv_column)}"'
+        else:
+            tsv_lang = (hybrid_search_config.tsv_lang or DEFAULT_TSV_LANG).replace(
+                "'", "''"
+            )
+            tsv_expression = f"(to_tsvector('{tsv_lang}'::regconfig, \"{self._escape_postgres_identifier(content_column)}\"))"
+        return (
+            f'CREATE INDEX {"CONCURRENTLY" if concurrently else ""} '
+            f'"{self._escape_postgres_identifier(hybrid_search_config.index_name)}" '
+            f'ON "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}" '
+            f"USING {hybrid_search_config.index_type} ({tsv_expression});"
+        )
 
-        Args:
-            table_name (str): The database table name.
-            vector_size (int): Vector size for the embedding model to be used.
-            schema_name (str): The schema name.
-                Default: "public".
-            content_column (str): Name of the column to store document content.
-                Default: "page_content".
-            embedding_column (str) : Name of the column to store vector embeddings.
-                Default: "embedding".
-            metadata_columns (Optional[list[Union[Column, ColumnDict]]]): A list of Columns to create for custom
-                metadata. Default: None. Optional.
-            metadata_json_column (str): The column to store extra metadata in JSON format.
-                Default: "langchain_metadata". Optional.
-            id_column (Union[str, Column, ColumnDict]) :  Column to store ids.
-                Default: "langchain_id" column name with data type UUID. Optional.
-            overwrite_existing (bool): Whether to drop existing table. Default: False.
-            store_metadata (bool): Whether to store metadata in the table.
-                Default: True.
-            hybrid_search_config (HybridSearchConfig): Hybrid search configuration.
-                Note that queries might be slow if the hybrid search column does not exist.
-                For best hybrid search performance, consider creating a TSV column and adding GIN index.
-                Default: None.
+    def _metadata_indexes(
+        self,
+        table_name: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        *,
+        schema_name: str,
+        metadata_json_column: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Build the names and CREATE INDEX statements of the indexed metadata columns.
+
+        Each index is named "<table_name>_<column>_idx", shortened with a hash
+        when longer than MAX_IDENTIFIER_BYTES, and created IF NOT EXISTS. A
+        metadata_json_column gets a GIN jsonb_path_ops index on its jsonb cast,
+        the expression that metadata filters test containment on.
         """
-        await self._run_as_async(
-            self._ainit_vectorstore_table(
+        indexed = []
+        for column in metadata_columns or []:
+            if isinstance(column, dict):
+                self._validate_column_dict(column)
+                column = Column(**column)
+            if column.index is not None:
+                indexed.append(
+                    (
+                        column.name,
+                        f'USING {column.index} ("{self._escape_postgres_identifier(column.name)}")',
+                    )
+                )
+        if metadata_json_column:
+            indexed.append(
+                (
+                    metadata_json_column,
+                    f'USING gin ((CAST("{self._escape_postgres_identifier(metadata_json_column)}" AS JSONB)) jsonb_path_ops)',
+                )
+            )
+        indexes = []
+        for column_name, method in indexed:
+            index_name = _generated_identifier(f"{table_name}_{column_name}_idx")
+            indexes.append(
+                (
+                    index_name,
+                    f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}IF NOT EXISTS '
+                    f'"{self._escape_postgres_identifier(index_name)}" '
+                    f'ON "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}" '
+                    f"{method};",
+                )
+            )
+        return indexes
+
+    def _metadata_index_statements(
+        self,
+        table_name: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        *,
+        schema_name: str,
+        metadata_json_column: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> list[str]:
+        """Build the CREATE INDEX statements of the indexed metadata columns."""
+        return [
+            statement
+            for _, statement in self._metadata_indexes(
                 table_name,
-                vector_size,
+                metadata_columns,
                 schema_name=schema_name,
-                content_column=content_column,
-                embedding_column=embedding_column,
-                metadata_columns=metadata_columns,
                 metadata_json_column=metadata_json_column,
-                id_column=id_column,
-                overwrite_existing=overwrite_existing,
-                store_metadata=store_metadata,
-                hybrid_search_config=hybrid_search_config,
+                concurrently=concurrently,
             )
-        )
+        ]
 
-    def init_vectorstore_table(
+    def _vector_index_statement(
         self,
         table_name: str,
-        vector_size: int,
+        index: BaseIndex,
         *,
-        schema_name: str = "public",
-        content_column: str = "content",
-        embedding_column: str = "embedding",
-        metadata_columns: Optional[list[Union[Column, ColumnDict]]] = None,
-        metadata_json_column: str = "langchain_metadata",
-        id_column: Union[str, Column, ColumnDict] = "langchain_id",
+        schema_name: str,
+        embedding_column: str,
+        concurrently: bool = False,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        vector_size: Optional[int] = None,
+    ) -> str:
+        """Build the CREATE INDEX statement of an ANN index.
+
+        BinaryQuantizedHNSWIndex indexes an expression that needs vector_size.
+        """
+        name = index.name or table_name + DEFAULT_INDEX_NAME_SUFFIX
+        function = index.get_index_function(storage_type)
+        column = f'"{self._escape_postgres_identifier(embedding_column)}"'
+        if isinstance(index, BinaryQuantizedHNSWIndex):
+            if vector_size is None:
+                raise ValueError("Binary quantized indexes need the vector size.")
+            column = self._binary_quantize_expression(column, vector_size)
+        params = "WITH " + index.index_options()
+        filter = (
+            f"WHERE ({' AND '.join(index.partial_indexes)})"
+            if index.partial_indexes
+            else ""
+        )
+        return (
+            f'CREATE INDEX {"CONCURRENTLY" if concurrently else ""} "{self._escape_postgres_identifier(name)}" '
+            f'ON "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}" '
+            f"USING {index.index_type} ({column} {function}) {params} {filter};"
+        )
+
+    def _binary_quantize_expression(self, embedding: str, vector_size: int) -> str:
+        """Expression indexed by BinaryQuantizedHNSWIndex; queries must match it exactly."""
+        return f"(binary_quantize({embedding})::bit({int(vector_size)}))"
+
+    async def _avector_column_dimensions(
+        self,
+        conn: AsyncConnection,
+        table_name: str,
+        *,
+        schema_name: str,
+        embedding_column: str,
+    ) -> int:
+        """Declared dimensions of a vector or halfvec column.
+
+        Raises:
+            ValueError: If the column does not exist or has no declared dimensions.
+        """
+        result = await conn.execute(
+            text(
+                "SELECT atttypmod FROM pg_attribute "
+                "WHERE attrelid = CAST(:table_name AS regclass) AND attname = :column_name"
+            ),
+            {
+                "table_name": f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"',
+                "column_name": embedding_column,
+            },
+        )
+        dimensions = result.scalar()
+        if dimensions is None or dimensions < 1:
+            raise ValueError(
+                f"Column {embedding_column} of {schema_name}.{table_name} has no declared dimensions."
+            )
+        return dimensions
+
+    async def _aapply_hybrid_search_index(
+        self,
+        table_name: str,
+        hybrid_search_config: HybridSearchConfig,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        concurrently: bool = False,
+    ) -> None:
+        """
+        Create the full-text search index described by a hybrid search configuration.
+
+        The index is built on hybrid_search_config.tsv_column, or on a
+        to_tsvector expression over the content column when no TSV column is set.
+
+        Args:
+            table_name (str): The database table name.
+            hybrid_search_config (HybridSearchConfig): Hybrid search configuration
+                providing index_name, index_type, tsv_column and tsv_lang.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            concurrently (bool): Build with CREATE INDEX CONCURRENTLY.
+                Default: False.
+        """
+        query = self._hybrid_search_index_statement(
+            table_name,
+            hybrid_search_config,
+            schema_name=schema_name,
+            content_column=content_column,
+            concurrently=concurrently,
+        )
+
+        async with self._pool.connect() as conn:
+            if concurrently:
+                autocommit_conn = await conn.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+                await autocommit_conn.execute(text(query))
+            else:
+                await conn.execute(text(query))
+                await conn.commit()
+
+    async def aapply_hybrid_search_index(
+        self,
+        table_name: str,
+        hybrid_search_config: HybridSearchConfig,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        concurrently: bool = False,
+    ) -> None:
+        """Create the full-text search index described by a hybrid search configuration."""
+        await self._run_as_async(
+            self._aapply_hybrid_search_index(
+                table_name,
+                hybrid_search_config,
+                schema_name=schema_name,
+                content_column=content_column,
+                concurrently=concurrently,
+            )
+        )
+
+    def apply_hybrid_search_index(
+        self,
+        table_name: str,
+        hybrid_search_config: HybridSearchConfig,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        concurrently: bool = False,
+    ) -> None:
+        """Create the full-text search index described by a hybrid search configuration."""
+        self._run_as_sync(
+            self._aapply_hybrid_search_index(
+                table_name,
+                hybrid_search_config,
+                schema_name=schema_name,
+                content_column=content_column,
+                concurrently=concurrently,
+            )
+        )
+
+    async def _aapply_metadata_indexes(
+        self,
+        table_name: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        *,
+        schema_name: str = "public",
+        metadata_json_column: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> None:
+        """
+        Create the indexes of the metadata columns that declare an index type.
+
+        Args:
+            table_name (str): The database table name.
+            metadata_columns (Optional[list[Union[Column, ColumnDict]]]): The
+                table's metadata columns; those with an index are indexed.
+            schema_name (str): The schema name.
+                Default: "public".
+            metadata_json_column (Optional[str]): JSON metadata column to build
+                a GIN jsonb_path_ops index on, or None to skip it. Default: None.
+            concurrently (bool): Build with CREATE INDEX CONCURRENTLY. A failed
+                concurrent build leaves an INVALID index behind, which IF NOT
+                EXISTS would then skip, so it is dropped before the error is
+                raised, and INVALID indexes with these names left by an
+                interrupted earlier run are dropped before building.
+                Default: False.
+        """
+        indexes = self._metadata_indexes(
+            table_name,
+            metadata_columns,
+            schema_name=schema_name,
+            metadata_json_column=metadata_json_column,
+            concurrently=concurrently,
+        )
+        if not indexes:
+            return
+
+        schema = self._escape_postgres_identifier(schema_name)
+        async with self._pool.connect() as conn:
+            if not concurrently:
+                for _, statement in indexes:
+                    await conn.execute(text(statement))
+                await conn.commit()
+                return
+
+            autocommit_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await autocommit_conn.execute(
+                text(
+                    "SELECT c.relname FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE NOT i.indisvalid AND n.nspname = :schema_name "
+                    "AND c.relname = ANY(:index_names)"
+                ),
+                {
+                    "schema_name": schema_name,
+                    "index_names": [index_name for index_name, _ in indexes],
+                },
+            )
+            for invalid_name in result.scalars().all():
+                await autocommit_conn.execute(
+                    text(
+                        f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}".'
+                        f'"{self._escape_postgres_identifier(invalid_name)}"'
+                    )
+                )
+            for index_name, statement in indexes:
+                try:
+                    await autocommit_conn.execute(text(statement))
+                except Exception:
+                    try:
+                        await autocommit_conn.execute(
+                            text(
+                                f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}".'
+                                f'"{self._escape_postgres_identifier(index_name)}"'
+                            )
+                        )
+                    except Exception:
+                        # The connection may be gone; the next run drops it
+                        pass
+                    raise
+
+    async def aapply_metadata_indexes(
+        self,
+        table_name: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        *,
+        schema_name: str = "public",
+        metadata_json_column: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> None:
+        """Create the indexes of the metadata columns that declare an index type."""
+        await self._run_as_async(
+            self._aapply_metadata_indexes(
+                table_name,
+                metadata_columns,
+                schema_name=schema_name,
+                metadata_json_column=metadata_json_column,
+                concurrently=concurrently,
+            )
+        )
+
+    def apply_metadata_indexes(
+        self,
+        table_name: str,
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]],
+        *,
+        schema_name: str = "public",
+        metadata_json_column: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> None:
+        """Create the indexes of the metadata columns that declare an index type."""
+        self._run_as_sync(
+            self._aapply_metadata_indexes(
+                table_name,
+                metadata_columns,
+                schema_name=schema_name,
+                metadata_json_column=metadata_json_column,
+                concurrently=concurrently,
+            )
+        )
+
+    async def _aapply_vector_index(
+        self,
+        table_name: str,
+        index: BaseIndex,
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> None:
+        """
+        Create an ANN index on the embedding column of a vector store table.
+
+        Args:
+            table_name (str): The database table name.
+            index (BaseIndex): The index to create. ExactNearestNeighbor creates nothing.
+            schema_name (str): The schema name.
+                Default: "public".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            storage_type (VectorStorageType): Column type of the embeddings,
+                which selects the operator class. Default: VectorStorageType.VECTOR.
+        """
+        if isinstance(index, ExactNearestNeighbor):
+            return
+
+        if index.extension_name:
+            async with self._pool.connect() as conn:
+                created = await self._aensure_extensions(conn, [index.extension_name])
+                await conn.commit()
+            self._installed_extensions.update(created)
+
+        vector_size = None
+        if isinstance(index, BinaryQuantizedHNSWIndex):
+            async with self._pool.connect() as conn:
+                vector_size = await self._avector_column_dimensions(
+                    conn,
+                    table_name,
+                    schema_name=schema_name,
+                    embedding_column=embedding_column,
+                )
+
+        query = self._vector_index_statement(
+            table_name,
+            index,
+            schema_name=schema_name,
+            embedding_column=embedding_column,
+            concurrently=index.concurrently,
+            storage_type=storage_type,
+            vector_size=vector_size,
+        )
+
+        if index.concurrently:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+            # so build parameters are set for the session and reset afterwards
+            # to keep them from leaking into other users of the pooled connection.
+            async with self._pool.connect() as conn:
+                autocommit_conn = await conn.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+                try:
+                    for parameter in index.build_parameters():
+                        await autocommit_conn.execute(text(f"SET {parameter}"))
+                    await autocommit_conn.execute(text(query))
+                finally:
+                    for parameter in index.build_parameters():
+                        name = parameter.split("=")[0].strip()
+                        await autocommit_conn.execute(text(f"RESET {name}"))
+        else:
+            async with self._pool.connect() as conn:
+                for parameter in index.build_parameters():
+                    await conn.execute(text(f"SET LOCAL {parameter}"))
+                await conn.execute(text(query))
+                await conn.commit()
+
+    async def aapply_vector_index(
+        self,
+        table_name: str,
+        index: BaseIndex,
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> None:
+        """Create an ANN index on the embedding column of a vector store table."""
+        await self._run_as_async(
+            self._aapply_vector_index(
+                table_name,
+                index,
+                schema_name=schema_name,
+                embedding_column=embedding_column,
+                storage_type=storage_type,
+            )
+        )
+
+    def apply_vector_index(
+        self,
+        table_name: str,
+        index: BaseIndex,
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> None:
+        """Create an ANN index on the embedding column of a vector store table."""
+        self._run_as_sync(
+            self._aapply_vector_index(
+                table_name,
+                index,
+                schema_name=schema_name,
+                embedding_column=embedding_column,
+                storage_type=storage_type,
+            )
+        )
+
+    async def ainit_vectorstore_table(
+        self,
+        table_name: str,
+        vector_size: int,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]] = None,
+        metadata_json_column: str = "langchain_metadata",
+        id_column: Union[str, Column, ColumnDict] = "langchain_id",
         overwrite_existing: bool = False,
         store_metadata: bool = True,
+        metadata_json_index: bool = False,
         hybrid_search_config: Optional[HybridSearchConfig] = None,
+        vector_index: Optional[BaseIndex] = None,
+        defer_index_build: bool = False,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        partitioning: Optional[BasePartitioning] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> None:
         """
         Create a table for saving of vectors to be used with PGVectorStore.
@@ -348,7 +1527,8 @@ class PGEngine:
             embedding_column (str) : Name of the column to store vector embeddings.
                 Default: "embedding".
             metadata_columns (Optional[list[Union[Column, ColumnDict]]]): A list of Columns to create for custom
-                metadata. Default: None. Optional.
+                metadata. Columns with an index get a btree, hash, gin or brin
+                index on them. Default: None. Optional.
             metadata_json_column (str): The column to store extra metadata in JSON format.
                 Default: "langchain_metadata". Optional.
             id_column (Union[str, Column, ColumnDict]) :  Column to store ids.
@@ -356,12 +1536,33 @@ class PGEngine:
             overwrite_existing (bool): Whether to drop existing table. Default: False.
             store_metadata (bool): Whether to store metadata in the table.
                 Default: True.
+            metadata_json_index (bool): Build a GIN jsonb_path_ops index on the
+                metadata JSON column, for metadata filters on its keys.
+                Default: False.
             hybrid_search_config (HybridSearchConfig): Hybrid search configuration.
-                Note that queries might be slow if the hybrid search column does not exist.
-                For best hybrid search performance, consider creating a TSV column and adding GIN index.
+                Adds a generated TSVECTOR column (tsv_column, default "<content_column>_tsv")
+                computed from the content column, and the index_name/index_type index on it.
+                Default: None.
+            vector_index (Optional[BaseIndex]): ANN index to build on the embedding
+                column once the table exists, e.g. HNSWIndex or IVFFlatIndex.
                 Default: None.
+            defer_index_build (bool): Skip building the vector, full-text and
+                metadata indexes, e.g. to build them after a bulk load with
+                apply_vector_index, apply_hybrid_search_index and
+                apply_metadata_indexes. Default: False.
+            storage_type (VectorStorageType): Column type of the embeddings:
+                vector (float4), halfvec (float2), bit or sparsevec. Vector
+                indexes use the matching operator classes.
+                Default: VectorStorageType.VECTOR.
+            partitioning (Optional[BasePartitioning]): Partition the table with
+                HashPartitioning, ListPartitioning or RangePartitioning. The
+                child partitions are created with the table, and each gets its
+                own vector and full-text index. Default: None.
+            search_profile (Optional[SearchProfile]): Settings for the table's
+                searches, e.g. hnsw.ef_search and work_mem, saved with the table
+                as by save_query_options. Default: None.
         """
-        self._run_as_sync(
+        await self._run_as_async(
             self._ainit_vectorstore_table(
                 table_name,
                 vector_size,
@@ -373,38 +1574,2161 @@ class PGEngine:
                 id_column=id_column,
                 overwrite_existing=overwrite_existing,
                 store_metadata=store_metadata,
+                metadata_json_index=metadata_json_index,
                 hybrid_search_config=hybrid_search_config,
+                vector_index=vector_index,
+                defer_index_build=defer_index_build,
+                storage_type=storage_type,
+                partitioning=partitioning,
+                search_profile=search_profile,
             )
         )
 
-    async def _adrop_table(
+    def init_vectorstore_table(
         self,
         table_name: str,
+        vector_size: int,
         *,
         schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[Union[Column, ColumnDict]]] = None,
+        metadata_json_column: str = "langchain_metadata",
+        id_column: Union[str, Column, ColumnDict] = "langchain_id",
+        overwrite_existing: bool = False,
+        store_metadata: bool = True,
+        metadata_json_index: bool = False,
+        hybrid_search_config: Optional[HybridSearchConfig] = None,
+        vector_index: Optional[BaseIndex] = None,
+        defer_index_build: bool = False,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        partitioning: Optional[BasePartitioning] = None,
+        search_profile: Optional[SearchProfile] = None,
     ) -> None:
-        """Drop the vector store table"""
-        query = f'DROP TABLE IF EXISTS "{schema_name}"."{table_name}";'
-        async with self._pool.connect() as conn:
-            await conn.execute(text(query))
-            await conn.commit()
+        """
+        Create a table for saving of vectors to be used with PGVectorStore.
 
-    async def adrop_table(
-        self,
-        table_name: str,
-        *,
-        schema_name: str = "public",
-    ) -> None:
-        await self._run_as_async(
-            self._adrop_table(table_name=table_name, schema_name=schema_name)
+        Args:
+            table_name (str): The database table name.
+            vector_size (int): Vector size for the embedding model to be used.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column to store document content.
+                Default: "page_content".
+            embedding_column (str) : Name of the column to store vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[Union[Column, ColumnDict]]]): A list of Columns to create for custom
+                metadata. Columns with an index get a btree, hash, gin or brin
+                index on them. Default: None. Optional.
+            metadata_json_column (str): The column to store extra metadata in JSON format.
+                Default: "langchain_metadata". Optional.
+            id_column (Union[str, Column, ColumnDict]) :  Column to store ids.
+                Default: "langchain_id" column name with data type UUID. Optional.
+            overwrite_existing (bool): Whether to drop existing table. Default: False.
+            store_metadata (bool): Whether to store metadata in the table.
+                Default: True.
+            metadata_json_index (bool): Build a GIN jsonb_path_ops index on the
+                metadata JSON column, for metadata filters on its keys.
+                Default: False.
+            hybrid_search_config (HybridSearchConfig): Hybrid search configuration.
+                Adds a generated TSVECTOR column (tsv_column, default "<content_column>_tsv")
+                computed from the content column, and the index_name/index_type index on it.
+                Default: None.
+            vector_index (Optional[BaseIndex]): ANN index to build on the embedding
+                column once the table exists, e.g. HNSWIndex or IVFFlatIndex.
+                Default: None.
+            defer_index_build (bool): Skip building the vector, full-text and
+                metadata indexes, e.g. to build them after a bulk load with
+                apply_vector_index, apply_hybrid_search_index and
+                apply_metadata_indexes. Default: False.
+            storage_type (VectorStorageType): Column type of the embeddings:
+                vector (float4), halfvec (float2), bit or sparsevec. Vector
+                indexes use the matching operator classes.
+                Default: VectorStorageType.VECTOR.
+            partitioning (Optional[BasePartitioning]): Partition the table with
+                HashPartitioning, ListPartitioning or RangePartitioning. The
+                child partitions are created with the table, and each gets its
+                own vector and full-text index. Default: None.
+            search_profile (Optional[SearchProfile]): Settings for the table's
+                searches, e.g. hnsw.ef_search and work_mem, saved with the table
+                as by save_query_options. Default: None.
+        """
+        self._run_as_sync(
+            self._ainit_vectorstore_table(
+                table_name,
+                vector_size,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                overwrite_existing=overwrite_existing,
+                store_metadata=store_metadata,
+                metadata_json_index=metadata_json_index,
+                hybrid_search_config=hybrid_search_config,
+                vector_index=vector_index,
+                defer_index_build=defer_index_build,
+                storage_type=storage_type,
+                partitioning=partitioning,
+                search_profile=search_profile,
+            )
         )
 
-    def drop_table(
-        self,
-        table_name: str,
-        *,
-        schema_name: str = "public",
-    ) -> None:
-        self._run_as_sync(
-            self._adrop_table(table_name=table_name, schema_name=schema_name)
+    def _required_extensions(self, table: VectorStoreTable) -> list[str]:
+        """Extensions that must be installed before creating a table and its indexes."""
+        extensions = ["vector"]
+        index = table.vector_index
+        if (
+            index is not None
+            and index.extension_name
+            and not table.defer_index_build
+            and not isinstance(index, ExactNearestNeighbor)
+        ):
+            extensions.append(index.extension_name)
+        return extensions
+
+    def _vectorstore_table_clauses(self, table: VectorStoreTable) -> tuple[TextClause, ...]:
+        """_vectorstore_table_statements as TextClauses.
+
+        They are not cached: the statements name their table, so an entry
+        would only be hit by creating the same table again, while pushing hot
+        search statements out of the shared LRU.
+        """
+        return tuple(
+            text(statement) for statement in self._vectorstore_table_statements(table)
+        )
+
+    def _vectorstore_table_statements(self, table: VectorStoreTable) -> list[str]:
+        """All statements creating a table and its indexes, to run in one transaction.
+
+        Expects the extensions from _required_extensions to exist. Index builds
+        always run non-concurrently here, with their build parameters set by
+        SET LOCAL.
+        """
+        # Saved in the same transaction, so the table never exists without it
+        profile_statements = (
+            self._save_query_options_statements(
+                table.table_name, table.search_profile, schema_name=table.schema_name
+            )
+            if table.search_profile is not None
+            else []
+        )
+        statements = []
+        if table.overwrite_existing:
+            statements.append(
+                self._drop_table_statement(
+                    table.table_name, schema_name=table.schema_name
+                )
+            )
+        statements.append(
+            self._create_table_statement(
+                table.table_name,
+                table.vector_size,
+                schema_name=table.schema_name,
+                content_column=table.content_column,
+                embedding_column=table.embedding_column,
+                metadata_columns=table.metadata_columns,
+                metadata_json_column=table.metadata_json_column,
+                id_column=table.id_column,
+                store_metadata=table.store_metadata,
+                hybrid_search_config=table.hybrid_search_config,
+                storage_type=table.storage_type,
+                partitioning=table.partitioning,
+            )
+        )
+        if table.partitioning:
+            statements.extend(
+                self._partition_statements(
+                    table.table_name, table.partitioning, schema_name=table.schema_name
+                )
+            )
+        if table.defer_index_build:
+            return statements + profile_statements
+        statements.extend(
+            self._metadata_index_statements(
+                table.table_name,
+                table.metadata_columns,
+                schema_name=table.schema_name,
+                metadata_json_column=(
+                    table.metadata_json_column
+                    if table.store_metadata and table.metadata_json_index
+                    else None
+                ),
+            )
+        )
+        if table.hybrid_search_config:
+            statements.append(
+                self._hybrid_search_index_statement(
+                    table.table_name,
+                    table.hybrid_search_config,
+                    schema_name=table.schema_name,
+                    content_column=table.content_column,
+                )
+            )
+        index = table.vector_index
+        if index is not None and not isinstance(index, ExactNearestNeighbor):
+            # Binary quantized indexes hold bit strings, whatever the column type.
+            indexed_type = (
+                VectorStorageType.BIT
+                if isinstance(index, BinaryQuantizedHNSWIndex)
+                else table.storage_type
+            )
+            max_dimensions = INDEX_MAX_DIMENSIONS.get(indexed_type)
+            if max_dimensions is not None and table.vector_size > max_dimensions:
+                raise ValueError(
+                    f"{index.index_type} indexes support at most {max_dimensions} dimensions "
+                    f"for {indexed_type.value} values."
+                )
+            statements.extend(
+                f"SET LOCAL {parameter}" for parameter in index.build_parameters()
+            )
+            statements.append(
+                self._vector_index_statement(
+                    table.table_name,
+                    index,
+                    schema_name=table.schema_name,
+                    embedding_column=table.embedding_column,
+                    storage_type=table.storage_type,
+                    vector_size=table.vector_size,
+                )
+            )
+        return statements + profile_statements
+
+    async def _ainit_vectorstore_tables(
+        self,
+        tables: Sequence[VectorStoreTable],
+        *,
+        chunk_size: int = 50,
+    ) -> list[TableProvisioningResult]:
+        """
+        Create many vector store tables over a single connection.
+
+        Tables are created chunk_size at a time, one transaction per chunk.
+        Each table runs inside its own savepoint, so a table that fails (e.g.
+        because it already exists) is rolled back and reported without
+        affecting the other tables of its chunk. Vector indexes with
+        concurrently set are built after their chunk commits, as by
+        init_vectorstore_table; a failed build is reported in the table's error.
+
+        Args:
+            tables (Sequence[VectorStoreTable]): The tables to create.
+            chunk_size (int): Number of tables created per transaction.
+                Default: 50.
+
+        Returns:
+            list[TableProvisioningResult]: One result per table, in input order.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        results: list[TableProvisioningResult] = []
+        async with self._pool.connect() as conn:
+            created = await self._aensure_extensions(
+                conn,
+                {
+                    extension
+                    for table in tables
+                    for extension in self._required_extensions(table)
+                },
+            )
+            await conn.commit()
+            self._installed_extensions.update(created)
+
+            for start in range(0, len(tables), chunk_size):
+                concurrent_indexes: list[tuple[VectorStoreTable, BaseIndex, TableProvisioningResult]] = []
+                for table in tables[start : start + chunk_size]:
+                    result = TableProvisioningResult(
+                        table_name=table.table_name,
+                        schema_name=table.schema_name,
+                        created=True,
+                    )
+                    try:
+                        table_without_index, concurrent_index = self._split_concurrent_index(table)
+                        statements = self._vectorstore_table_clauses(table_without_index)
+                        async with conn.begin_nested():
+                            for statement in statements:
+                                await conn.execute(statement)
+                        if concurrent_index is not None:
+                            concurrent_indexes.append((table, concurrent_index, result))
+                    except (DBAPIError, TypeError, ValueError) as e:
+                        result.created = False
+                        result.error = str(getattr(e, "orig", None) or e)
+                    results.append(result)
+                await conn.commit()
+                for table, result in zip(tables[start : start + chunk_size], results[start:]):
+                    if result.created and table.search_profile is not None:
+                        self._saved_query_options[(table.schema_name, table.table_name)] = (
+                            time.monotonic(),
+                            table.search_profile,
+                        )
+                for table, index, result in concurrent_indexes:
+                    try:
+                        await self._aapply_vector_index(
+                            table.table_name,
+                            index,
+                            schema_name=table.schema_name,
+                            embedding_column=table.embedding_column,
+                            storage_type=table.storage_type,
+                        )
+                    except (DBAPIError, TypeError, ValueError) as e:
+                        # The table itself was created
+                        result.error = f"Vector index build failed: {getattr(e, 'orig', None) or e}"
+        return results
+
+    async def ainit_vectorstore_tables(
+        self,
+        tables: Sequence[VectorStoreTable],
+        *,
+        chunk_size: int = 50,
+    ) -> list[TableProvisioningResult]:
+        """
+        Create many vector store tables over a single connection.
+
+        Args:
+            tables (Sequence[VectorStoreTable]): The tables to create.
+            chunk_size (int): Number of tables created per transaction.
+                Default: 50.
+
+        Returns:
+            list[TableProvisioningResult]: One result per table, in input order.
+        """
+        return await self._run_as_async(
+            self._ainit_vectorstore_tables(tables, chunk_size=chunk_size)
+        )
+
+    def init_vectorstore_tables(
+        self,
+        tables: Sequence[VectorStoreTable],
+        *,
+        chunk_size: int = 50,
+    ) -> list[TableProvisioningResult]:
+        """
+        Create many vector store tables over a single connection.
+
+        Args:
+            tables (Sequence[VectorStoreTable]): The tables to create.
+            chunk_size (int): Number of tables created per transaction.
+                Default: 50.
+
+        Returns:
+            list[TableProvisioningResult]: One result per table, in input order.
+        """
+        return self._run_as_sync(
+            self._ainit_vectorstore_tables(tables, chunk_size=chunk_size)
+        )
+
+    async def _adrop_table(
+        self,
+        table_name: str,
+        *,
+        schema_name: str = "public",
+    ) -> None:
+        """Drop the vector store table"""
+        query = f'DROP TABLE IF EXISTS "{schema_name}"."{table_name}";'
+        async with self._pool.connect() as conn:
+            await conn.execute(text(query))
+            await conn.commit()
+
+    async def adrop_table(
+        self,
+        table_name: str,
+        *,
+        schema_name: str = "public",
+    ) -> None:
+        await self._run_as_async(
+            self._adrop_table(table_name=table_name, schema_name=schema_name)
+        )
+
+    def drop_table(
+        self,
+        table_name: str,
+        *,
+        schema_name: str = "public",
+    ) -> None:
+        self._run_as_sync(
+            self._adrop_table(table_name=table_name, schema_name=schema_name)
+        )
+
+    async def _driver_connection(self, conn: AsyncConnection) -> Any:
+        """Return the underlying asyncio driver connection of a pooled connection."""
+        raw_conn = await conn.get_raw_connection()
+        return raw_conn.driver_connection
+
+    async def _aadd_embeddings(
+        self,
+        table_name: str,
+        batches: Union[
+            EmbeddingBatch, Iterable[EmbeddingBatch], AsyncIterable[EmbeddingBatch]
+        ],
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Bulk load embeddings with COPY ... FROM STDIN (FORMAT BINARY).
+
+        Embeddings are encoded for the type of the embedding column (vector,
+        halfvec, bit or sparsevec), so bit columns take arrays of 0/1 values and
+        sparsevec columns take dense arrays whose zeros are left out.
+
+        Args:
+            table_name (str): The database table name.
+            batches: An EmbeddingBatch, or an iterable or async iterable of them.
+                Batches are consumed lazily, one at a time.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns. Default: None.
+            metadata_json_column (Optional[str]): The column storing extra metadata
+                in JSON format, or None if the table has no such column.
+                Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+
+        Raises:
+            NotImplementedError: If the engine does not use the psycopg driver.
+
+        Returns:
+            IngestStats: Number of rows loaded and elapsed time.
+        """
+        if self._pool.dialect.driver != "psycopg":
+            raise NotImplementedError("COPY ingestion requires the psycopg3 driver")
+
+        from .ingest import (
+            IngestStats,
+            aiter_batches,
+            copy_rows,
+            register_pre_encoded_dumper,
+        )
+
+        metadata_columns = metadata_columns or []
+        columns = [id_column, content_column, embedding_column, *metadata_columns]
+        if metadata_json_column:
+            columns.append(metadata_json_column)
+        qualified_table = f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        column_list = ", ".join(
+            f'"{self._escape_postgres_identifier(column)}"' for column in columns
+        )
+        copy_stmt = f"COPY {qualified_table} ({column_list}) FROM STDIN (FORMAT BINARY)"
+
+        rows = 0
+        start = time.perf_counter()
+        async with self._pool.connect() as conn:
+            driver_conn = await self._driver_connection(conn)
+            cursor = await driver_conn.execute(
+                """SELECT a.attname, a.atttypid::int, t.typname
+                FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid
+                WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped""",
+                (qualified_table,),
+            )
+            column_type_rows = await cursor.fetchall()
+            column_types = {name: oid for name, oid, _ in column_type_rows}
+            missing = [column for column in columns if column not in column_types]
+            if missing:
+                raise ValueError(
+                    f"Columns {missing} do not exist in table {qualified_table}."
+                )
+            # The embeddings are encoded for the column's actual type, so
+            # vector, halfvec, bit and sparsevec tables load the same way.
+            embedding_type_name = next(
+                type_name
+                for name, _, type_name in column_type_rows
+                if name == embedding_column
+            )
+            try:
+                storage_type = VectorStorageType(embedding_type_name)
+            except ValueError:
+                raise ValueError(
+                    f"Column {embedding_column} has type {embedding_type_name}, "
+                    f"expected one of {[t.value for t in VectorStorageType]}."
+                )
+            register_pre_encoded_dumper(driver_conn, column_types[embedding_column])
+
+            async with driver_conn.cursor() as cur:
+                async with cur.copy(copy_stmt) as copy:
+                    copy.set_types([column_types[column] for column in columns])
+                    async for batch in aiter_batches(batches):
+                        for row in copy_rows(
+                            batch,
+                            storage_type,
+                            metadata_columns,
+                            include_metadata_json=bool(metadata_json_column),
+                        ):
+                            await copy.write_row(row)
+                        rows += len(batch)
+            await driver_conn.commit()
+
+        return IngestStats(rows=rows, seconds=time.perf_counter() - start)
+
+    async def aadd_embeddings(
+        self,
+        table_name: str,
+        batches: Union[
+            EmbeddingBatch, Iterable[EmbeddingBatch], AsyncIterable[EmbeddingBatch]
+        ],
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Bulk load embeddings with COPY ... FROM STDIN (FORMAT BINARY).
+
+        Embeddings are encoded for the type of the embedding column (vector,
+        halfvec, bit or sparsevec), so bit columns take arrays of 0/1 values and
+        sparsevec columns take dense arrays whose zeros are left out.
+
+        The column arguments must match the layout the table was created with
+        by init_vectorstore_table.
+
+        Returns:
+            IngestStats: Number of rows loaded, elapsed time and rows per second.
+        """
+        return await self._run_as_async(
+            self._aadd_embeddings(
+                table_name,
+                batches,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+            )
+        )
+
+    def add_embeddings(
+        self,
+        table_name: str,
+        batches: Union[EmbeddingBatch, Iterable[EmbeddingBatch]],
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Bulk load embeddings with COPY ... FROM STDIN (FORMAT BINARY).
+
+        Embeddings are encoded for the type of the embedding column (vector,
+        halfvec, bit or sparsevec), so bit columns take arrays of 0/1 values and
+        sparsevec columns take dense arrays whose zeros are left out.
+
+        The column arguments must match the layout the table was created with
+        by init_vectorstore_table.
+
+        Returns:
+            IngestStats: Number of rows loaded, elapsed time and rows per second.
+        """
+        return self._run_as_sync(
+            self._aadd_embeddings(
+                table_name,
+                batches,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+            )
+        )
+
+    async def _adrop_secondary_indexes(
+        self, table_name: str, *, schema_name: str = "public"
+    ) -> list[str]:
+        """Drop the indexes of a table that back no constraint.
+
+        Returns:
+            list[str]: CREATE INDEX IF NOT EXISTS statements recreating them.
+        """
+        qualified_table = f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        async with self._pool.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT CAST(i.indexrelid AS regclass)::text, pg_get_indexdef(i.indexrelid) "
+                    "FROM pg_index i WHERE i.indrelid = CAST(:table_name AS regclass) "
+                    "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)"
+                ),
+                {"table_name": qualified_table},
+            )
+            indexes = result.all()
+            for index_name, _ in indexes:
+                # Dropping an index of a partitioned table drops it on every partition
+                await conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            await conn.commit()
+        return [
+            definition.replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1)
+            .replace("CREATE UNIQUE INDEX ", "CREATE UNIQUE INDEX IF NOT EXISTS ", 1)
+            # Partitioned indexes are reported ON ONLY the parent table
+            .replace(" ON ONLY ", " ON ", 1)
+            for _, definition in indexes
+        ]
+
+    async def _arecreate_indexes(
+        self,
+        definitions: Sequence[str],
+        *,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> None:
+        """Run CREATE INDEX statements, each on its own pooled connection.
+
+        maintenance_work_mem is set with SET LOCAL for each build, so running
+        n builds at once can use n times that much memory.
+        """
+        settings = []
+        if maintenance_work_mem is not None:
+            validate_memory_setting(maintenance_work_mem)
+            settings.append(f"maintenance_work_mem = '{maintenance_work_mem}'")
+
+        async def create(definition: str) -> None:
+            async with self._pool.connect() as conn:
+                for setting in settings:
+                    await conn.execute(text(f"SET LOCAL {setting}"))
+                # The definitions come from pg_get_indexdef, not from text()
+                await conn.exec_driver_sql(definition)
+                await conn.commit()
+
+        await asyncio.gather(*(create(definition) for definition in definitions))
+
+    async def adrop_secondary_indexes(
+        self, table_name: str, *, schema_name: str = "public"
+    ) -> list[str]:
+        """Drop the indexes of a table that back no constraint.
+
+        Use it with arecreate_indexes around bulk loads that do not go through
+        aimport_parquet, or to remove the vector index before applying another.
+
+        Returns:
+            list[str]: CREATE INDEX IF NOT EXISTS statements recreating them.
+        """
+        return await self._run_as_async(
+            self._adrop_secondary_indexes(table_name, schema_name=schema_name)
+        )
+
+    def drop_secondary_indexes(
+        self, table_name: str, *, schema_name: str = "public"
+    ) -> list[str]:
+        """Drop the indexes of a table that back no constraint.
+
+        Use it with recreate_indexes around bulk loads that do not go through
+        import_parquet, or to remove the vector index before applying another.
+
+        Returns:
+            list[str]: CREATE INDEX IF NOT EXISTS statements recreating them.
+        """
+        return self._run_as_sync(
+            self._adrop_secondary_indexes(table_name, schema_name=schema_name)
+        )
+
+    async def arecreate_indexes(
+        self,
+        definitions: Sequence[str],
+        *,
+        maintenance_work_mem: Optional[str] = DEFAULT_REBUILD_MAINTENANCE_WORK_MEM,
+    ) -> None:
+        """Rebuild indexes dropped by adrop_secondary_indexes, in parallel."""
+        await self._run_as_async(
+            self._arecreate_indexes(
+                definitions, maintenance_work_mem=maintenance_work_mem
+            )
+        )
+
+    def recreate_indexes(
+        self,
+        definitions: Sequence[str],
+        *,
+        maintenance_work_mem: Optional[str] = DEFAULT_REBUILD_MAINTENANCE_WORK_MEM,
+    ) -> None:
+        """Rebuild indexes dropped by drop_secondary_indexes, in parallel."""
+        self._run_as_sync(
+            self._arecreate_indexes(
+                definitions, maintenance_work_mem=maintenance_work_mem
+            )
+        )
+
+    async def _aimport_parquet(
+        self,
+        table_name: str,
+        paths: Sequence[Union[str, Path]],
+        *,
+        mapping: Optional[ArrowFieldMapping] = None,
+        batch_size: int = 50000,
+        connections: int = 4,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        rebuild_indexes: bool = True,
+        maintenance_work_mem: Optional[str] = DEFAULT_REBUILD_MAINTENANCE_WORK_MEM,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Import Parquet or Arrow IPC files into a table with parallel COPY.
+
+        Files are memory-mapped and read in record batches, which are mapped
+        onto the table layout by `mapping` and loaded by `connections`
+        concurrent COPY ... FROM STDIN (FORMAT BINARY), one transaction per
+        batch. Indexes that back no constraint (the vector and full-text search
+        indexes) are dropped before the load and rebuilt after it, which is
+        much faster than maintaining them row by row.
+
+        With a checkpoint_path, every committed batch and the definitions of
+        the dropped indexes are recorded there, so rerunning the same import
+        after a failure skips the loaded batches and still rebuilds the
+        indexes. A batch committed right before a crash may be loaded again.
+        Without one, a failed import rebuilds the indexes before raising.
+
+        Args:
+            table_name (str): The database table name.
+            paths (Sequence[Union[str, Path]]): Parquet files, or Arrow IPC
+                files ending in .arrow, .feather or .ipc.
+            mapping (Optional[ArrowFieldMapping]): Fields holding the ids,
+                contents, embeddings and metadata. Default: ArrowFieldMapping().
+            batch_size (int): Rows per Parquet batch and COPY transaction.
+                Default: 50000.
+            connections (int): Concurrent COPY connections. Default: 4.
+            checkpoint_path (Optional[Union[str, Path]]): JSON file recording
+                the progress. Default: None.
+            rebuild_indexes (bool): Drop the indexes before the load and rebuild
+                them after it. Default: True.
+            maintenance_work_mem (Optional[str]): maintenance_work_mem of each
+                index rebuild; the indexes are rebuilt in parallel, so they can
+                use this much memory each. None keeps the server setting.
+                Default: DEFAULT_REBUILD_MAINTENANCE_WORK_MEM ("512MB").
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns. Metadata fields with these names are stored in them.
+                Default: None.
+            metadata_json_column (Optional[str]): The column storing the other
+                metadata fields in JSON format, or None if the table has no such
+                column. Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            ValueError: If connections is not positive, or the checkpoint was
+                written with another batch size.
+
+        Returns:
+            IngestStats: Number of rows loaded by this call, elapsed time and rows per second.
+        """
+        from .arrow_import import (
+            ArrowFieldMapping,
+            ImportCheckpoint,
+            file_key,
+            iter_record_batches,
+            record_batch_to_embedding_batch,
+        )
+        from .ingest import IngestStats
+
+        if connections < 1:
+            raise ValueError("connections must be positive")
+        mapping = mapping or ArrowFieldMapping()
+        checkpoint = ImportCheckpoint.load(checkpoint_path, batch_size)
+        start = time.perf_counter()
+        if checkpoint.finished:
+            return IngestStats(rows=0, seconds=time.perf_counter() - start)
+
+        if rebuild_indexes and not checkpoint.dropped_indexes:
+            checkpoint.dropped_indexes = await self._adrop_secondary_indexes(
+                table_name, schema_name=schema_name
+            )
+            checkpoint.save()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * connections)
+        errors: list[BaseException] = []
+        rows = 0
+
+        async def copy_worker() -> None:
+            nonlocal rows
+            while (item := await queue.get()) is not None:
+                if errors:
+                    # Keep draining so the reader never blocks on a full queue
+                    continue
+                key, batch_index, batch = item
+                try:
+                    stats = await self._aadd_embeddings(
+                        table_name,
+                        batch,
+                        schema_name=schema_name,
+                        content_column=content_column,
+                        embedding_column=embedding_column,
+                        metadata_columns=metadata_columns,
+                        metadata_json_column=metadata_json_column,
+                        id_column=id_column,
+                    )
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                rows += stats.rows
+                checkpoint.mark_done(key, batch_index)
+
+        async def restore_indexes() -> None:
+            # Without a checkpoint, nothing else would rebuild them
+            if checkpoint.path is None and checkpoint.dropped_indexes:
+                await self._arecreate_indexes(
+                    checkpoint.dropped_indexes,
+                    maintenance_work_mem=maintenance_work_mem,
+                )
+
+        workers = [asyncio.create_task(copy_worker()) for _ in range(connections)]
+        try:
+            try:
+                for path in paths:
+                    key = file_key(path)
+                    record_batches = iter_record_batches(path, mapping, batch_size)
+                    batch_index = 0
+                    # Parquet decoding and batch conversion run in a thread, so
+                    # they overlap with the COPYs on the event loop
+                    while not errors and (
+                        record_batch := await asyncio.to_thread(next, record_batches, None)
+                    ) is not None:
+                        if not checkpoint.is_done(key, batch_index):
+                            batch = await asyncio.to_thread(
+                                record_batch_to_embedding_batch, record_batch, mapping
+                            )
+                            await queue.put((key, batch_index, batch))
+                        batch_index += 1
+            except Exception as e:
+                errors.append(e)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Cancelled: stop the COPYs and put the indexes back before re-raising
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await asyncio.shield(restore_indexes())
+            raise
+
+        if errors:
+            await restore_indexes()
+            raise errors[0]
+
+        await self._arecreate_indexes(
+            checkpoint.dropped_indexes, maintenance_work_mem=maintenance_work_mem
+        )
+        checkpoint.dropped_indexes = []
+        checkpoint.finished = True
+        checkpoint.save()
+        return IngestStats(rows=rows, seconds=time.perf_counter() - start)
+
+    async def aimport_parquet(
+        self,
+        table_name: str,
+        paths: Sequence[Union[str, Path]],
+        *,
+        mapping: Optional[ArrowFieldMapping] = None,
+        batch_size: int = 50000,
+        connections: int = 4,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        rebuild_indexes: bool = True,
+        maintenance_work_mem: Optional[str] = DEFAULT_REBUILD_MAINTENANCE_WORK_MEM,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Import Parquet or Arrow IPC files into a table with parallel COPY.
+
+        Indexes are dropped for the load and rebuilt after it; with a
+        checkpoint_path an interrupted import resumes where it stopped.
+
+        Returns:
+            IngestStats: Number of rows loaded by this call, elapsed time and rows per second.
+        """
+        return await self._run_as_async(
+            self._aimport_parquet(
+                table_name,
+                paths,
+                mapping=mapping,
+                batch_size=batch_size,
+                connections=connections,
+                checkpoint_path=checkpoint_path,
+                rebuild_indexes=rebuild_indexes,
+                maintenance_work_mem=maintenance_work_mem,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+            )
+        )
+
+    def import_parquet(
+        self,
+        table_name: str,
+        paths: Sequence[Union[str, Path]],
+        *,
+        mapping: Optional[ArrowFieldMapping] = None,
+        batch_size: int = 50000,
+        connections: int = 4,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        rebuild_indexes: bool = True,
+        maintenance_work_mem: Optional[str] = DEFAULT_REBUILD_MAINTENANCE_WORK_MEM,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+    ) -> IngestStats:
+        """
+        Import Parquet or Arrow IPC files into a table with parallel COPY.
+
+        Indexes are dropped for the load and rebuilt after it; with a
+        checkpoint_path an interrupted import resumes where it stopped.
+
+        Returns:
+            IngestStats: Number of rows loaded by this call, elapsed time and rows per second.
+        """
+        return self._run_as_sync(
+            self._aimport_parquet(
+                table_name,
+                paths,
+                mapping=mapping,
+                batch_size=batch_size,
+                connections=connections,
+                checkpoint_path=checkpoint_path,
+                rebuild_indexes=rebuild_indexes,
+                maintenance_work_mem=maintenance_work_mem,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+            )
+        )
+
+    async def _afetch_embeddings(
+        self,
+        table_name: str,
+        ids: Sequence[Any],
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> np.ndarray:
+        """
+        Fetch the embeddings of rows by id into a float32 matrix.
+
+        Embeddings are read in pgvector's binary format and copied into one
+        preallocated matrix with np.frombuffer, without parsing their text
+        format into Python lists.
+
+        Args:
+            table_name (str): The database table name.
+            ids (Sequence[Any]): Ids of the rows to fetch.
+            schema_name (str): The schema name.
+                Default: "public".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+            storage_type (VectorStorageType): Column type of the embeddings, vector
+                or halfvec. Default: VectorStorageType.VECTOR.
+
+        Raises:
+            ValueError: If a storage type other than vector or halfvec is given,
+                or some ids have no row.
+            NotImplementedError: If the engine uses neither psycopg nor asyncpg.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(ids), dimensions), row i
+            holding the embedding of ids[i].
+        """
+        from .ingest import decode_embeddings
+
+        if storage_type not in (VectorStorageType.VECTOR, VectorStorageType.HALFVEC):
+            raise ValueError("Only vector and halfvec embeddings can be fetched.")
+        query = self._cached_text(
+            ("fetch_embeddings", schema_name, table_name, embedding_column, id_column),
+            lambda: text(
+                f'SELECT "{self._escape_postgres_identifier(id_column)}", '
+                f'"{self._escape_postgres_identifier(embedding_column)}" '
+                f'FROM "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}" '
+                f'WHERE "{self._escape_postgres_identifier(id_column)}" = ANY(:ids)'
+            ),
+        )
+        # str ids are sent untyped, so the server casts them to the id type
+        params = {"ids": list(ids)}
+
+        async with self._pool.connect() as conn:
+            driver = self._pool.dialect.driver
+            if driver == "psycopg":
+                driver_conn = await self._driver_connection(conn)
+                # Types without a loader, like vector, load as raw bytes in
+                # the binary format
+                async with driver_conn.cursor(binary=True) as cursor:
+                    await cursor.execute(self._cached_driver_sql(query), params)
+                    rows = await cursor.fetchall()
+                await driver_conn.rollback()
+            elif driver == "asyncpg":
+                # Decoded into arrays by asyncpg_codecs.register_vector_codecs
+                rows = (await conn.execute(query, params)).all()
+            else:
+                raise NotImplementedError(
+                    "Fetching embeddings requires the psycopg or asyncpg driver"
+                )
+
+        values = {str(row_id): value for row_id, value in rows}
+        missing = [row_id for row_id in ids if str(row_id) not in values]
+        if missing:
+            raise ValueError(
+                f"No rows in {schema_name}.{table_name} for {len(missing)} ids, e.g. {missing[:5]}."
+            )
+        return decode_embeddings([values[str(row_id)] for row_id in ids], storage_type)
+
+    async def afetch_embeddings(
+        self,
+        table_name: str,
+        ids: Sequence[Any],
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> np.ndarray:
+        """
+        Fetch the embeddings of rows by id into a float32 matrix.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(ids), dimensions), row i
+            holding the embedding of ids[i].
+        """
+        return await self._run_as_async(
+            self._afetch_embeddings(
+                table_name,
+                ids,
+                schema_name=schema_name,
+                embedding_column=embedding_column,
+                id_column=id_column,
+                storage_type=storage_type,
+            )
+        )
+
+    def fetch_embeddings(
+        self,
+        table_name: str,
+        ids: Sequence[Any],
+        *,
+        schema_name: str = "public",
+        embedding_column: str = "embedding",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> np.ndarray:
+        """
+        Fetch the embeddings of rows by id into a float32 matrix.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(ids), dimensions), row i
+            holding the embedding of ids[i].
+        """
+        return self._run_as_sync(
+            self._afetch_embeddings(
+                table_name,
+                ids,
+                schema_name=schema_name,
+                embedding_column=embedding_column,
+                id_column=id_column,
+                storage_type=storage_type,
+            )
+        )
+
+    async def _astream_rows(
+        self,
+        table_name: str,
+        *,
+        batch_size: int = 10000,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> AsyncIterator[RowBatch]:
+        """
+        Read a whole table in batches through a server-side cursor.
+
+        Args:
+            table_name (str): The database table name.
+            batch_size (int): Rows per yielded batch. Default: 10000.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns to read. Default: None.
+            metadata_json_column (Optional[str]): The column storing extra metadata
+                in JSON format, or None if the table has no such column.
+                Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+            storage_type (VectorStorageType): Column type of the embeddings, vector
+                or halfvec. Default: VectorStorageType.VECTOR.
+
+        Raises:
+            ValueError: If batch_size is not positive or the storage type is
+                not vector or halfvec.
+            NotImplementedError: If the engine uses neither psycopg nor asyncpg.
+
+        Yields:
+            RowBatch: The next batch_size rows, in the table's physical order.
+        """
+        from .ingest import RowBatch, decode_embeddings
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        if storage_type not in (VectorStorageType.VECTOR, VectorStorageType.HALFVEC):
+            raise ValueError("Only vector and halfvec tables can be streamed.")
+        metadata_columns = metadata_columns or []
+        columns = [id_column, content_column, embedding_column, *metadata_columns]
+        if metadata_json_column:
+            columns.append(metadata_json_column)
+        column_list = ", ".join(
+            f'"{self._escape_postgres_identifier(column)}"' for column in columns
+        )
+        query = (
+            f"SELECT {column_list} FROM "
+            f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        )
+
+        def row_batch(rows: Sequence[Sequence[Any]]) -> RowBatch:
+            values = list(zip(*rows))
+            return RowBatch(
+                ids=list(values[0]),
+                contents=list(values[1]),
+                embeddings=decode_embeddings(values[2], storage_type),
+                metadata_columns={
+                    name: list(values[3 + i]) for i, name in enumerate(metadata_columns)
+                },
+                metadata_json=list(values[-1]) if metadata_json_column else None,
+            )
+
+        async with self._pool.connect() as conn:
+            driver = self._pool.dialect.driver
+            driver_conn = await self._driver_connection(conn)
+            if driver == "psycopg":
+                # A named cursor keeps the result on the server; each
+                # fetchmany pulls one batch. Types without a loader, like
+                # vector, load as raw bytes in the binary format.
+                async with driver_conn.cursor(
+                    name=f"astream_rows_{uuid.uuid4().hex}", binary=True
+                ) as cursor:
+                    await cursor.execute(query)
+                    while rows := await cursor.fetchmany(batch_size):
+                        yield row_batch(rows)
+                await driver_conn.rollback()
+            elif driver == "asyncpg":
+                # Cursors need a transaction; embeddings are decoded into
+                # arrays by asyncpg_codecs.register_vector_codecs
+                async with driver_conn.transaction():
+                    cursor = await driver_conn.cursor(query)
+                    while rows := await cursor.fetch(batch_size):
+                        yield row_batch(rows)
+            else:
+                raise NotImplementedError(
+                    "Streaming rows requires the psycopg or asyncpg driver"
+                )
+
+    async def astream_rows(
+        self,
+        table_name: str,
+        *,
+        batch_size: int = 10000,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> AsyncIterator[RowBatch]:
+        """
+        Read a whole table in batches through a server-side cursor.
+
+        Memory use is bounded by batch_size whatever the table size: the next
+        batch is only fetched once the caller asks for it, so a slow consumer
+        holds the cursor instead of buffering rows. Closing the iterator early
+        closes the cursor.
+
+        Args:
+            table_name (str): The database table name.
+            batch_size (int): Rows per yielded batch. Default: 10000.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns to read. Default: None.
+            metadata_json_column (Optional[str]): The column storing extra metadata
+                in JSON format, or None if the table has no such column.
+                Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+            storage_type (VectorStorageType): Column type of the embeddings, vector
+                or halfvec. Default: VectorStorageType.VECTOR.
+
+        Yields:
+            RowBatch: Ids, contents, metadata and a float32 embedding matrix of
+            the next batch_size rows.
+        """
+        stream = self._astream_rows(
+            table_name,
+            batch_size=batch_size,
+            schema_name=schema_name,
+            content_column=content_column,
+            embedding_column=embedding_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+            storage_type=storage_type,
+        )
+        try:
+            while (batch := await self._run_as_async(_anext_or_none(stream))) is not None:
+                yield batch
+        finally:
+            await self._run_as_async(_aclose_iterator(stream))
+
+    def stream_rows(
+        self,
+        table_name: str,
+        *,
+        batch_size: int = 10000,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+    ) -> Iterator[RowBatch]:
+        """
+        Read a whole table in batches through a server-side cursor.
+
+        Memory use is bounded by batch_size whatever the table size: the next
+        batch is only fetched once the caller asks for it.
+
+        Yields:
+            RowBatch: Ids, contents, metadata and a float32 embedding matrix of
+            the next batch_size rows.
+        """
+        stream = self._astream_rows(
+            table_name,
+            batch_size=batch_size,
+            schema_name=schema_name,
+            content_column=content_column,
+            embedding_column=embedding_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+            storage_type=storage_type,
+        )
+        try:
+            while (batch := self._run_as_sync(_anext_or_none(stream))) is not None:
+                yield batch
+        finally:
+            self._run_as_sync(_aclose_iterator(stream))
+
+    def _result_column_names(
+        self,
+        *,
+        content_column: str,
+        metadata_columns: Sequence[str],
+        metadata_json_column: Optional[str],
+        id_column: str,
+    ) -> str:
+        """Select list of the row columns returned by searches, id first."""
+        columns = [id_column, content_column, *metadata_columns]
+        if metadata_json_column:
+            columns.append(metadata_json_column)
+        return ", ".join(
+            f'"{self._escape_postgres_identifier(column)}"' for column in columns
+        )
+
+    def _similarity_search_query(
+        self,
+        table_name: str,
+        *,
+        schema_name: str,
+        content_column: str,
+        embedding_column: str,
+        metadata_columns: Sequence[str],
+        metadata_json_column: Optional[str],
+        id_column: str,
+        distance_strategy: DistanceStrategy,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        quantized_vector_size: Optional[int] = None,
+        filter_sql: Optional[str] = None,
+        exact: bool = False,
+    ) -> str:
+        """Build the top-k query, with :embedding and :k bind parameters.
+
+        With quantized_vector_size, the query first takes :candidates rows by
+        Hamming distance over the BinaryQuantizedHNSWIndex expression, then
+        re-ranks them by their exact distance.
+
+        filter_sql restricts the rows to search. With exact, the matching rows
+        are materialized first, so the planner finds them through indexes on
+        the filtered columns and sorts them instead of scanning the vector
+        index. Otherwise, the rows of the index scan are sorted again by
+        distance, since iterative scans in relaxed_order may return them
+        slightly out of order.
+        """
+        validate_storage_type(storage_type, distance_strategy)
+        if quantized_vector_size is not None and storage_type not in (
+            VectorStorageType.VECTOR,
+            VectorStorageType.HALFVEC,
+        ):
+            raise ValueError(
+                f"Binary quantized search is not supported for {storage_type.value} columns."
+            )
+        column_names = self._result_column_names(
+            content_column=content_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+        )
+        embedding_column = self._escape_postgres_identifier(embedding_column)
+        query_embedding = f"CAST(:embedding AS {storage_type.value})"
+        source = f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        where = f" WHERE {filter_sql}" if filter_sql else ""
+        select = (
+            f"SELECT {column_names}, "
+            f'{distance_strategy.search_function}("{embedding_column}", {query_embedding}) AS distance'
+        )
+        order_by = (
+            f'ORDER BY "{embedding_column}" {distance_strategy.operator} {query_embedding} LIMIT :k'
+        )
+        if exact and filter_sql:
+            return (
+                f"WITH candidates AS MATERIALIZED ("
+                f'SELECT {column_names}, "{embedding_column}" FROM {source}{where}) '
+                f"{select} FROM candidates {order_by}"
+            )
+        if quantized_vector_size is not None:
+            quantized_column = self._binary_quantize_expression(
+                f'"{embedding_column}"', quantized_vector_size
+            )
+            quantized_query = self._binary_quantize_expression(
+                query_embedding, quantized_vector_size
+            )
+            # Candidates are re-ranked by exact distance, whatever their order
+            return (
+                f'{select} FROM (SELECT {column_names}, "{embedding_column}" FROM {source}{where} '
+                f"ORDER BY {quantized_column} {DistanceStrategy.HAMMING.operator} {quantized_query} "
+                f"LIMIT :candidates) AS candidates {order_by}"
+            )
+        query = f"{select} FROM {source}{where} {order_by}"
+        if not filter_sql:
+            return query
+        # The inner product operator orders by negative inner product
+        direction = (
+            "DESC" if distance_strategy is DistanceStrategy.INNER_PRODUCT else "ASC"
+        )
+        return f"SELECT * FROM ({query}) AS results ORDER BY distance {direction}"
+
+    def _full_text_search_query(
+        self,
+        table_name: str,
+        *,
+        schema_name: str,
+        content_column: str,
+        metadata_columns: list[str],
+        metadata_json_column: Optional[str],
+        id_column: str,
+        hybrid_search_config: HybridSearchConfig,
+        filter_sql: Optional[str] = None,
+    ) -> str:
+        """Build the ts_rank_cd query, with :fts_query and :k bind parameters."""
+        column_names = self._result_column_names(
+            content_column=content_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+        )
+        tsv_lang = (hybrid_search_config.tsv_lang or "").replace("'", "''")
+        lang = f"'{tsv_lang}'," if tsv_lang else ""
+        query_tsv = f"plainto_tsquery({lang} :fts_query)"
+        if hybrid_search_config.tsv_column:
+            content_tsv = f'"{self._escape_postgres_identifier(hybrid_search_config.tsv_column)}"'
+        else:
+            content_tsv = f'to_tsvector({lang} "{self._escape_postgres_identifier(content_column)}")'
+        return (
+            f"SELECT {column_names}, ts_rank_cd({content_tsv}, {query_tsv}) AS distance "
+            f'FROM "{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}" '
+            f"WHERE {content_tsv} @@ {query_tsv}{f' AND {filter_sql}' if filter_sql else ''} "
+            f"ORDER BY distance DESC LIMIT :k"
+        )
+
+    def _search_settings_table(self, schema_name: str) -> str:
+        return (
+            f'"{self._escape_postgres_identifier(schema_name)}".'
+            f'"{SEARCH_SETTINGS_TABLE}"'
+        )
+
+    def _save_query_options_statements(
+        self,
+        table_name: str,
+        query_options: QueryOptions,
+        *,
+        schema_name: str,
+        k: Optional[int] = None,
+        recall: Optional[float] = None,
+    ) -> list[str]:
+        """Statements creating the settings table if needed and upserting the options.
+
+        Values are inlined so the statements can join the provisioning
+        statements of a table.
+        """
+        # Fails early on options that could not be loaded back
+        options = json.dumps(asdict(query_options))
+        query_options_from_dict(json.loads(options))
+        settings_table = self._search_settings_table(schema_name)
+        table_literal = table_name.replace("'", "''")
+        options_literal = options.replace("'", "''")
+        return [
+            f"CREATE TABLE IF NOT EXISTS {settings_table} ("
+            "table_name TEXT PRIMARY KEY, "
+            "query_options JSONB NOT NULL, "
+            "k INTEGER, "
+            "recall DOUBLE PRECISION, "
+            "updated_at TIMESTAMPTZ NOT NULL DEFAULT now())",
+            f"INSERT INTO {settings_table} (table_name, query_options, k, recall) "
+            f"VALUES ('{table_literal}', CAST('{options_literal}' AS JSONB), "
+            f"{'NULL' if k is None else int(k)}, "
+            f"{'NULL' if recall is None else repr(float(recall))}) "
+            "ON CONFLICT (table_name) DO UPDATE SET "
+            "query_options = EXCLUDED.query_options, k = EXCLUDED.k, "
+            "recall = EXCLUDED.recall, updated_at = now()",
+        ]
+
+    async def _aload_query_options(
+        self, table_name: str, *, schema_name: str
+    ) -> Optional[QueryOptions]:
+        """Query options saved for the table, cached for SEARCH_SETTINGS_TTL_SECONDS."""
+        key = (schema_name, table_name)
+        cached = self._saved_query_options.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SEARCH_SETTINGS_TTL_SECONDS:
+            return cached[1]
+
+        query_options = None
+        settings_table = self._search_settings_table(schema_name)
+        async with self._pool.connect() as conn:
+            exists = (
+                await conn.execute(
+                    text("SELECT to_regclass(:settings_table) IS NOT NULL"),
+                    {"settings_table": settings_table},
+                )
+            ).scalar()
+            if exists:
+                saved = (
+                    await conn.execute(
+                        text(
+                            f"SELECT query_options::text FROM {settings_table} "
+                            f"WHERE table_name = :table_name"
+                        ),
+                        {"table_name": table_name},
+                    )
+                ).scalar()
+                if saved is not None:
+                    query_options = query_options_from_dict(json.loads(saved))
+        self._saved_query_options[key] = (time.monotonic(), query_options)
+        return query_options
+
+    async def _asave_query_options(
+        self,
+        table_name: str,
+        query_options: Optional[QueryOptions],
+        *,
+        schema_name: str = "public",
+        k: Optional[int] = None,
+        recall: Optional[float] = None,
+    ) -> None:
+        """
+        Save the query options searches of a table use when given none.
+
+        Options are kept in the SEARCH_SETTINGS_TABLE table of the schema, which
+        is created on first use.
+
+        Args:
+            table_name (str): The database table name.
+            query_options (Optional[QueryOptions]): SearchProfile,
+                HNSWQueryOptions or IVFFlatQueryOptions to save, or None to
+                delete the saved options.
+            schema_name (str): The schema name.
+                Default: "public".
+            k (Optional[int]): Number of rows per query the options were tuned
+                for, kept for reference. Default: None.
+            recall (Optional[float]): recall@k measured with the options, kept
+                for reference. Default: None.
+        """
+        settings_table = self._search_settings_table(schema_name)
+        async with self._pool.begin() as conn:
+            if query_options is None:
+                if (
+                    await conn.execute(
+                        text("SELECT to_regclass(:settings_table) IS NOT NULL"),
+                        {"settings_table": settings_table},
+                    )
+                ).scalar():
+                    await conn.execute(
+                        text(f"DELETE FROM {settings_table} WHERE table_name = :table_name"),
+                        {"table_name": table_name},
+                    )
+            else:
+                for statement in self._save_query_options_statements(
+                    table_name, query_options, schema_name=schema_name, k=k, recall=recall
+                ):
+                    await conn.execute(text(statement))
+        self._saved_query_options[(schema_name, table_name)] = (
+            time.monotonic(),
+            query_options,
+        )
+
+    async def asave_query_options(
+        self,
+        table_name: str,
+        query_options: Optional[QueryOptions],
+        *,
+        schema_name: str = "public",
+        k: Optional[int] = None,
+        recall: Optional[float] = None,
+    ) -> None:
+        """
+        Save the query options searches of a table use when given none.
+
+        Other engines pick up the change within SEARCH_SETTINGS_TTL_SECONDS.
+        """
+        await self._run_as_async(
+            self._asave_query_options(
+                table_name, query_options, schema_name=schema_name, k=k, recall=recall
+            )
+        )
+
+    def save_query_options(
+        self,
+        table_name: str,
+        query_options: Optional[QueryOptions],
+        *,
+        schema_name: str = "public",
+        k: Optional[int] = None,
+        recall: Optional[float] = None,
+    ) -> None:
+        """
+        Save the query options searches of a table use when given none.
+
+        Other engines pick up the change within SEARCH_SETTINGS_TTL_SECONDS.
+        """
+        self._run_as_sync(
+            self._asave_query_options(
+                table_name, query_options, schema_name=schema_name, k=k, recall=recall
+            )
+        )
+
+    async def _asimilarity_search_batch(
+        self,
+        table_name: str,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        k: int = 4,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run a top-k similarity search for each query embedding.
+
+        All queries share one pooled connection. With the psycopg driver they
+        are sent in a single pipeline, so a batch costs one network round trip
+        instead of one per query.
+
+        Args:
+            table_name (str): The database table name.
+            embeddings: Query embeddings, one per search.
+            k (int): Number of rows to return per query. Default: 4.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns to return. Default: None.
+            metadata_json_column (Optional[str]): The column storing extra metadata
+                in JSON format, or None if the table has no such column.
+                Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+            distance_strategy (DistanceStrategy): Distance used to rank rows.
+                Must match the index operator class for the index to be used.
+                Default: DistanceStrategy.COSINE_DISTANCE.
+            query_options (Optional[QueryOptions]): Index query options, such as
+                HNSWQueryOptions or a SearchProfile, applied with SET LOCAL.
+                Default: None (the options saved for the table with
+                save_query_options or init_vectorstore_table, if any).
+            storage_type (VectorStorageType): Column type of the embeddings; query
+                embeddings are cast to it. Default: VectorStorageType.VECTOR.
+            oversampling (Optional[float]): Search the table's
+                BinaryQuantizedHNSWIndex for ceil(k * oversampling) candidates by
+                Hamming distance, then re-rank them by exact distance. Without
+                query_options, hnsw.ef_search is raised to at least the number
+                of candidates. Default: None (search the full vectors).
+            filter (Optional[dict[str, Any]]): Metadata filter every returned
+                row must match, see filters.compile_filter. Fields of
+                metadata_columns, id_column and content_column compare those
+                columns, other fields are paths into metadata_json_column.
+                Index scans run as iterative scans (relaxed_order) unless the
+                query options set iterative_scan, so selective filters still
+                return k rows; filters the planner estimates to match less
+                than EXACT_SEARCH_SELECTIVITY of the table run as an exact
+                search over the matching rows instead. Default: None.
+
+        Returns:
+            list[list[dict[str, Any]]]: For each query, the matching rows ordered
+            by distance, each with its columns and a "distance" key.
+        """
+        compiled_filter = (
+            compile_filter(
+                filter,
+                typed_columns=[*(metadata_columns or []), id_column, content_column],
+                metadata_json_column=metadata_json_column,
+            )
+            if filter
+            else None
+        )
+        if oversampling and oversampling < 1:
+            raise ValueError("oversampling must be at least 1")
+        saved_options = query_options is None
+        if saved_options:
+            query_options = await self._aload_query_options(
+                table_name, schema_name=schema_name
+            )
+
+        def batch(exact: bool) -> tuple[TextClause, list[dict[str, Any]], list[str]]:
+            # An exact search ranks every matching row by its full vector
+            batch_oversampling = None if exact else oversampling
+            batch_options = query_options
+            query_shape = dict(
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=tuple(metadata_columns or []),
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                distance_strategy=distance_strategy,
+                storage_type=storage_type,
+                quantized_vector_size=(
+                    len(embeddings[0]) if batch_oversampling and len(embeddings) else None
+                ),
+                filter_sql=compiled_filter.sql if compiled_filter else None,
+                exact=exact,
+            )
+            query = self._cached_text(
+                ("similarity_search", table_name, *sorted(query_shape.items())),
+                lambda: self._similarity_search_query(table_name, **query_shape),
+            )
+            params = [
+                {
+                    **(compiled_filter.params if compiled_filter else {}),
+                    "embedding": _query_embedding_param(
+                        embedding, storage_type, self._search_driver
+                    ),
+                    "k": k,
+                }
+                for embedding in embeddings
+            ]
+            if batch_oversampling:
+                candidates = math.ceil(k * batch_oversampling)
+                for param in params:
+                    param["candidates"] = candidates
+                profile = SearchProfile.from_query_options(batch_options)
+                if saved_options and candidates > (
+                    profile.ef_search or HNSWQueryOptions.ef_search
+                ):
+                    # The index scan returns at most hnsw.ef_search rows, which
+                    # would silently cap the candidate set.
+                    profile.ef_search = min(candidates, HNSW_MAX_EF_SEARCH)
+                    batch_options = profile
+            if compiled_filter is not None and not exact:
+                profile = SearchProfile.from_query_options(batch_options)
+                if profile.iterative_scan is None:
+                    # Without it, the index scan stops after ef_search or probes
+                    # worth of candidates, before the filter drops most of them.
+                    profile.iterative_scan = IterativeScan.RELAXED_ORDER
+                    batch_options = profile
+            settings = batch_options.to_parameter() if batch_options else []
+            return query, params, settings
+
+        async def planner(fetch_value: ValueFetcher) -> tuple[
+            TextClause, Sequence[dict[str, Any]], Sequence[str]
+        ]:
+            exact = False
+            if compiled_filter is not None:
+                selectivity = await self._aestimate_selectivity(
+                    fetch_value, table_name, compiled_filter, schema_name=schema_name
+                )
+                exact = selectivity is not None and selectivity < EXACT_SEARCH_SELECTIVITY
+            return batch(exact)
+
+        return await self._afetch_planned_batch(planner)
+
+    async def _aplan_rows(
+        self, fetch_value: ValueFetcher, query: str, params: dict[str, Any]
+    ) -> float:
+        """Rows the planner expects query to return, from EXPLAIN without running it."""
+        plan = await fetch_value(text(f"EXPLAIN (FORMAT JSON) {query}"), params)
+        # psycopg parses the json result, asyncpg returns its text
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]["Plan Rows"]
+
+    async def _aestimate_selectivity(
+        self,
+        fetch_value: ValueFetcher,
+        table_name: str,
+        compiled_filter: CompiledFilter,
+        *,
+        schema_name: str,
+    ) -> Optional[float]:
+        """Share of the table's rows the planner expects the filter to match.
+
+        Runs on the search's connection through fetch_value. The table's row
+        estimate is looked up once per table; each filter then takes one
+        EXPLAIN, which plans the filtered scan without running it, so indexes
+        on the filtered columns count. Both are kept in LRU caches for
+        SEARCH_SETTINGS_TTL_SECONDS.
+
+        Returns:
+            Optional[float]: The estimate, or None for an empty table.
+        """
+        source = f'"{self._escape_postgres_identifier(schema_name)}"."{self._escape_postgres_identifier(table_name)}"'
+        now = time.monotonic()
+        table_key = (schema_name, table_name)
+        table = _lru_get(self._table_rows, table_key)
+        if table is None or now - table[0] >= SEARCH_SETTINGS_TTL_SECONDS:
+            total_rows = await self._aplan_rows(
+                fetch_value, f"SELECT 1 FROM {source}", {}
+            )
+            table = (now, total_rows)
+            _lru_put(self._table_rows, table_key, table)
+        total_rows = table[1]
+        # The planner assumes at least one row, even for an empty table
+        if total_rows <= 1:
+            return None
+
+        key = (
+            schema_name,
+            table_name,
+            compiled_filter.sql,
+            json.dumps(compiled_filter.params, sort_keys=True, default=str),
+        )
+        cached = _lru_get(self._filter_selectivity, key)
+        if cached is not None and now - cached[0] < SEARCH_SETTINGS_TTL_SECONDS:
+            return cached[1]
+
+        matching_rows = await self._aplan_rows(
+            fetch_value,
+            f"SELECT 1 FROM {source} WHERE {compiled_filter.sql}",
+            compiled_filter.params,
+        )
+        selectivity = matching_rows / total_rows
+        _lru_put(self._filter_selectivity, key, (now, selectivity))
+        return selectivity
+
+    async def asimilarity_search_batch(
+        self,
+        table_name: str,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        k: int = 4,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run a top-k similarity search for each query embedding over one connection.
+
+        The column arguments must match the layout the table was created with
+        by init_vectorstore_table.
+
+        Returns:
+            list[list[dict[str, Any]]]: For each query, the matching rows ordered
+            by distance, each with its columns and a "distance" key.
+        """
+        return await self._run_as_async(
+            self._asimilarity_search_batch(
+                table_name,
+                embeddings,
+                k,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                distance_strategy=distance_strategy,
+                query_options=query_options,
+                storage_type=storage_type,
+                oversampling=oversampling,
+                filter=filter,
+            )
+        )
+
+    def similarity_search_batch(
+        self,
+        table_name: str,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        k: int = 4,
+        *,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run a top-k similarity search for each query embedding over one connection.
+
+        The column arguments must match the layout the table was created with
+        by init_vectorstore_table.
+
+        Returns:
+            list[list[dict[str, Any]]]: For each query, the matching rows ordered
+            by distance, each with its columns and a "distance" key.
+        """
+        return self._run_as_sync(
+            self._asimilarity_search_batch(
+                table_name,
+                embeddings,
+                k,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                distance_strategy=distance_strategy,
+                query_options=query_options,
+                storage_type=storage_type,
+                oversampling=oversampling,
+                filter=filter,
+            )
+        )
+
+    async def _ahybrid_search(
+        self,
+        table_name: str,
+        embedding: Sequence[float],
+        k: int = 4,
+        *,
+        hybrid_search_config: HybridSearchConfig,
+        fts_query: Optional[str] = None,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a hybrid vector and full-text search and fuse the results.
+
+        The ANN query (primary_top_k rows) and the ts_rank_cd full-text query
+        (secondary_top_k rows) run concurrently on two pooled connections, and
+        their results are combined with hybrid_search_config.fusion_function.
+        The vector distances are turned into similarities first (see
+        DistanceStrategy.similarity), as fusion ranks higher scores first.
+
+        Args:
+            table_name (str): The database table name.
+            embedding (Sequence[float]): The query embedding.
+            k (int): Number of fused rows to return. Default: 4.
+            hybrid_search_config (HybridSearchConfig): Hybrid search configuration.
+            fts_query (Optional[str]): Full-text query. Defaults to
+                hybrid_search_config.fts_query. Without either, only the vector
+                search runs.
+            schema_name (str): The schema name.
+                Default: "public".
+            content_column (str): Name of the column storing document content.
+                Default: "content".
+            embedding_column (str) : Name of the column storing vector embeddings.
+                Default: "embedding".
+            metadata_columns (Optional[list[str]]): Names of the custom metadata
+                columns to return. Default: None.
+            metadata_json_column (Optional[str]): The column storing extra metadata
+                in JSON format, or None if the table has no such column.
+                Default: "langchain_metadata".
+            id_column (str): Name of the id column.
+                Default: "langchain_id".
+            distance_strategy (DistanceStrategy): Distance used by the vector search.
+                Default: DistanceStrategy.COSINE_DISTANCE.
+            query_options (Optional[QueryOptions]): Index query options for the
+                vector search; the work_mem of a SearchProfile also applies to
+                the full-text search. Default: None (the options saved for the
+                table, if any).
+            storage_type (VectorStorageType): Column type of the embeddings.
+                Default: VectorStorageType.VECTOR.
+            oversampling (Optional[float]): Run the vector search as a binary
+                quantized search with re-ranking, see similarity_search_batch.
+                Default: None.
+            filter (Optional[dict[str, Any]]): Metadata filter applied to both
+                searches, see similarity_search_batch. Default: None.
+
+        Returns:
+            list[dict[str, Any]]: The fused rows, each with its columns and a
+            "distance" key holding the fused score.
+        """
+        metadata_columns = metadata_columns or []
+        fts_query = fts_query or hybrid_search_config.fts_query
+
+        dense_search = self._asimilarity_search_batch(
+            table_name,
+            [embedding],
+            hybrid_search_config.primary_top_k,
+            schema_name=schema_name,
+            content_column=content_column,
+            embedding_column=embedding_column,
+            metadata_columns=metadata_columns,
+            metadata_json_column=metadata_json_column,
+            id_column=id_column,
+            distance_strategy=distance_strategy,
+            query_options=query_options,
+            storage_type=storage_type,
+            oversampling=oversampling,
+            filter=filter,
+        )
+        if not fts_query:
+            return (await dense_search)[0][:k]
+
+        async def sparse_search() -> list[Any]:
+            compiled_filter = (
+                compile_filter(
+                    filter,
+                    typed_columns=[*metadata_columns, id_column, content_column],
+                    metadata_json_column=metadata_json_column,
+                )
+                if filter
+                else CompiledFilter(sql="")
+            )
+            query = self._cached_text(
+                (
+                    "full_text_search",
+                    table_name,
+                    schema_name,
+                    content_column,
+                    tuple(metadata_columns),
+                    metadata_json_column,
+                    id_column,
+                    hybrid_search_config.tsv_column,
+                    hybrid_search_config.tsv_lang,
+                    compiled_filter.sql,
+                ),
+                lambda: self._full_text_search_query(
+                    table_name,
+                    schema_name=schema_name,
+                    content_column=content_column,
+                    metadata_columns=metadata_columns,
+                    metadata_json_column=metadata_json_column,
+                    id_column=id_column,
+                    hybrid_search_config=hybrid_search_config,
+                    filter_sql=compiled_filter.sql,
+                ),
+            )
+            # Of the vector search settings, only work_mem affects this query
+            work_mem = SearchProfile.from_query_options(
+                query_options
+                or await self._aload_query_options(table_name, schema_name=schema_name)
+            ).work_mem
+            results = await self._afetch_batch(
+                query,
+                [
+                    {
+                        **compiled_filter.params,
+                        "fts_query": fts_query,
+                        "k": hybrid_search_config.secondary_top_k,
+                    }
+                ],
+                SearchProfile(work_mem=work_mem).to_parameter(),
+            )
+            return results[0]
+
+        dense_results, sparse_results = await asyncio.gather(
+            dense_search, sparse_search()
+        )
+        # The fusion functions rank higher scores first, like ts_rank_cd
+        dense_scores = [
+            {**row, "distance": distance_strategy.similarity(row["distance"])}
+            for row in dense_results[0]
+        ]
+        return list(
+            hybrid_search_config.fusion_function(
+                dense_scores,
+                sparse_results,
+                **{"fetch_top_k": k, **hybrid_search_config.fusion_function_parameters},
+            )
+        )
+
+    async def ahybrid_search(
+        self,
+        table_name: str,
+        embedding: Sequence[float],
+        k: int = 4,
+        *,
+        hybrid_search_config: HybridSearchConfig,
+        fts_query: Optional[str] = None,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a hybrid vector and full-text search and fuse the results.
+
+        Both searches run concurrently on separate pooled connections.
+
+        Returns:
+            list[dict[str, Any]]: The fused rows, each with its columns and a
+            "distance" key holding the fused score.
+        """
+        return await self._run_as_async(
+            self._ahybrid_search(
+                table_name,
+                embedding,
+                k,
+                hybrid_search_config=hybrid_search_config,
+                fts_query=fts_query,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                distance_strategy=distance_strategy,
+                query_options=query_options,
+                storage_type=storage_type,
+                oversampling=oversampling,
+                filter=filter,
+            )
+        )
+
+    def hybrid_search(
+        self,
+        table_name: str,
+        embedding: Sequence[float],
+        k: int = 4,
+        *,
+        hybrid_search_config: HybridSearchConfig,
+        fts_query: Optional[str] = None,
+        schema_name: str = "public",
+        content_column: str = "content",
+        embedding_column: str = "embedding",
+        metadata_columns: Optional[list[str]] = None,
+        metadata_json_column: Optional[str] = "langchain_metadata",
+        id_column: str = "langchain_id",
+        distance_strategy: DistanceStrategy = DEFAULT_DISTANCE_STRATEGY,
+        query_options: Optional[QueryOptions] = None,
+        storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE,
+        oversampling: Optional[float] = None,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a hybrid vector and full-text search and fuse the results.
+
+        Both searches run concurrently on separate pooled connections.
+
+        Returns:
+            list[dict[str, Any]]: The fused rows, each with its columns and a
+            "distance" key holding the fused score.
+        """
+        return self._run_as_sync(
+            self._ahybrid_search(
+                table_name,
+                embedding,
+                k,
+                hybrid_search_config=hybrid_search_config,
+                fts_query=fts_query,
+                schema_name=schema_name,
+                content_column=content_column,
+                embedding_column=embedding_column,
+                metadata_columns=metadata_columns,
+                metadata_json_column=metadata_json_column,
+                id_column=id_column,
+                distance_strategy=distance_strategy,
+                query_options=query_options,
+                storage_type=storage_type,
+                oversampling=oversampling,
+                filter=filter,
+            )
         )
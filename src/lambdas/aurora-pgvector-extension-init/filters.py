@@ -0,0 +1,194 @@
+"""Metadata filters of vector store searches, compiled to SQL.
+
+A filter is a dict in the format of LangChain vector store filters:
+
+    {"source": "wiki", "year": {"$gte": 2020}, "$or": [{"lang": "en"}, {"lang": "de"}]}
+
+Each key is a field name or one of "$and", "$or" and "$not". A field's value
+is either the value it must equal, or an object of operators that must all
+hold. Fields naming a typed metadata column compare that column, so its
+B-tree index can be used. Other fields are paths into the JSON metadata
+column, with "." separating nested keys; equality on them is a containment
+test (@>) on the column cast to jsonb, which a GIN jsonb_path_ops index on
+that expression can answer.
+
+Values are always bound as query parameters; field names must be valid
+identifiers.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from .indexes import validate_identifier
+
+COMPARISON_OPERATORS = {
+    "$eq": "=",
+    "$ne": "<>",
+    "$lt": "<",
+    "$lte": "<=",
+    "$gt": ">",
+    "$gte": ">=",
+}
+FIELD_OPERATORS = (
+    *COMPARISON_OPERATORS,
+    "$in",
+    "$nin",
+    "$between",
+    "$like",
+    "$ilike",
+    "$exists",
+)
+LOGICAL_OPERATORS = ("$and", "$or", "$not")
+
+
+@dataclass(frozen=True)
+class CompiledFilter:
+    """A filter compiled to a boolean SQL expression.
+
+    Attributes:
+        sql (str): The expression, with :filter_<n> bind parameters.
+        params (dict[str, Any]): Values of the bind parameters.
+    """
+
+    sql: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+class _FilterCompiler:
+    def __init__(
+        self, typed_columns: Sequence[str], metadata_json_column: Optional[str]
+    ) -> None:
+        self._typed_columns = set(typed_columns)
+        self._metadata_json_column = metadata_json_column
+        self.params: dict[str, Any] = {}
+
+    def bind(self, value: Any) -> str:
+        name = f"filter_{len(self.params)}"
+        self.params[name] = value
+        return f":{name}"
+
+    def compile(self, filter: dict[str, Any]) -> str:
+        if not isinstance(filter, dict) or not filter:
+            raise ValueError(f"A filter must be a non-empty object, got {filter!r}")
+        clauses = []
+        for key, value in filter.items():
+            if key in ("$and", "$or"):
+                if not isinstance(value, list) or not value:
+                    raise ValueError(f"{key} takes a non-empty list of filters")
+                joined = f" {key[1:].upper()} ".join(
+                    self.compile(condition) for condition in value
+                )
+                clauses.append(f"({joined})")
+            elif key == "$not":
+                clauses.append(f"NOT ({self.compile(value)})")
+            elif key.startswith("$"):
+                raise ValueError(
+                    f"Unknown operator {key}; use one of {LOGICAL_OPERATORS} at the top level"
+                )
+            elif isinstance(value, dict):
+                if not value:
+                    raise ValueError(f"No operators given for field '{key}'")
+                clauses.extend(
+                    self.field_condition(key, operator, operand)
+                    for operator, operand in value.items()
+                )
+            else:
+                clauses.append(self.field_condition(key, "$eq", value))
+        return clauses[0] if len(clauses) == 1 else "(" + " AND ".join(clauses) + ")"
+
+    def field_condition(self, name: str, operator: str, operand: Any) -> str:
+        if operator not in FIELD_OPERATORS:
+            raise ValueError(
+                f"Unknown operator {operator} for field '{name}'; use one of {FIELD_OPERATORS}"
+            )
+        path = name.split(".")
+        for key in path:
+            validate_identifier(key)
+        if name in self._typed_columns:
+            return self.column_condition(f'"{name}"', operator, operand)
+        if self._metadata_json_column is None:
+            raise ValueError(
+                f"Field '{name}' is not a metadata column and the table has no JSON metadata column"
+            )
+        return self.json_condition(path, operator, operand)
+
+    def column_condition(self, column: str, operator: str, operand: Any) -> str:
+        if operator in COMPARISON_OPERATORS:
+            return f"{column} {COMPARISON_OPERATORS[operator]} {self.bind(operand)}"
+        if operator in ("$in", "$nin"):
+            values = self.list_operand(operator, operand)
+            if operator == "$in":
+                return f"{column} = ANY({self.bind(values)})"
+            return f"{column} <> ALL({self.bind(values)})"
+        if operator == "$between":
+            low, high = self.between_operand(operand)
+            return f"{column} BETWEEN {self.bind(low)} AND {self.bind(high)}"
+        if operator in ("$like", "$ilike"):
+            return f"{column} {operator[1:].upper()} {self.bind(str(operand))}"
+        return f"{column} IS {'NOT ' if operand else ''}NULL"
+
+    def json_condition(self, path: list[str], operator: str, operand: Any) -> str:
+        column = '"' + self._metadata_json_column.replace('"', '""') + '"'
+        if operator == "$exists":
+            return f"({column} #> '{{{','.join(path)}}}') IS {'NOT ' if operand else ''}NULL"
+        if operator == "$eq":
+            document: Any = operand
+            for key in reversed(path):
+                document = {key: document}
+            # The column is JSON, which has no containment operator
+            return f"CAST({column} AS JSONB) @> CAST({self.bind(json.dumps(document))} AS JSONB)"
+        sample = operand
+        if operator in ("$in", "$nin"):
+            sample = self.list_operand(operator, operand)[0]
+        elif operator == "$between":
+            sample = self.between_operand(operand)[0]
+        # Text of the value at path, cast to the type of the operand
+        value = f"({column} #>> '{{{','.join(path)}}}')"
+        if isinstance(sample, bool):
+            value = f"CAST({value} AS BOOLEAN)"
+        elif isinstance(sample, (int, float)):
+            value = f"CAST({value} AS DOUBLE PRECISION)"
+        return self.column_condition(value, operator, operand)
+
+    @staticmethod
+    def list_operand(operator: str, operand: Any) -> list[Any]:
+        if not isinstance(operand, (list, tuple)) or not operand:
+            raise ValueError(f"{operator} takes a non-empty list of values")
+        return list(operand)
+
+    @staticmethod
+    def between_operand(operand: Any) -> tuple[Any, Any]:
+        if not isinstance(operand, (list, tuple)) or len(operand) != 2:
+            raise ValueError("$between takes a list of a low and a high value")
+        return operand[0], operand[1]
+
+
+def compile_filter(
+    filter: dict[str, Any],
+    *,
+    typed_columns: Sequence[str] = (),
+    metadata_json_column: Optional[str] = "langchain_metadata",
+) -> CompiledFilter:
+    """Compile a metadata filter to a SQL expression over a vector store table.
+
+    Args:
+        filter (dict[str, Any]): The filter.
+        typed_columns (Sequence[str]): Columns of the table that fields are
+            compared with directly, e.g. the metadata columns. Default: ().
+        metadata_json_column (Optional[str]): The JSON metadata column other
+            fields are looked up in, or None if the table has none.
+            Default: "langchain_metadata".
+
+    Returns:
+        CompiledFilter: The SQL expression and its bind parameters. The SQL
+        depends on the structure of the filter and the types of its values
+        only, so it can be cached as a statement.
+
+    Raises:
+        ValueError: If the filter is malformed, uses an unknown operator or
+            names a field that is neither a typed column nor allowed in JSON.
+    """
+    compiler = _FilterCompiler(typed_columns, metadata_json_column)
+    sql = compiler.compile(filter)
+    return CompiledFilter(sql=sql, params=compiler.params)
@@ -1,8 +1,96 @@
+from __future__ import annotations
+
 from abc import ABC
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+    from sqlalchemy import RowMapping
+
+DEFAULT_TSV_LANG = "pg_catalog.english"
+
+
+def _ids_and_distances(
+    search_results: Sequence[RowMapping],
+) -> tuple[list[str], np.ndarray]:
+    """Pull doc ids (first column) and distances (last column) out of result rows."""
+    import numpy as np
+
+    if not search_results:
+        return [], np.empty(0, dtype=np.float64)
+    keys = list(search_results[0].keys())
+    id_key, distance_key = keys[0], keys[-1]
+    ids = [str(row[id_key]) for row in search_results]
+    distances = np.fromiter(
+        (row[distance_key] for row in search_results),
+        dtype=np.float64,
+        count=len(search_results),
+    )
+    return ids, distances
+
+
+def _merge_positions(
+    primary_ids: list[str], secondary_ids: list[str]
+) -> tuple[int, np.ndarray, np.ndarray]:
+    """Map the ids of both result sets onto one index space, in first-seen order.
+
+    Returns:
+        The number of distinct ids and, for each input row, its merged position.
+    """
+    import numpy as np
+
+    positions: dict[str, int] = {}
+    primary_positions = np.fromiter(
+        (positions.setdefault(doc_id, len(positions)) for doc_id in primary_ids),
+        dtype=np.intp,
+        count=len(primary_ids),
+    )
+    secondary_positions = np.fromiter(
+        (positions.setdefault(doc_id, len(positions)) for doc_id in secondary_ids),
+        dtype=np.intp,
+        count=len(secondary_ids),
+    )
+    return len(positions), primary_positions, secondary_positions
+
+
+def _last_rows(positions: np.ndarray, size: int) -> np.ndarray:
+    """For each merged position, the index of the last row mapped onto it, or -1."""
+    import numpy as np
+
+    last_rows = np.full(size, -1, dtype=np.intp)
+    np.maximum.at(last_rows, positions, np.arange(positions.size))
+    return last_rows
+
+
+def _fused_rows(
+    primary_search_results: Sequence[RowMapping],
+    secondary_search_results: Sequence[RowMapping],
+    primary_positions: np.ndarray,
+    secondary_positions: np.ndarray,
+    scores: np.ndarray,
+    fetch_top_k: int,
+) -> list[dict[str, Any]]:
+    """Build result dicts for the top scoring ids only.
+
+    Ids are ranked by score with a stable sort, so ties keep the order the ids
+    were first seen in. Each id is returned with the last row found for it,
+    its secondary result row if it has one.
+    """
+    import numpy as np
+
+    primary_rows = _last_rows(primary_positions, scores.size)
+    secondary_rows = _last_rows(secondary_positions, scores.size)
 
-from sqlalchemy import RowMapping
+    ranked_results = []
+    for position in np.argsort(-scores, kind="stable")[: max(fetch_top_k, 0)]:
+        if secondary_rows[position] >= 0:
+            row_values = dict(secondary_search_results[secondary_rows[position]])
+        else:
+            row_values = dict(primary_search_results[primary_rows[position]])
+        row_values["distance"] = float(scores[position])
+        ranked_results.append(row_values)
+    return ranked_results
 
 
 def weighted_sum_ranking(
@@ -31,37 +119,52 @@ def weighted_sum_ranking(
         A list of (document, distance) tuples, sorted by weighted_score in
         descending order.
     """
+    import numpy as np
+
+    primary_ids, primary_distances = _ids_and_distances(primary_search_results)
+    secondary_ids, secondary_distances = _ids_and_distances(secondary_search_results)
+    size, primary_positions, secondary_positions = _merge_positions(
+        primary_ids, secondary_ids
+    )
+
+    # stores computed metric with provided distance metric and weights; a
+    # primary id found twice keeps the score of its last row
+    weighted_scores = np.zeros(size, dtype=np.float64)
+    primary_rows = _last_rows(primary_positions, size)
+    found = primary_rows >= 0
+    weighted_scores[found] = primary_results_weight * primary_distances[primary_rows[found]]
+    np.add.at(
+        weighted_scores,
+        secondary_positions,
+        secondary_results_weight * secondary_distances,
+    )
+
+    return _fused_rows(
+        primary_search_results,
+        secondary_search_results,
+        primary_positions,
+        secondary_positions,
+        weighted_scores,
+        fetch_top_k,
+    )
+
 
-    # stores computed metric with provided distance metric and weights
-    weighted_scores: dict[str, dict[str, Any]] = {}
-
-    # Process results from primary source
-    for row in primary_search_results:
-        values = list(row.values())
-        doc_id = str(values[0])  # first value is doc_id
-        distance = float(values[-1])  # type: ignore # last value is distance
-        row_values = dict(row)
-        row_values["distance"] = primary_results_weight * distance
-        weighted_scores[doc_id] = row_values
-
-    # Process results from secondary source,
-    # adding to existing scores or creating new ones
-    for row in secondary_search_results:
-        values = list(row.values())
-        doc_id = str(values[0])  # first value is doc_id
-        distance = float(values[-1])  # type: ignore # last value is distance
-        primary_score = (
-            weighted_scores[doc_id]["distance"] if doc_id in weighted_scores else 0.0
-        )
-        row_values = dict(row)
-        row_values["distance"] = distance * secondary_results_weight + primary_score
-        weighted_scores[doc_id] = row_values
-
-    # Sort the results by weighted score in descending order
-    ranked_results = sorted(
-        weighted_scores.values(), key=lambda item: item["distance"], reverse=True
+def _by_descending_distance(
+    search_results: Sequence[RowMapping],
+) -> tuple[Sequence[RowMapping], list[str], np.ndarray]:
+    """Result rows ordered by distance, highest first (stable), with their ids and distances."""
+    import numpy as np
+
+    ids, distances = _ids_and_distances(search_results)
+    if np.all(distances[:-1] >= distances[1:]):
+        # Already ordered, as results straight from an ORDER BY ... DESC query are.
+        return search_results, ids, distances
+    order = np.argsort(-distances, kind="stable")
+    return (
+        [search_results[i] for i in order],
+        [ids[i] for i in order],
+        distances[order],
     )
-    return ranked_results[:fetch_top_k]
 
 
 def reciprocal_rank_fusion(
@@ -87,43 +190,39 @@ def reciprocal_rank_fusion(
         A list of (document_id, rrf_score) tuples, sorted by rrf_score
         in descending order.
     """
-    rrf_scores: dict[str, dict[str, Any]] = {}
-
-    # Process results from primary source
-    for rank, row in enumerate(
-        sorted(primary_search_results, key=lambda item: item["distance"], reverse=True)
-    ):
-        values = list(row.values())
-        doc_id = str(values[0])
-        row_values = dict(row)
-        primary_score = rrf_scores[doc_id]["distance"] if doc_id in rrf_scores else 0.0
-        primary_score += 1.0 / (rank + rrf_k)
-        row_values["distance"] = primary_score
-        rrf_scores[doc_id] = row_values
-
-    # Process results from secondary source
-    for rank, row in enumerate(
-        sorted(
-            secondary_search_results, key=lambda item: item["distance"], reverse=True
-        )
-    ):
-        values = list(row.values())
-        doc_id = str(values[0])
-        row_values = dict(row)
-        secondary_score = (
-            rrf_scores[doc_id]["distance"] if doc_id in rrf_scores else 0.0
-        )
-        secondary_score += 1.0 / (rank + rrf_k)
-        row_values["distance"] = secondary_score
-        rrf_scores[doc_id] = row_values
-
-    # Sort the results by rrf score in descending order
-    # Sort the results by weighted score in descending order
-    ranked_results = sorted(
-        rrf_scores.values(), key=lambda item: item["distance"], reverse=True
+    import numpy as np
+
+    # Rows are ranked, and ids first seen, in order of descending distance
+    primary_search_results, primary_ids, _ = _by_descending_distance(
+        primary_search_results
+    )
+    secondary_search_results, secondary_ids, _ = _by_descending_distance(
+        secondary_search_results
+    )
+    size, primary_positions, secondary_positions = _merge_positions(
+        primary_ids, secondary_ids
+    )
+
+    rrf_scores = np.zeros(size, dtype=np.float64)
+    np.add.at(
+        rrf_scores,
+        primary_positions,
+        1.0 / (np.arange(primary_positions.size) + rrf_k),
+    )
+    np.add.at(
+        rrf_scores,
+        secondary_positions,
+        1.0 / (np.arange(secondary_positions.size) + rrf_k),
+    )
+
+    return _fused_rows(
+        primary_search_results,
+        secondary_search_results,
+        primary_positions,
+        secondary_positions,
+        rrf_scores,
+        fetch_top_k,
     )
-    # Extract only the RowMapping for the top results
-    return ranked_results[:fetch_top_k]
 
 
 @dataclass
@@ -131,13 +230,14 @@ class HybridSearchConfig(ABC):
     """
     AlloyDB Vector Store Hybrid Search Config.
 
-    Queries might be slow if the hybrid search column does not exist.
-    For best hybrid search performance, consider creating a TSV column
-    and adding GIN index.
+    Tables created by PGEngine.init_vectorstore_table with this config get a
+    generated TSV column and the index_name/index_type index on it. For
+    existing tables without a TSV column, queries compute to_tsvector on the
+    fly and might be slow; add the index with PGEngine.apply_hybrid_search_index.
     """
 
     tsv_column: Optional[str] = ""
-    tsv_lang: Optional[str] = "pg_catalog.english"
+    tsv_lang: Optional[str] = DEFAULT_TSV_LANG
     fts_query: Optional[str] = ""
     fusion_function: Callable[
         [Sequence[RowMapping], Sequence[RowMapping], Any], Sequence[Any]
@@ -1,10 +1,29 @@
+import json
 import os
 import re
 from aws_lambda_powertools import Logger
-from aws_lambda_powertools.utilities.parser import parse_event_headers
-from aws_lambda_powertools.utilities.validation import validate_event_headers
+from aws_lambda_powertools.utilities.validation import validate, validate_event_headers
 from aws_lambda_powertools.utilities.validation.exceptions import SchemaValidationError
-from .engine import PGEngine
+from .engine import METADATA_INDEX_TYPES, Column, PGEngine, VectorStoreTable
+from .hybrid_search_config import HybridSearchConfig
+from .indexes import (
+    DISTANCE_STRATEGY_ALIASES,
+    HNSW_MAX_EF_SEARCH,
+    STORAGE_TYPE_ALIASES,
+    BaseIndex,
+    BinaryQuantizedHNSWIndex,
+    HNSWIndex,
+    IterativeScan,
+    IVFFlatIndex,
+    SearchProfile,
+)
+from .partitions import (
+    BasePartitioning,
+    HashPartitioning,
+    ListPartitioning,
+    RangePartition,
+    RangePartitioning,
+)
 
 LOGGER = Logger()
 
@@ -14,6 +33,12 @@ class PartialDatabaseCredentialsError(Exception):
 class TableNameValidationError(Exception):
     """Raised when table name validation fails"""
 
+class VectorIndexValidationError(Exception):
+    """Raised when the vector index settings in the request body are invalid"""
+
+class PartitioningValidationError(Exception):
+    """Raised when the partitioning settings in the request body are invalid"""
+
 # Schema for validating table name from headers
 TABLE_NAME_HEADER_SCHEMA = {
     "type": "object",
@@ -34,6 +59,152 @@ TABLE_NAME_HEADER_SCHEMA = {
     "required": ["headers"]
 }
 
+# Settings a table can be created with, shared by single and batch requests
+TABLE_OPTIONS_PROPERTIES = {
+    "index": {
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": ["hnsw", "ivfflat"]},
+            "distance": {"type": "string", "enum": list(DISTANCE_STRATEGY_ALIASES)},
+            "name": {
+                "type": "string",
+                "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$",
+                "minLength": 1,
+                "maxLength": 63
+            },
+            "m": {"type": "integer", "minimum": 2, "maximum": 100},
+            "ef_construction": {"type": "integer", "minimum": 4, "maximum": 1000},
+            "lists": {"type": "integer", "minimum": 1, "maximum": 32768},
+            "binary_quantize": {"type": "boolean"},
+            "concurrently": {"type": "boolean"},
+            "maintenance_work_mem": {"type": "string"},
+            "max_parallel_maintenance_workers": {"type": "integer", "minimum": 0}
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    },
+    "hybrid_search": {
+        "type": "object",
+        "properties": {
+            "tsv_column": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$", "maxLength": 63},
+            "tsv_lang": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_.]*$"},
+            "index_name": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$", "maxLength": 63},
+            "index_type": {"type": "string", "enum": ["GIN", "GIST"]}
+        },
+        "additionalProperties": False
+    },
+    "search_profile": {
+        "type": "object",
+        "properties": {
+            "ef_search": {"type": "integer", "minimum": 1, "maximum": HNSW_MAX_EF_SEARCH},
+            "probes": {"type": "integer", "minimum": 1},
+            "iterative_scan": {"type": "string", "enum": [mode.value for mode in IterativeScan]},
+            "work_mem": {"type": "string", "pattern": "^\\d+\\s*(kB|MB|GB|TB)?$"}
+        },
+        "additionalProperties": False
+    },
+    "defer_index_build": {"type": "boolean"},
+    "metadata_json_index": {"type": "boolean"},
+    "storage_type": {"type": "string", "enum": list(STORAGE_TYPE_ALIASES)},
+    "metadata_columns": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$",
+                    "maxLength": 63
+                },
+                "data_type": {
+                    "type": "string",
+                    "pattern": "^[a-zA-Z][a-zA-Z0-9_ ]*(\\(\\d+(,\\s*\\d+)?\\))?(\\[\\])?$"
+                },
+                "nullable": {"type": "boolean"},
+                "index": {"type": "string", "enum": list(METADATA_INDEX_TYPES)}
+            },
+            "required": ["name", "data_type"],
+            "additionalProperties": False
+        }
+    },
+    "partitioning": {
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": ["hash", "list", "range"]},
+            "column": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$", "maxLength": 63},
+            "partitions": {"type": "integer", "minimum": 1, "maximum": 1024},
+            "values": {
+                "type": "object",
+                "patternProperties": {
+                    "^[a-zA-Z_][a-zA-Z0-9_]*$": {
+                        "type": "array",
+                        "items": {"type": ["string", "number"]},
+                        "minItems": 1
+                    }
+                },
+                "additionalProperties": False
+            },
+            "ranges": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$"},
+                        "from": {"type": ["string", "number"]},
+                        "to": {"type": ["string", "number"]}
+                    },
+                    "required": ["name"],
+                    "additionalProperties": False
+                },
+                "minItems": 1
+            },
+            "default_partition": {"type": "boolean"}
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+}
+
+# Schema for validating the optional table settings in the request body
+TABLE_OPTIONS_BODY_SCHEMA = {
+    "type": "object",
+    "properties": TABLE_OPTIONS_PROPERTIES
+}
+
+# Upper bound on tables per batch request, to keep a single invocation within its timeout
+MAX_TABLES_PER_REQUEST = 500
+
+# Schema for validating a batch provisioning request body
+TABLE_BATCH_BODY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tables": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "table_name": {
+                        "type": "string",
+                        "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$",
+                        "minLength": 1,
+                        "maxLength": 63
+                    },
+                    "vector_size": {"type": "integer", "minimum": 1, "maximum": 16000},
+                    "overwrite_existing": {"type": "boolean"},
+                    **TABLE_OPTIONS_PROPERTIES
+                },
+                "required": ["table_name"],
+                "additionalProperties": False
+            },
+            "minItems": 1,
+            "maxItems": MAX_TABLES_PER_REQUEST
+        },
+        "chunk_size": {"type": "integer", "minimum": 1, "maximum": MAX_TABLES_PER_REQUEST}
+    },
+    "required": ["tables"],
+    "additionalProperties": False
+}
+
 def _validate_table_name(table_name: str) -> bool:
     """Validate table name format and constraints.
 
@@ -86,6 +257,9 @@ def _extract_table_name_from_headers(event: dict) -> str:
         SchemaValidationError: If headers don't match expected schema
         TableNameValidationError: If table name validation fails
     """
+    # The parser utility pulls in pydantic; only header requests need it
+    from aws_lambda_powertools.utilities.parser import parse_event_headers
+
     try:
         # Validate event structure and extract headers
         validate_event_headers(event, TABLE_NAME_HEADER_SCHEMA)
@@ -114,6 +288,233 @@ def _extract_table_name_from_headers(event: dict) -> str:
         LOGGER.error(f"Error extracting table name from headers: {e}")
         raise TableNameValidationError(f"Failed to extract table name from headers: {e}")
 
+def _parse_event_body(event: dict) -> dict:
+    """Parse the JSON request body of an API Gateway event.
+
+    Args:
+        event: Lambda event, optionally containing a JSON string body
+
+    Returns:
+        dict: Parsed body, or an empty dict when no body was sent
+
+    Raises:
+        SchemaValidationError: If the body is not a JSON object
+    """
+    body = event.get("body") or "{}"
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise SchemaValidationError(f"Request body is not valid JSON: {e}")
+    if not isinstance(body, dict):
+        raise SchemaValidationError("Request body must be a JSON object")
+    return body
+
+def _vector_index_from_settings(settings: dict) -> BaseIndex:
+    """Build a vector index spec from validated request settings.
+
+    Args:
+        settings: The "index" object of the request body
+
+    Returns:
+        BaseIndex: HNSWIndex, BinaryQuantizedHNSWIndex or IVFFlatIndex
+
+    Raises:
+        VectorIndexValidationError: If the settings are not valid for the index type
+    """
+    settings = dict(settings)
+    index_type = settings.pop("type")
+    binary_quantize = settings.pop("binary_quantize", False)
+    distance = settings.pop("distance", "hamming" if binary_quantize else "cosine")
+    options = {"distance_strategy": DISTANCE_STRATEGY_ALIASES[distance], **settings}
+
+    allowed = {"hnsw": {"m", "ef_construction"}, "ivfflat": {"lists"}}[index_type]
+    unsupported = {"m", "ef_construction", "lists"}.intersection(settings) - allowed
+    if binary_quantize and index_type != "hnsw":
+        unsupported.add("binary_quantize")
+    if unsupported:
+        raise VectorIndexValidationError(
+            f"Settings {sorted(unsupported)} are not supported for '{index_type}' indexes."
+        )
+
+    try:
+        if binary_quantize:
+            return BinaryQuantizedHNSWIndex(**options)
+        if index_type == "hnsw":
+            return HNSWIndex(**options)
+        return IVFFlatIndex(**options)
+    except ValueError as e:
+        raise VectorIndexValidationError(str(e))
+
+def _partitioning_from_settings(settings: dict) -> BasePartitioning:
+    """Build a partitioning scheme from validated request settings.
+
+    Args:
+        settings: The "partitioning" object of the request body
+
+    Returns:
+        BasePartitioning: HashPartitioning, ListPartitioning or RangePartitioning
+
+    Raises:
+        PartitioningValidationError: If the settings are not valid for the partitioning type
+    """
+    partitioning_type = settings["type"]
+    allowed = {
+        "hash": {"partitions"},
+        "list": {"values", "default_partition"},
+        "range": {"ranges", "default_partition"},
+    }[partitioning_type]
+    unsupported = {"partitions", "values", "ranges", "default_partition"}.intersection(settings) - allowed
+    if unsupported:
+        raise PartitioningValidationError(
+            f"Settings {sorted(unsupported)} are not supported for '{partitioning_type}' partitioning."
+        )
+
+    options = {name: settings[name] for name in allowed if name in settings}
+    try:
+        if partitioning_type == "hash":
+            return HashPartitioning(column=settings.get("column"), **options)
+        if partitioning_type == "list":
+            return ListPartitioning(column=settings.get("column"), **options)
+        return RangePartitioning(
+            column=settings.get("column"),
+            ranges=[
+                RangePartition(name=item["name"], start=item.get("from"), end=item.get("to"))
+                for item in settings.get("ranges", [])
+            ],
+            default_partition=settings.get("default_partition", False),
+        )
+    except ValueError as e:
+        raise PartitioningValidationError(str(e))
+
+def _table_options_from_settings(settings: dict, table_name: str) -> dict:
+    """Build the optional table settings of a validated request body or batch entry.
+
+    Args:
+        settings: Object that may hold "index", "hybrid_search", "search_profile",
+            "defer_index_build", "storage_type", "metadata_columns",
+            "metadata_json_index" and "partitioning"
+        table_name: The validated table name, used to name the full-text search index
+
+    Returns:
+        dict: Keyword arguments for PGEngine.ainit_vectorstore_table
+
+    Raises:
+        VectorIndexValidationError: If the index settings are not valid
+        PartitioningValidationError: If the partitioning settings are not valid
+    """
+    storage_type = STORAGE_TYPE_ALIASES[settings.get("storage_type", "vector")]
+    options = {
+        "defer_index_build": settings.get("defer_index_build", False),
+        "metadata_json_index": settings.get("metadata_json_index", False),
+        "storage_type": storage_type,
+    }
+    if "index" in settings:
+        options["vector_index"] = _vector_index_from_settings(settings["index"])
+        try:
+            # Reject e.g. cosine distance on bit columns before any DDL runs
+            options["vector_index"].get_index_function(storage_type)
+        except ValueError as e:
+            raise VectorIndexValidationError(str(e))
+    if "metadata_columns" in settings:
+        options["metadata_columns"] = [
+            Column(
+                name=column["name"],
+                data_type=column["data_type"],
+                nullable=column.get("nullable", True),
+                index=column.get("index"),
+            )
+            for column in settings["metadata_columns"]
+        ]
+    if "partitioning" in settings:
+        partitioning = _partitioning_from_settings(settings["partitioning"])
+        metadata_column_names = [column["name"] for column in settings.get("metadata_columns", [])]
+        if partitioning.column not in (None, "langchain_id", *metadata_column_names):
+            raise PartitioningValidationError(
+                f"Partition key '{partitioning.column}' must be 'langchain_id' or one of the metadata columns."
+            )
+        if settings.get("index", {}).get("concurrently"):
+            raise PartitioningValidationError(
+                "Indexes on partitioned tables cannot be built concurrently."
+            )
+        options["partitioning"] = partitioning
+    if "hybrid_search" in settings:
+        # Index names are unique per schema, so default to one per table
+        options["hybrid_search_config"] = HybridSearchConfig(
+            **{"index_name": f"{table_name}_tsv_index", **settings["hybrid_search"]}
+        )
+    if "search_profile" in settings:
+        options["search_profile"] = SearchProfile(**settings["search_profile"])
+    return options
+
+def _extract_table_options_from_body(event: dict, table_name: str) -> dict:
+    """Extract and validate the optional table settings from the event body.
+
+    Args:
+        event: Lambda event, optionally containing "index", "hybrid_search" and
+            "defer_index_build" settings in its body
+        table_name: The validated table name, used to name the full-text search index
+
+    Returns:
+        dict: Keyword arguments for PGEngine.ainit_vectorstore_table
+
+    Raises:
+        SchemaValidationError: If the body doesn't match the expected schema
+        VectorIndexValidationError: If the index settings are not valid
+    """
+    body = _parse_event_body(event)
+    validate(event=body, schema=TABLE_OPTIONS_BODY_SCHEMA)
+    return _table_options_from_settings(body, table_name)
+
+def _extract_table_batch_from_body(body: dict, default_vector_size: int) -> list[VectorStoreTable]:
+    """Build the tables of a batch provisioning request.
+
+    Args:
+        body: Parsed request body with a "tables" array
+        default_vector_size: Vector size of tables that don't set "vector_size"
+
+    Returns:
+        list[VectorStoreTable]: One table spec per entry, in request order
+
+    Raises:
+        SchemaValidationError: If the body doesn't match the expected schema
+        TableNameValidationError: If a table name is invalid or repeated
+        VectorIndexValidationError: If the index settings of a table are not valid
+        PartitioningValidationError: If the partitioning settings of a table are not valid
+    """
+    validate(event=body, schema=TABLE_BATCH_BODY_SCHEMA)
+
+    tables = []
+    seen = set()
+    for entry in body["tables"]:
+        table_name = entry["table_name"]
+        if not _validate_table_name(table_name):
+            raise TableNameValidationError(
+                f"Invalid table name '{table_name}'. Table names must start with a letter or underscore, "
+                f"contain only alphanumeric characters and underscores, be 1-63 characters long, "
+                f"and not be a reserved keyword."
+            )
+        if table_name in seen:
+            raise TableNameValidationError(f"Table '{table_name}' is listed more than once.")
+        seen.add(table_name)
+
+        tables.append(VectorStoreTable(
+            table_name=table_name,
+            vector_size=entry.get("vector_size", default_vector_size),
+            overwrite_existing=entry.get("overwrite_existing", False),
+            **_table_options_from_settings(entry, table_name),
+        ))
+    return tables
+
+# PGVECTOR_DRIVER values: the SQLAlchemy driver, and the raw driver pool
+# that runs search queries without SQLAlchemy (None: searches use SQLAlchemy)
+SUPPORTED_DRIVERS = {
+    "psycopg": ("psycopg", None),
+    "psycopg-native": ("psycopg", "psycopg"),
+    "asyncpg": ("asyncpg", None),
+    "asyncpg-native": ("asyncpg", "asyncpg"),
+}
+
 def _check_database_env_vars():
     """Check that all DB-related environment variables are either set or unset together"""
     db_vars = {
@@ -146,7 +547,7 @@ def _connection_string_from_db_params(
     """Construct PostgreSQL connection string from individual parameters.
 
     Args:
-        driver: Database driver name (currently only 'psycopg' supported)
+        driver: PGVECTOR_DRIVER value, one of SUPPORTED_DRIVERS
         host: Database hostname or IP address
         port: Database port number
         database: Name of target database
@@ -157,14 +558,17 @@ def _connection_string_from_db_params(
         str: SQLAlchemy-compatible connection string
 
     Raises:
-        NotImplementedError: If requested driver is not 'psycopg'
+        NotImplementedError: If requested driver is not one of SUPPORTED_DRIVERS
 
     Note:
         Uses psycopg3 driver syntax (postgresql+psycopg://) for SQLAlchemy connections
     """
-    if driver != "psycopg":
-        raise NotImplementedError("Only psycopg3 driver is supported")
-    return f"postgresql+{driver}://{user}:{password}@{host}:{port}/{database}"
+    if driver not in SUPPORTED_DRIVERS:
+        raise NotImplementedError(
+            f"Unsupported PGVECTOR_DRIVER '{driver}', expected one of {sorted(SUPPORTED_DRIVERS)}"
+        )
+    sqlalchemy_driver, _ = SUPPORTED_DRIVERS[driver]
+    return f"postgresql+{sqlalchemy_driver}://{user}:{password}@{host}:{port}/{database}"
 
 
 @LOGGER.inject_lambda_context
@@ -177,6 +581,18 @@ async def handler(event, context):
     Expects table name in event headers:
     - x-table-name: The name of the table to create for vector storage
 
+    Alternatively, a JSON body with a "tables" array creates many tables in one
+    call, each with its own name, vector size, metadata columns and index
+    settings. The response body then lists the outcome per table, with status
+    207 when some tables could not be created or indexed.
+
+    Accepts an optional JSON body with an "index" object describing the
+    HNSW or IVFFlat index to build on the embedding column, a "hybrid_search"
+    object adding a generated full-text search column and its index,
+    "metadata_columns" whose "index" builds a B-tree, hash, GIN or BRIN index
+    on them, "metadata_json_index" to build a GIN index on the JSON metadata,
+    and "defer_index_build" to create the table without building those indexes.
+
     Args:
         event: Lambda invocation event containing headers with table name
         context: Lambda execution context (unused)
@@ -186,8 +602,10 @@ async def handler(event, context):
 
     Raises:
         PartialDatabaseCredentialsError: If incomplete database credentials provided
-        SchemaValidationError: If event headers don't match expected schema
+        SchemaValidationError: If event headers or body don't match expected schema
         TableNameValidationError: If table name validation fails
+        VectorIndexValidationError: If vector index settings are invalid
+        PartitioningValidationError: If partitioning settings are invalid
         Exception: Propagates any errors from extension creation process
 
     Environment Variables:
@@ -195,9 +613,7 @@ async def handler(event, context):
     """
 
     try:
-        # Extract and validate table name from event headers
-        table_name = _extract_table_name_from_headers(event)
-        LOGGER.info(f"Extracted table name from headers: {table_name}")
+        body = _parse_event_body(event)
 
         # Check database environment variables consistency
         db_vars = _check_database_env_vars()
@@ -210,13 +626,45 @@ async def handler(event, context):
             host=db_vars["DB_HOST"],
             port=db_vars["DB_PORT"],
         )
-
-        engine = PGEngine.from_connection_string(url=connection_string)
         embedding_dimensions = int(db_vars["EMBEDDING_MODEL_DIMENSIONS"])
 
+        if "tables" in body:
+            tables = _extract_table_batch_from_body(body, embedding_dimensions)
+            engine = PGEngine.get_or_create(url=connection_string)
+            results = await engine.ainit_vectorstore_tables(
+                tables, chunk_size=body.get("chunk_size", 50)
+            )
+            # Tables whose concurrent index build failed were created, with an error
+            failed = [result.table_name for result in results if result.error]
+            if failed:
+                LOGGER.error(f"Failed to create {len(failed)} of {len(results)} vector tables: {failed}")
+            else:
+                LOGGER.info(f"Successfully created {len(results)} vector tables.")
+            return {
+                # Multi-Status when only some of the tables could be created
+                "statusCode": 207 if failed else 200,
+                "body": json.dumps({"results": [
+                    {
+                        "table_name": result.table_name,
+                        "created": result.created,
+                        "error": result.error,
+                    }
+                    for result in results
+                ]})
+            }
+
+        # Extract and validate table name from event headers
+        table_name = _extract_table_name_from_headers(event)
+        LOGGER.info(f"Extracted table name from headers: {table_name}")
+
+        table_options = _extract_table_options_from_body(event, table_name)
+
+        engine = PGEngine.get_or_create(url=connection_string)
+
         await engine.ainit_vectorstore_table(
             table_name=table_name,
             vector_size=embedding_dimensions,
+            **table_options,
         )
 
         LOGGER.info(f"Successfully created vector table '{table_name}' with pgvector extension.")
@@ -224,7 +672,19 @@ async def handler(event, context):
             "statusCode": 200,
             "body": f"Successfully created vector table '{table_name}' with pgvector extension."
         }
-    except (SchemaValidationError, TableNameValidationError) as e:
+    except (
+        SchemaValidationError,
+        TableNameValidationError,
+        VectorIndexValidationError,
+        PartitioningValidationError,
+    ) as e:
+        LOGGER.error(f"Validation error: {e}")
+        return {
+            "statusCode": 400,
+            "body": f"Validation error: {str(e)}"
+        }
+    except ValueError as e:
+        # Settings the engine rejects, e.g. concurrent index builds on partitioned tables
         LOGGER.error(f"Validation error: {e}")
         return {
             "statusCode": 400,
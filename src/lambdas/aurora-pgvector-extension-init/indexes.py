@@ -0,0 +1,398 @@
+"""Index classes to add vector indexes on tables created by PGEngine.
+
+Learn more about vector indexes at https://github.com/pgvector/pgvector?tab=readme-ov-file#indexing
+"""
+
+from __future__ import annotations
+
+import enum
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Optional
+
+
+@dataclass
+class StrategyMixin:
+    operator: str
+    search_function: str
+    index_function: str
+
+
+class DistanceStrategy(StrategyMixin, enum.Enum):
+    """Enumerator of the Distance strategies."""
+
+    EUCLIDEAN = "<->", "l2_distance", "vector_l2_ops"
+    COSINE_DISTANCE = "<=>", "cosine_distance", "vector_cosine_ops"
+    INNER_PRODUCT = "<#>", "inner_product", "vector_ip_ops"
+    HAMMING = "<~>", "hamming_distance", "bit_hamming_ops"
+    JACCARD = "<%>", "jaccard_distance", "bit_jaccard_ops"
+
+    # The dataclass mixin sets __hash__ to None; members are used in sets and
+    # in statement cache keys.
+    __hash__ = enum.Enum.__hash__
+
+    def similarity(self, distance: float) -> float:
+        """Turn a search_function value into a score where higher is closer.
+
+        inner_product already is one. Cosine and Jaccard distances become
+        1 - distance; L2 and Hamming distances are negated.
+        """
+        if self is DistanceStrategy.INNER_PRODUCT:
+            return distance
+        if self in (DistanceStrategy.COSINE_DISTANCE, DistanceStrategy.JACCARD):
+            return 1.0 - distance
+        return -distance
+
+
+class VectorStorageType(enum.Enum):
+    """Column types pgvector can store embeddings in (halfvec, bit and sparsevec need pgvector 0.7+)."""
+
+    VECTOR = "vector"
+    HALFVEC = "halfvec"
+    BIT = "bit"
+    SPARSEVEC = "sparsevec"
+
+
+DEFAULT_STORAGE_TYPE: VectorStorageType = VectorStorageType.VECTOR
+
+# Bit strings are only compared by Hamming or Jaccard distance, and those
+# distances are only defined on bit strings.
+BIT_DISTANCE_STRATEGIES = frozenset(
+    {DistanceStrategy.HAMMING, DistanceStrategy.JACCARD}
+)
+
+# Most dimensions HNSW and IVFFlat can index per storage type. sparsevec is
+# limited by its number of non-zero elements instead.
+INDEX_MAX_DIMENSIONS: dict[VectorStorageType, int] = {
+    VectorStorageType.VECTOR: 2000,
+    VectorStorageType.HALFVEC: 4000,
+    VectorStorageType.BIT: 64000,
+}
+
+
+DEFAULT_DISTANCE_STRATEGY: DistanceStrategy = DistanceStrategy.COSINE_DISTANCE
+DEFAULT_INDEX_NAME_SUFFIX: str = "langchainvectorindex"
+
+# Short names accepted in Lambda events and other plain-text configuration.
+DISTANCE_STRATEGY_ALIASES: dict[str, DistanceStrategy] = {
+    "l2": DistanceStrategy.EUCLIDEAN,
+    "cosine": DistanceStrategy.COSINE_DISTANCE,
+    "ip": DistanceStrategy.INNER_PRODUCT,
+    "hamming": DistanceStrategy.HAMMING,
+    "jaccard": DistanceStrategy.JACCARD,
+}
+
+STORAGE_TYPE_ALIASES: dict[str, VectorStorageType] = {
+    storage_type.value: storage_type for storage_type in VectorStorageType
+}
+
+
+def validate_storage_type(
+    storage_type: VectorStorageType, distance_strategy: DistanceStrategy
+) -> None:
+    if (storage_type is VectorStorageType.BIT) != (
+        distance_strategy in BIT_DISTANCE_STRATEGIES
+    ):
+        raise ValueError(
+            f"Distance strategy {distance_strategy.name} is not supported for {storage_type.value} columns. "
+            f"bit columns support HAMMING and JACCARD only, other columns support every other strategy."
+        )
+
+
+def validate_identifier(identifier: str) -> None:
+    if re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", identifier) is None:
+        raise ValueError(
+            f"Invalid identifier: {identifier}. Identifiers must start with a letter or underscore, and subsequent characters can be letters, digits, or underscores."
+        )
+
+
+def validate_memory_setting(value: str) -> None:
+    if re.match(r"^\d+\s*(kB|MB|GB|TB)?$", value) is None:
+        raise ValueError(
+            f"Invalid memory setting: {value}. Use a number optionally followed by kB, MB, GB or TB."
+        )
+
+
+@dataclass
+class BaseIndex(ABC):
+    """
+    Abstract base class for defining vector indexes.
+
+    Attributes:
+        name (Optional[str]): A human-readable name for the index. Defaults to None.
+        index_type (str): A string identifying the type of index. Defaults to "base".
+        distance_strategy (DistanceStrategy): The strategy used to calculate distances
+            between vectors in the index. Defaults to DistanceStrategy.COSINE_DISTANCE.
+        partial_indexes (Optional[list[str]]): A list of names of partial indexes. Defaults to None.
+        extension_name (Optional[str]): The name of the extension to be created for the index, if any. Defaults to None.
+        concurrently (bool): Build the index with CREATE INDEX CONCURRENTLY so writes
+            are not blocked during the build. Defaults to False.
+        maintenance_work_mem (Optional[str]): Value of maintenance_work_mem for the
+            index build, e.g. "2GB". Defaults to None (server setting).
+        max_parallel_maintenance_workers (Optional[int]): Value of
+            max_parallel_maintenance_workers for the index build. Defaults to None (server setting).
+    """
+
+    name: Optional[str] = None
+    index_type: str = "base"
+    distance_strategy: DistanceStrategy = field(
+        default_factory=lambda: DistanceStrategy.COSINE_DISTANCE
+    )
+    partial_indexes: Optional[list[str]] = None
+    extension_name: Optional[str] = None
+    concurrently: bool = False
+    maintenance_work_mem: Optional[str] = None
+    max_parallel_maintenance_workers: Optional[int] = None
+
+    @abstractmethod
+    def index_options(self) -> str:
+        """Set index query options for vector store initialization."""
+        raise NotImplementedError(
+            "index_options method must be implemented by subclass"
+        )
+
+    def get_index_function(
+        self, storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE
+    ) -> str:
+        """Operator class of the index for a column of the given storage type."""
+        validate_storage_type(storage_type, self.distance_strategy)
+        if storage_type is VectorStorageType.BIT:
+            return self.distance_strategy.index_function
+        # vector_l2_ops -> halfvec_l2_ops, sparsevec_l2_ops
+        return self.distance_strategy.index_function.replace(
+            VectorStorageType.VECTOR.value, storage_type.value, 1
+        )
+
+    def build_parameters(self) -> list[str]:
+        """Session parameters to set while the index is being built."""
+        parameters = []
+        if self.maintenance_work_mem is not None:
+            parameters.append(f"maintenance_work_mem = '{self.maintenance_work_mem}'")
+        if self.max_parallel_maintenance_workers is not None:
+            parameters.append(
+                f"max_parallel_maintenance_workers = {self.max_parallel_maintenance_workers}"
+            )
+        return parameters
+
+    def __post_init__(self) -> None:
+        """Check if initialization parameters are valid.
+
+        Raises:
+            ValueError: extension_name is a valid postgreSQL identifier
+            ValueError: maintenance_work_mem is not a valid memory setting
+            ValueError: max_parallel_maintenance_workers is negative
+        """
+
+        if self.extension_name:
+            validate_identifier(self.extension_name)
+        if self.name:
+            validate_identifier(self.name)
+        if self.maintenance_work_mem is not None:
+            validate_memory_setting(self.maintenance_work_mem)
+        if (
+            self.max_parallel_maintenance_workers is not None
+            and self.max_parallel_maintenance_workers < 0
+        ):
+            raise ValueError("max_parallel_maintenance_workers must not be negative")
+
+
+@dataclass
+class ExactNearestNeighbor(BaseIndex):
+    index_type: str = "exactnearestneighbor"
+
+    def index_options(self) -> str:
+        return ""
+
+
+@dataclass
+class QueryOptions(ABC):
+    """Abstract base class for vector index query options."""
+
+    @abstractmethod
+    def to_parameter(self) -> list[str]:
+        """Convert index attributes to list of configuration parameters."""
+        raise NotImplementedError("to_parameter method must be implemented by subclass")
+
+
+@dataclass
+class ExactSearchQueryOptions(QueryOptions):
+    """Scan the whole table instead of using a vector index.
+
+    ANN searches read their rows from an index scan ordered by distance;
+    without index scans the planner sorts the rows of a sequential scan, which
+    gives exact results. Used as the ground truth when measuring recall.
+    """
+
+    def to_parameter(self) -> list[str]:
+        """Convert index attributes to list of configuration parameters."""
+        return ["enable_indexscan = off"]
+
+
+@dataclass
+class HNSWIndex(BaseIndex):
+    index_type: str = "hnsw"
+    m: int = 16
+    ef_construction: int = 64
+
+    def index_options(self) -> str:
+        """Set index query options for vector store initialization."""
+        return f"(m = {self.m}, ef_construction = {self.ef_construction})"
+
+
+@dataclass
+class BinaryQuantizedHNSWIndex(HNSWIndex):
+    """HNSW index over binary_quantize(embedding), compared by Hamming or Jaccard distance.
+
+    The index stores one bit per dimension, so it is 32 times smaller than an
+    index over float4 vectors. Searches using it fetch an oversampled set of
+    candidates from it and re-rank them by their exact distance.
+    """
+
+    distance_strategy: DistanceStrategy = field(
+        default_factory=lambda: DistanceStrategy.HAMMING
+    )
+
+    def get_index_function(
+        self, storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE
+    ) -> str:
+        """Operator class of the index for a column of the given storage type."""
+        if storage_type not in (VectorStorageType.VECTOR, VectorStorageType.HALFVEC):
+            raise ValueError(
+                f"Binary quantization is only supported for vector and halfvec columns, not {storage_type.value}."
+            )
+        return super().get_index_function(VectorStorageType.BIT)
+
+
+# Upper bound pgvector accepts for hnsw.ef_search.
+HNSW_MAX_EF_SEARCH = 1000
+
+
+@dataclass
+class HNSWQueryOptions(QueryOptions):
+    ef_search: int = 40
+
+    def to_parameter(self) -> list[str]:
+        """Convert index attributes to list of configuration parameters."""
+        return [f"hnsw.ef_search = {self.ef_search}"]
+
+
+@dataclass
+class IVFFlatIndex(BaseIndex):
+    index_type: str = "ivfflat"
+    lists: int = 100
+
+    def index_options(self) -> str:
+        """Set index query options for vector store initialization."""
+        return f"(lists = {self.lists})"
+
+    def get_index_function(
+        self, storage_type: VectorStorageType = DEFAULT_STORAGE_TYPE
+    ) -> str:
+        """Operator class of the index for a column of the given storage type."""
+        if storage_type is VectorStorageType.SPARSEVEC:
+            raise ValueError("IVFFlat indexes do not support sparsevec columns.")
+        return super().get_index_function(storage_type)
+
+
+@dataclass
+class IVFFlatQueryOptions(QueryOptions):
+    probes: int = 1
+
+    def to_parameter(self) -> list[str]:
+        """Convert index attributes to list of configuration parameters."""
+        return [f"ivfflat.probes = {self.probes}"]
+
+
+class IterativeScan(str, enum.Enum):
+    """Modes of pgvector 0.8 iterative index scans.
+
+    An index scan stops after ef_search (HNSW) or probes (IVFFlat) worth of
+    candidates. With a WHERE clause, rows failing it are dropped after the
+    scan, so selective filters return fewer than k rows; iterative scans keep
+    scanning the index until k rows pass. strict_order returns rows in exact
+    distance order, relaxed_order may return them slightly out of order but
+    scans less. IVFFlat only supports relaxed_order.
+    """
+
+    OFF = "off"
+    RELAXED_ORDER = "relaxed_order"
+    STRICT_ORDER = "strict_order"
+
+
+@dataclass
+class SearchProfile(QueryOptions):
+    """Settings applied with SET LOCAL to the searches of one table.
+
+    Unset attributes keep the server settings. Save a profile for a table
+    with PGEngine.save_query_options, or pass it to init_vectorstore_table.
+
+    Attributes:
+        ef_search (Optional[int]): hnsw.ef_search, 1 to 1000. Default: None.
+        probes (Optional[int]): ivfflat.probes. Default: None.
+        iterative_scan (Optional[IterativeScan]): hnsw.iterative_scan and
+            ivfflat.iterative_scan (pgvector 0.8+). Default: None.
+        work_mem (Optional[str]): work_mem, e.g. "64MB", for sorts of exact and
+            full-text searches. Default: None.
+    """
+
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    iterative_scan: Optional[IterativeScan] = None
+    work_mem: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        """Check if initialization parameters are valid.
+
+        Raises:
+            ValueError: If ef_search is not between 1 and HNSW_MAX_EF_SEARCH.
+            ValueError: If probes is less than 1.
+            ValueError: If iterative_scan is not an IterativeScan value.
+            ValueError: If work_mem is not a valid memory setting.
+        """
+        if self.ef_search is not None and not 1 <= self.ef_search <= HNSW_MAX_EF_SEARCH:
+            raise ValueError(f"ef_search must be between 1 and {HNSW_MAX_EF_SEARCH}")
+        if self.probes is not None and self.probes < 1:
+            raise ValueError("probes must be at least 1")
+        if self.iterative_scan is not None:
+            self.iterative_scan = IterativeScan(self.iterative_scan)
+        if self.work_mem is not None:
+            validate_memory_setting(self.work_mem)
+
+    @classmethod
+    def from_query_options(cls, query_options: Optional[QueryOptions]) -> SearchProfile:
+        """Profile with the settings of HNSWQueryOptions, IVFFlatQueryOptions or a profile."""
+        if isinstance(query_options, SearchProfile):
+            return replace(query_options)
+        if isinstance(query_options, HNSWQueryOptions):
+            return cls(ef_search=query_options.ef_search)
+        if isinstance(query_options, IVFFlatQueryOptions):
+            return cls(probes=query_options.probes)
+        return cls()
+
+    def to_parameter(self) -> list[str]:
+        """Convert index attributes to list of configuration parameters."""
+        parameters = []
+        if self.ef_search is not None:
+            parameters.append(f"hnsw.ef_search = {self.ef_search}")
+        if self.probes is not None:
+            parameters.append(f"ivfflat.probes = {self.probes}")
+        if self.iterative_scan is not None:
+            parameters.append(f"hnsw.iterative_scan = {self.iterative_scan.value}")
+            if self.iterative_scan is not IterativeScan.STRICT_ORDER:
+                parameters.append(f"ivfflat.iterative_scan = {self.iterative_scan.value}")
+        if self.work_mem is not None:
+            parameters.append(f"work_mem = '{self.work_mem}'")
+        return parameters
+
+
+def query_options_from_dict(options: dict[str, Any]) -> QueryOptions:
+    """Rebuild query options from dataclasses.asdict output.
+
+    Raises:
+        ValueError: If the keys match no query options class.
+    """
+    for options_class in (HNSWQueryOptions, IVFFlatQueryOptions, SearchProfile):
+        if set(options) == {option.name for option in fields(options_class)}:
+            return options_class(**options)
+    raise ValueError(f"Unknown query options: {sorted(options)}")
@@ -0,0 +1,390 @@
+"""Helpers for moving embeddings in pgvector's binary wire format.
+
+Vectors are encoded a whole batch at a time with NumPy into the pgvector binary
+wire format, so writing a row to COPY only hands a slice of that buffer to
+psycopg instead of converting every embedding to a Python list first. vector,
+halfvec, bit and sparsevec columns are supported.
+
+In the other direction, vector and halfvec values read in the binary format
+are copied straight into a float32 matrix with np.frombuffer instead of
+parsing their text format into Python lists.
+"""
+
+import struct
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+from psycopg.adapt import Dumper
+from psycopg.pq import Format
+
+from .indexes import VectorStorageType
+
+# pgvector stores at most 16,000 dimensions in a vector or halfvec column, and
+# at most 16,000 non-zero elements in a sparsevec column.
+VECTOR_MAX_DIMENSIONS = 16000
+SPARSEVEC_MAX_NONZERO = 16000
+
+
+@dataclass
+class EmbeddingBatch:
+    """A batch of rows to load into a vector store table.
+
+    Attributes:
+        contents (Sequence[str]): Document content for each row.
+        embeddings (np.ndarray): 2-D array of shape (rows, dimensions).
+        ids (Optional[Sequence[Any]]): Row ids as values of the id column type, e.g.
+            uuid.UUID for the default UUID column. Random UUIDs are generated when None.
+        metadatas (Optional[Sequence[dict[str, Any]]]): Metadata for each row. Keys
+            matching a metadata column are stored in that column, the rest in the
+            JSON metadata column.
+    """
+
+    contents: Sequence[str]
+    embeddings: np.ndarray
+    ids: Optional[Sequence[Any]] = None
+    metadatas: Optional[Sequence[dict[str, Any]]] = None
+
+    def __post_init__(self) -> None:
+        """Check if initialization parameters are valid.
+
+        Raises:
+            ValueError: If embeddings is not a 2-D array.
+            ValueError: If ids, contents or metadatas do not match the number of embeddings.
+        """
+
+        self.embeddings = np.asarray(self.embeddings)
+        if self.embeddings.ndim != 2:
+            raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+        rows = self.embeddings.shape[0]
+        if len(self.contents) != rows:
+            raise ValueError("contents must have one entry per embedding")
+        if self.ids is None:
+            self.ids = [uuid.uuid4() for _ in range(rows)]
+        elif len(self.ids) != rows:
+            raise ValueError("ids must have one entry per embedding")
+        if self.metadatas is not None and len(self.metadatas) != rows:
+            raise ValueError("metadatas must have one entry per embedding")
+
+    def __len__(self) -> int:
+        return self.embeddings.shape[0]
+
+
+@dataclass
+class IngestStats:
+    """Result of a bulk load."""
+
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class RowBatch:
+    """A block of rows read from a vector store table, one list per column.
+
+    Attributes:
+        ids (list[Any]): Row ids.
+        contents (list[str]): Document content of each row.
+        embeddings (np.ndarray): float32 array of shape (rows, dimensions).
+        metadata_columns (dict[str, list[Any]]): Values of each custom metadata column.
+        metadata_json (Optional[list[Optional[dict[str, Any]]]]): Values of the JSON
+            metadata column, or None if the table has no such column.
+    """
+
+    ids: list[Any]
+    contents: list[str]
+    embeddings: np.ndarray
+    metadata_columns: dict[str, list[Any]]
+    metadata_json: Optional[list[Optional[dict[str, Any]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_pydict(self) -> dict[str, Any]:
+        """Columns by name, e.g. for pyarrow.table(batch.to_pydict()).
+
+        Embeddings are a list of float32 rows.
+        """
+        columns = {"id": self.ids, "content": self.contents, "embedding": list(self.embeddings)}
+        columns.update(self.metadata_columns)
+        if self.metadata_json is not None:
+            columns["metadata"] = self.metadata_json
+        return columns
+
+    def to_embedding_batch(self) -> EmbeddingBatch:
+        """The rows as an EmbeddingBatch, e.g. to load them into another table.
+
+        Metadata column values and the JSON metadata are merged into one dict per row.
+        """
+        metadatas = []
+        for i, json_metadata in enumerate(self.metadata_json or [None] * len(self)):
+            metadata = dict(json_metadata or {})
+            metadata.update(
+                (name, values[i]) for name, values in self.metadata_columns.items()
+            )
+            metadatas.append(metadata)
+        return EmbeddingBatch(
+            contents=self.contents,
+            embeddings=self.embeddings,
+            ids=self.ids,
+            metadatas=metadatas,
+        )
+
+
+def encode_vectors(embeddings: np.ndarray) -> np.ndarray:
+    """Encode a 2-D array into pgvector's binary `vector` format, one row per vector.
+
+    Each encoded row is a big-endian int16 dimension count, an unused int16 and
+    the values as big-endian float4.
+
+    Args:
+        embeddings (np.ndarray): Array of shape (rows, dimensions).
+
+    Returns:
+        np.ndarray: uint8 array of shape (rows, 4 + 4 * dimensions).
+
+    Raises:
+        ValueError: If embeddings is not 2-D or has too many dimensions.
+    """
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2:
+        raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+    rows, dimensions = embeddings.shape
+    if dimensions > VECTOR_MAX_DIMENSIONS:
+        raise ValueError(f"vector columns support at most {VECTOR_MAX_DIMENSIONS} dimensions")
+
+    encoded = np.empty((rows, 4 + 4 * dimensions), dtype=np.uint8)
+    encoded[:, :4] = np.frombuffer(struct.pack(">HH", dimensions, 0), dtype=np.uint8)
+    encoded[:, 4:].view(">f4")[:] = embeddings
+    return encoded
+
+
+def encode_halfvecs(embeddings: np.ndarray) -> np.ndarray:
+    """Encode a 2-D array into pgvector's binary `halfvec` format, one row per vector.
+
+    Same layout as encode_vectors, with big-endian float2 values. Values
+    outside the float16 range become infinite, which halfvec rejects.
+
+    Returns:
+        np.ndarray: uint8 array of shape (rows, 4 + 2 * dimensions).
+    """
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2:
+        raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+    rows, dimensions = embeddings.shape
+    if dimensions > VECTOR_MAX_DIMENSIONS:
+        raise ValueError(f"halfvec columns support at most {VECTOR_MAX_DIMENSIONS} dimensions")
+
+    encoded = np.empty((rows, 4 + 2 * dimensions), dtype=np.uint8)
+    encoded[:, :4] = np.frombuffer(struct.pack(">HH", dimensions, 0), dtype=np.uint8)
+    encoded[:, 4:].view(">f2")[:] = embeddings
+    return encoded
+
+
+def encode_bits(embeddings: np.ndarray) -> np.ndarray:
+    """Encode a 2-D array into the binary `bit` format, one row per bit string.
+
+    Non-zero values become 1 bits. Each encoded row is a big-endian int32 bit
+    count followed by the bits, most significant first.
+
+    Returns:
+        np.ndarray: uint8 array of shape (rows, 4 + ceil(dimensions / 8)).
+    """
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2:
+        raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+    rows, dimensions = embeddings.shape
+
+    packed = np.packbits(embeddings != 0, axis=1)
+    encoded = np.empty((rows, 4 + packed.shape[1]), dtype=np.uint8)
+    encoded[:, :4] = np.frombuffer(struct.pack(">i", dimensions), dtype=np.uint8)
+    encoded[:, 4:] = packed
+    return encoded
+
+
+def encode_sparsevecs(embeddings: np.ndarray) -> list[bytes]:
+    """Encode the rows of a dense 2-D array into pgvector's binary `sparsevec` format.
+
+    Each encoded row is a big-endian int32 dimension count, non-zero count and
+    unused int32, then the zero-based indices as int32 and the values as float4.
+    Rows differ in length, so they are returned as separate buffers.
+
+    Raises:
+        ValueError: If embeddings is not 2-D or a row has too many non-zero elements.
+    """
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2:
+        raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+    dimensions = embeddings.shape[1]
+
+    encoded = []
+    for row in embeddings:
+        indices = np.flatnonzero(row)
+        if indices.size > SPARSEVEC_MAX_NONZERO:
+            raise ValueError(
+                f"sparsevec columns support at most {SPARSEVEC_MAX_NONZERO} non-zero elements"
+            )
+        encoded.append(
+            struct.pack(">iii", dimensions, indices.size, 0)
+            + indices.astype(">i4").tobytes()
+            + row[indices].astype(">f4").tobytes()
+        )
+    return encoded
+
+
+def encode_embeddings(
+    embeddings: np.ndarray, storage_type: VectorStorageType
+) -> Union[np.ndarray, list[bytes]]:
+    """Encode a 2-D array for a column of the given storage type.
+
+    Returns:
+        Union[np.ndarray, list[bytes]]: The uint8 matrix of encode_vectors,
+        encode_halfvecs or encode_bits, or the buffers of encode_sparsevecs.
+        Either way, row i is the encoded value of embedding i.
+    """
+    if storage_type is VectorStorageType.SPARSEVEC:
+        return encode_sparsevecs(embeddings)
+    encoder = {
+        VectorStorageType.VECTOR: encode_vectors,
+        VectorStorageType.HALFVEC: encode_halfvecs,
+        VectorStorageType.BIT: encode_bits,
+    }[storage_type]
+    return encoder(embeddings)
+
+
+def copy_rows(
+    batch: EmbeddingBatch,
+    storage_type: VectorStorageType,
+    metadata_columns: Sequence[str] = (),
+    include_metadata_json: bool = True,
+) -> Iterator[list[Any]]:
+    """Rows of a batch for COPY ... (FORMAT BINARY), in the column order of add_embeddings.
+
+    Each row is the id, the content, the encoded embedding, the value of each
+    metadata column and, if include_metadata_json, a dict of the other
+    metadata keys. Embeddings are encoded for the whole batch at once; a row
+    holds a memoryview of its slice of that buffer, which the dumpers
+    registered by register_pre_encoded_dumper pass through.
+    """
+    vectors = encode_embeddings(batch.embeddings, storage_type)
+    metadatas = batch.metadatas or [{}] * len(batch)
+    for row_id, content, vector, metadata in zip(
+        batch.ids, batch.contents, vectors, metadatas
+    ):
+        # A row of the 2-D matrix is 1-D and contiguous, so its memoryview is flat
+        row = [row_id, content, memoryview(vector)]
+        row.extend(metadata.get(column) for column in metadata_columns)
+        if include_metadata_json:
+            row.append(
+                {
+                    key: value
+                    for key, value in metadata.items()
+                    if key not in metadata_columns
+                }
+            )
+        yield row
+
+
+class _EncodedVector:
+    """Marker type for registering pre-encoded vector dumpers; never instantiated."""
+
+
+class _PreEncodedBinaryDumper(Dumper):
+    """Dump values that are already in the binary wire format of the column."""
+
+    format = Format.BINARY
+
+    def dump(self, obj: Any) -> Any:
+        return obj
+
+
+@lru_cache(maxsize=None)
+def pre_encoded_dumper(oid: int) -> type[Dumper]:
+    """Binary dumper class for the type `oid` that passes pre-encoded buffers through."""
+    return type(
+        f"_PreEncodedBinaryDumper{oid}", (_PreEncodedBinaryDumper,), {"oid": oid}
+    )
+
+
+def register_pre_encoded_dumper(conn: Any, oid: int) -> None:
+    """Register a pass-through binary dumper for `oid` on a psycopg connection.
+
+    COPY with explicit types looks dumpers up by oid, so rows can carry the
+    encoded buffers of copy_rows for that column.
+    """
+    conn.adapters.register_dumper(_EncodedVector, pre_encoded_dumper(oid))
+
+
+# Big-endian element type of the binary format of decodable storage types
+_DECODE_DTYPES = {
+    VectorStorageType.VECTOR: ">f4",
+    VectorStorageType.HALFVEC: ">f2",
+}
+
+
+def decode_embeddings(
+    values: Sequence[Union[bytes, np.ndarray]], storage_type: VectorStorageType
+) -> np.ndarray:
+    """Decode vector or halfvec values into a contiguous float32 matrix.
+
+    Args:
+        values: Binary wire format buffers, as fetched by a psycopg binary
+            cursor, or arrays already decoded by a driver codec.
+        storage_type (VectorStorageType): Column type of the values.
+
+    Returns:
+        np.ndarray: float32 array of shape (rows, dimensions).
+
+    Raises:
+        ValueError: If the storage type cannot be decoded, a value is NULL or
+            the values differ in dimensions.
+    """
+    if storage_type not in _DECODE_DTYPES:
+        raise ValueError(
+            f"Only {[t.value for t in _DECODE_DTYPES]} embeddings can be decoded, got {storage_type.value}."
+        )
+    if not values:
+        return np.empty((0, 0), dtype=np.float32)
+    if any(value is None for value in values):
+        raise ValueError("Cannot decode NULL embeddings.")
+    dtype = _DECODE_DTYPES[storage_type]
+
+    first = values[0]
+    dimensions = len(first) if isinstance(first, np.ndarray) else struct.unpack_from(">H", first)[0]
+    matrix = np.empty((len(values), dimensions), dtype=np.float32)
+    for row, value in zip(matrix, values):
+        if not isinstance(value, np.ndarray):
+            value = np.frombuffer(value, dtype=dtype, offset=4)
+        if value.size != dimensions:
+            raise ValueError("Embeddings have different dimensions.")
+        row[:] = value
+    return matrix
+
+
+async def aiter_batches(
+    batches: Union[EmbeddingBatch, Iterable[EmbeddingBatch], AsyncIterable[EmbeddingBatch]],
+) -> AsyncIterator[EmbeddingBatch]:
+    """Iterate over a single batch, an iterable of batches or an async iterable of batches."""
+    if isinstance(batches, EmbeddingBatch):
+        yield batches
+    elif isinstance(batches, AsyncIterable):
+        async for batch in batches:
+            yield batch
+    else:
+        for batch in batches:
+            yield batch
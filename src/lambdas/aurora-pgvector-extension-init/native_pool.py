@@ -0,0 +1,345 @@
+"""Raw driver connection pools for PGEngine's hot search queries.
+
+SQLAlchemy's AsyncEngine compiles every statement, wraps the driver cursor in
+a result proxy and builds a RowMapping per row. For high-QPS top-k searches
+that work dominates the client side of a query, so a PGEngine created with a
+native driver runs its searches on a psycopg_pool.AsyncConnectionPool or an
+asyncpg.Pool directly, with the SQL rendered once per statement and rows kept
+as tuples until they are returned. DDL and bulk loading still go through the
+AsyncEngine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncContextManager, AsyncIterator, Optional, Sequence
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import URL
+
+NATIVE_DRIVERS = ("psycopg", "asyncpg")
+
+DEFAULT_NATIVE_POOL_MIN_SIZE = 1
+DEFAULT_NATIVE_POOL_MAX_SIZE = 10
+
+# Bind parameters of a text() clause: ":name", but not "::type" casts. Same
+# pattern as sqlalchemy.sql.elements.TextClause.
+_BIND_PARAM = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+
+@dataclass(frozen=True)
+class DriverStatement:
+    """A statement rendered in a driver's paramstyle.
+
+    Attributes:
+        sql (str): The query text.
+        param_names (tuple[str, ...]): Names of the positional parameters, in
+            order, for drivers with numbered placeholders. Empty for named ones.
+    """
+
+    sql: str
+    param_names: tuple[str, ...] = ()
+
+    def positional(self, params: dict[str, Any]) -> list[Any]:
+        """The values of params in placeholder order."""
+        return [params[name] for name in self.param_names]
+
+
+@dataclass
+class NativeResult:
+    """Rows of one query, as tuples in the order of columns."""
+
+    columns: list[str]
+    rows: list[tuple]
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+class NativePool(ABC):
+    """A connection pool of a driver, opened on first use.
+
+    Searches are read only: each batch runs in one transaction that is rolled
+    back, which also discards its SET LOCAL settings.
+    """
+
+    driver: str
+
+    def __init__(
+        self,
+        url: URL,
+        *,
+        min_size: int = DEFAULT_NATIVE_POOL_MIN_SIZE,
+        max_size: int = DEFAULT_NATIVE_POOL_MAX_SIZE,
+        prepare_statements: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """NativePool constructor.
+
+        Args:
+            url (URL): Connection URL; its driver name is ignored.
+            min_size (int): Connections kept open. Default: 1.
+            max_size (int): Most connections open at once. Default: 10.
+            prepare_statements (bool): Run queries as server-side prepared
+                statements. Default: True.
+            **kwargs: Extra arguments passed to the driver's pool.
+
+        Raises:
+            ValueError: If min_size is negative or greater than max_size.
+        """
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._dsn = url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._min_size = min_size
+        self._max_size = max_size
+        self._prepare_statements = prepare_statements
+        self._kwargs = kwargs
+        self._pool: Any = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+    @abstractmethod
+    def statement(self, sql: str) -> DriverStatement:
+        """Render the :name bind parameters of sql in the driver's paramstyle."""
+
+    @abstractmethod
+    async def _acreate_pool(self) -> Any:
+        """Create and open the driver's pool."""
+
+    @abstractmethod
+    def _aconnect(self, pool: Any) -> AsyncContextManager[Any]:
+        """Check a connection out of the driver's pool."""
+
+    @abstractmethod
+    async def _afetch_value(
+        self, conn: Any, statement: DriverStatement, params: dict[str, Any]
+    ) -> Any:
+        """First column of the first row of statement, or None."""
+
+    @abstractmethod
+    async def _afetch_batch(
+        self,
+        conn: Any,
+        statement: DriverStatement,
+        params: Sequence[dict[str, Any]],
+        settings: Sequence[str],
+    ) -> list[NativeResult]:
+        """Run statement once per params on conn."""
+
+    @abstractmethod
+    async def _aclose_pool(self, pool: Any) -> None:
+        """Close the driver's pool."""
+
+    async def _aget_pool(self) -> Any:
+        if self._pool is None:
+            # Created on first use so the lock and pool bind to the engine's loop
+            if self._open_lock is None:
+                self._open_lock = asyncio.Lock()
+            async with self._open_lock:
+                if self._pool is None:
+                    self._pool = await self._acreate_pool()
+        return self._pool
+
+    @asynccontextmanager
+    async def aconnect(self) -> AsyncIterator[Any]:
+        """Check out a driver connection, for afetch_value and afetch_batch."""
+        async with self._aconnect(await self._aget_pool()) as conn:
+            yield conn
+
+    async def afetch_value(
+        self, conn: Any, statement: DriverStatement, params: dict[str, Any]
+    ) -> Any:
+        """First column of the first row of statement on conn, or None."""
+        return await self._afetch_value(conn, statement, params)
+
+    async def afetch_batch(
+        self,
+        statement: DriverStatement,
+        params: Sequence[dict[str, Any]],
+        settings: Sequence[str] = (),
+        *,
+        conn: Any = None,
+    ) -> list[NativeResult]:
+        """Run statement once per params after applying settings with SET LOCAL.
+
+        Args:
+            statement (DriverStatement): Statement rendered by self.statement.
+            params (Sequence[dict[str, Any]]): Bind parameters of each query.
+            settings (Sequence[str]): "name = value" settings for the transaction.
+            conn (Any): Connection from aconnect to run on. Default: None (check
+                one out for the batch).
+
+        Returns:
+            list[NativeResult]: The rows of each query, in params order.
+        """
+        if conn is not None:
+            return await self._afetch_batch(conn, statement, params, settings)
+        async with self.aconnect() as conn:
+            return await self._afetch_batch(conn, statement, params, settings)
+
+    async def aclose(self) -> None:
+        """Close the pool. It is reopened if used again."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await self._aclose_pool(pool)
+
+
+class PsycopgNativePool(NativePool):
+    """psycopg_pool.AsyncConnectionPool; a batch is sent in one pipeline."""
+
+    driver = "psycopg"
+
+    def statement(self, sql: str) -> DriverStatement:
+        # "%" is psycopg's placeholder prefix, e.g. in the <%> operator
+        return DriverStatement(_BIND_PARAM.sub(r"%(\1)s", sql.replace("%", "%%")))
+
+    async def _acreate_pool(self) -> Any:
+        from psycopg_pool import AsyncConnectionPool
+
+        pool_kwargs = dict(self._kwargs)
+        connection_kwargs = dict(pool_kwargs.pop("kwargs", {}))
+        if not self._prepare_statements:
+            connection_kwargs["prepare_threshold"] = None
+        pool = AsyncConnectionPool(
+            self._dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            kwargs=connection_kwargs,
+            # Same health check on checkout as the engine's pool_pre_ping
+            check=AsyncConnectionPool.check_connection,
+            open=False,
+            **pool_kwargs,
+        )
+        await pool.open()
+        return pool
+
+    def _aconnect(self, pool: Any) -> AsyncContextManager[Any]:
+        return pool.connection()
+
+    async def _afetch_value(
+        self, conn: Any, statement: DriverStatement, params: dict[str, Any]
+    ) -> Any:
+        row = await (await conn.execute(statement.sql, params)).fetchone()
+        return row[0] if row else None
+
+    async def _afetch_batch(
+        self,
+        conn: Any,
+        statement: DriverStatement,
+        params: Sequence[dict[str, Any]],
+        settings: Sequence[str],
+    ) -> list[NativeResult]:
+        # prepare=None leaves it to psycopg's prepare_threshold
+        prepare = True if self._prepare_statements else None
+        cursors = []
+        async with conn.pipeline():
+            for setting in settings:
+                await conn.execute(f"SET LOCAL {setting}")
+            for param in params:
+                cursor = conn.cursor()
+                await cursor.execute(statement.sql, param, prepare=prepare)
+                cursors.append(cursor)
+        results = [
+            NativeResult(
+                columns=[column.name for column in cursor.description],
+                rows=await cursor.fetchall(),
+            )
+            for cursor in cursors
+        ]
+        await conn.rollback()
+        return results
+
+    async def _aclose_pool(self, pool: Any) -> None:
+        await pool.close()
+
+
+class AsyncpgNativePool(NativePool):
+    """asyncpg.Pool; asyncpg prepares and caches every statement per connection."""
+
+    driver = "asyncpg"
+
+    def statement(self, sql: str) -> DriverStatement:
+        param_names: list[str] = []
+
+        def placeholder(match: re.Match) -> str:
+            if match.group(1) not in param_names:
+                param_names.append(match.group(1))
+            return f"${param_names.index(match.group(1)) + 1}"
+
+        return DriverStatement(_BIND_PARAM.sub(placeholder, sql), tuple(param_names))
+
+    async def _acreate_pool(self) -> Any:
+        import asyncpg
+
+        from .asyncpg_codecs import ASYNCPG_SERVER_SETTINGS, register_vector_codecs
+
+        pool_kwargs = dict(self._kwargs)
+        if not self._prepare_statements:
+            pool_kwargs.setdefault("statement_cache_size", 0)
+        pool_kwargs.setdefault("server_settings", ASYNCPG_SERVER_SETTINGS)
+        return await asyncpg.create_pool(
+            self._dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            init=register_vector_codecs,
+            **pool_kwargs,
+        )
+
+    def _aconnect(self, pool: Any) -> AsyncContextManager[Any]:
+        return pool.acquire()
+
+    async def _afetch_value(
+        self, conn: Any, statement: DriverStatement, params: dict[str, Any]
+    ) -> Any:
+        return await conn.fetchval(statement.sql, *statement.positional(params))
+
+    async def _afetch_batch(
+        self,
+        conn: Any,
+        statement: DriverStatement,
+        params: Sequence[dict[str, Any]],
+        settings: Sequence[str],
+    ) -> list[NativeResult]:
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            for setting in settings:
+                await conn.execute(f"SET LOCAL {setting}")
+            results = []
+            for param in params:
+                records = await conn.fetch(statement.sql, *statement.positional(param))
+                results.append(
+                    NativeResult(
+                        columns=list(records[0].keys()) if records else [],
+                        rows=[tuple(record) for record in records],
+                    )
+                )
+        finally:
+            await transaction.rollback()
+        return results
+
+    async def _aclose_pool(self, pool: Any) -> None:
+        await pool.close()
+
+
+def native_pool_from_url(url: URL, driver: str, **kwargs: Any) -> NativePool:
+    """Create the NativePool of driver for url.
+
+    Args:
+        url (URL): Connection URL.
+        driver (str): "psycopg" or "asyncpg".
+        **kwargs: Arguments passed to the NativePool constructor.
+
+    Raises:
+        ValueError: If the driver is not supported.
+    """
+    if driver == "psycopg":
+        return PsycopgNativePool(url, **kwargs)
+    if driver == "asyncpg":
+        return AsyncpgNativePool(url, **kwargs)
+    raise ValueError(f"Native driver must be one of {NATIVE_DRIVERS}, got '{driver}'")
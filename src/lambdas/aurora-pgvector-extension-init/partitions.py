@@ -0,0 +1,169 @@
+"""Partitioning schemes for vector store tables created by PGEngine.
+
+An index created on a partitioned table is created on every partition, so each
+partition gets its own, smaller ANN index. Queries that filter on the partition
+key only scan the matching partitions and their indexes.
+
+Learn more about partitioning at https://www.postgresql.org/docs/current/ddl-partitioning.html
+"""
+
+import datetime
+import decimal
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from .indexes import validate_identifier
+
+PartitionValue = Union[str, int, float, decimal.Decimal, datetime.date, datetime.datetime]
+
+
+def sql_literal(value: PartitionValue) -> str:
+    """Render a partition bound as a SQL literal.
+
+    Raises:
+        TypeError: If the value is not a string, number, date or datetime.
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return repr(value) if not isinstance(value, decimal.Decimal) else str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(f"Unsupported partition bound type: {type(value).__name__}")
+
+
+@dataclass
+class BasePartitioning(ABC):
+    """
+    Abstract base class for table partitioning schemes.
+
+    Attributes:
+        column (Optional[str]): The partition key column. None means the id column.
+    """
+
+    column: Optional[str] = None
+
+    @property
+    @abstractmethod
+    def method(self) -> str:
+        """PARTITION BY method: HASH, LIST or RANGE."""
+
+    @abstractmethod
+    def partition_bounds(self) -> list[tuple[str, str]]:
+        """(suffix, bound clause) of each child partition, e.g. ("p0", "FOR VALUES WITH (...)")."""
+
+    def __post_init__(self) -> None:
+        """Check if initialization parameters are valid.
+
+        Raises:
+            ValueError: If a partition suffix is not a valid postgreSQL identifier.
+        """
+
+        for suffix, _ in self.partition_bounds():
+            validate_identifier(suffix)
+
+
+@dataclass
+class HashPartitioning(BasePartitioning):
+    """Spread rows evenly over `partitions` partitions by hash of the key, the id column by default."""
+
+    partitions: int = 8
+
+    @property
+    def method(self) -> str:
+        return "HASH"
+
+    def partition_bounds(self) -> list[tuple[str, str]]:
+        return [
+            (f"p{remainder}", f"FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {remainder})")
+            for remainder in range(self.partitions)
+        ]
+
+    def __post_init__(self) -> None:
+        if self.partitions < 1:
+            raise ValueError("partitions must be positive")
+        super().__post_init__()
+
+
+@dataclass
+class ListPartitioning(BasePartitioning):
+    """One partition per list of key values, e.g. per tenant.
+
+    Attributes:
+        values (dict[str, list[PartitionValue]]): Partition suffix to the key
+            values stored in that partition.
+        default_partition (bool): Add a "default" partition for all other values.
+    """
+
+    values: dict[str, list[PartitionValue]] = field(default_factory=dict)
+    default_partition: bool = True
+
+    @property
+    def method(self) -> str:
+        return "LIST"
+
+    def partition_bounds(self) -> list[tuple[str, str]]:
+        bounds = [
+            (suffix, f"FOR VALUES IN ({', '.join(sql_literal(value) for value in values)})")
+            for suffix, values in self.values.items()
+        ]
+        if self.default_partition:
+            bounds.append(("default", "DEFAULT"))
+        return bounds
+
+    def __post_init__(self) -> None:
+        if self.column is None:
+            raise ValueError("List partitioning needs a partition key column")
+        if any(not values for values in self.values.values()):
+            raise ValueError("Every list partition needs at least one value")
+        super().__post_init__()
+
+
+@dataclass
+class RangePartition:
+    """A range partition holding keys from `start` (inclusive) to `end` (exclusive).
+
+    None bounds are open ended (MINVALUE / MAXVALUE).
+    """
+
+    name: str
+    start: Optional[PartitionValue] = None
+    end: Optional[PartitionValue] = None
+
+
+@dataclass
+class RangePartitioning(BasePartitioning):
+    """Partitions over ranges of the key, e.g. of a created_at column.
+
+    Attributes:
+        ranges (list[RangePartition]): The partitions, named by their suffix.
+        default_partition (bool): Add a "default" partition for keys outside all ranges.
+    """
+
+    ranges: list[RangePartition] = field(default_factory=list)
+    default_partition: bool = False
+
+    @property
+    def method(self) -> str:
+        return "RANGE"
+
+    def partition_bounds(self) -> list[tuple[str, str]]:
+        bounds = [
+            (
+                partition.name,
+                f"FOR VALUES FROM ({'MINVALUE' if partition.start is None else sql_literal(partition.start)}) "
+                f"TO ({'MAXVALUE' if partition.end is None else sql_literal(partition.end)})",
+            )
+            for partition in self.ranges
+        ]
+        if self.default_partition:
+            bounds.append(("default", "DEFAULT"))
+        return bounds
+
+    def __post_init__(self) -> None:
+        if self.column is None:
+            raise ValueError("Range partitioning needs a partition key column")
+        super().__post_init__()
@@ -0,0 +1,106 @@
+"""LRU cache for the search SQL PGEngine renders for a table.
+
+Statements depend only on the table and its layout (schema, column names,
+storage type, hybrid search settings, ...), not on the query values, which
+are bound parameters. Caching them saves rebuilding the SQL
+string and parsing it into a TextClause on every call, and hands the driver
+the same query text each time, which lets it reuse server-side prepared
+statements.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+
+
+@dataclass
+class StatementCacheStats:
+    """Counters of a StatementCache.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that built the statement.
+        evictions (int): Entries dropped to stay within maxsize.
+        size (int): Entries currently cached.
+        prepared_executions (int): Queries sent as server-side prepared statements.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    prepared_executions: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class StatementCache:
+    """Thread-safe LRU cache of built statements."""
+
+    def __init__(self, maxsize: int = DEFAULT_STATEMENT_CACHE_SIZE) -> None:
+        """StatementCache constructor.
+
+        Args:
+            maxsize (int): Most entries to keep. 0 disables caching.
+
+        Raises:
+            ValueError: If maxsize is negative.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+        self._stats = StatementCacheStats()
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the entry for key, building and caching it on a miss.
+
+        build runs outside the lock; if two threads miss the same key at once
+        both build it and the last one is kept.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key]
+            self._stats.misses += 1
+
+        value = build()
+        if self._maxsize == 0:
+            return value
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return value
+
+    def record_prepared(self, count: int = 1) -> None:
+        """Count queries executed as server-side prepared statements."""
+        with self._lock:
+            self._stats.prepared_executions += count
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> StatementCacheStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return StatementCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._entries),
+                prepared_executions=self._stats.prepared_executions,
+            )
@@ -0,0 +1,302 @@
+"""Sweeps of hnsw.ef_search and ivfflat.probes against exact search results.
+
+A sweep runs a sample of query embeddings once with an exact search, which
+scans the whole table, and then with each candidate value of the index's
+search parameter. Each value gets its recall@k against the exact results and
+its p50/p99 latency; the values no other value beats on both are the Pareto
+frontier, and the fastest of them reaching a target recall is recommended.
+PGEngine.save_query_options stores the recommendation for the table, and
+searches without query options apply it.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from .indexes import (
+    HNSW_MAX_EF_SEARCH,
+    ExactSearchQueryOptions,
+    HNSWQueryOptions,
+    IVFFlatQueryOptions,
+    QueryOptions,
+)
+
+if TYPE_CHECKING:
+    from .engine import PGEngine
+
+DEFAULT_EF_SEARCH_VALUES = (10, 20, 40, 80, 160, 320, 640, HNSW_MAX_EF_SEARCH)
+DEFAULT_PROBES_VALUES = (1, 2, 4, 8, 16, 32, 64, 128)
+DEFAULT_TARGET_RECALL = 0.95
+
+
+def query_options_grid(
+    index_type: str, values: Optional[Sequence[int]] = None
+) -> list[QueryOptions]:
+    """Query options of each value of the search parameter of an index type.
+
+    Args:
+        index_type (str): "hnsw" or "ivfflat".
+        values (Optional[Sequence[int]]): Values of hnsw.ef_search or
+            ivfflat.probes. Default: DEFAULT_EF_SEARCH_VALUES or DEFAULT_PROBES_VALUES.
+
+    Raises:
+        ValueError: If the index type has no search parameter.
+    """
+    if index_type == "hnsw":
+        return [
+            HNSWQueryOptions(ef_search=value)
+            for value in values or DEFAULT_EF_SEARCH_VALUES
+        ]
+    if index_type == "ivfflat":
+        return [
+            IVFFlatQueryOptions(probes=value) for value in values or DEFAULT_PROBES_VALUES
+        ]
+    raise ValueError(f"index_type must be 'hnsw' or 'ivfflat', got '{index_type}'")
+
+
+def recall_at_k(found: Sequence[Sequence[Any]], expected: Sequence[Sequence[Any]]) -> float:
+    """Share of the expected ids of all queries that were found."""
+    hits = sum(len(set(f) & set(e)) for f, e in zip(found, expected))
+    total = sum(len(e) for e in expected)
+    return hits / total if total else 1.0
+
+
+@dataclass
+class SweepPoint:
+    """Recall and latency of searches with one set of query options.
+
+    Attributes:
+        query_options (QueryOptions): The options the searches ran with.
+        recall (float): recall@k against the exact search.
+        p50_seconds (float): Median latency of one query.
+        p99_seconds (float): 99th percentile latency of one query.
+    """
+
+    query_options: QueryOptions
+    recall: float
+    p50_seconds: float
+    p99_seconds: float
+
+    def dominates(self, other: SweepPoint) -> bool:
+        """At least as good as other on recall and both latencies, and better on one."""
+        at_least = (
+            self.recall >= other.recall
+            and self.p50_seconds <= other.p50_seconds
+            and self.p99_seconds <= other.p99_seconds
+        )
+        return at_least and (
+            self.recall > other.recall
+            or self.p50_seconds < other.p50_seconds
+            or self.p99_seconds < other.p99_seconds
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "query_options": asdict(self.query_options),
+            "recall": self.recall,
+            "p50_ms": self.p50_seconds * 1e3,
+            "p99_ms": self.p99_seconds * 1e3,
+        }
+
+
+def pareto_frontier(points: Sequence[SweepPoint]) -> list[SweepPoint]:
+    """Points no other point dominates, by increasing recall."""
+    frontier = [
+        point
+        for point in points
+        if not any(other.dominates(point) for other in points)
+    ]
+    return sorted(frontier, key=lambda point: (point.recall, point.p99_seconds))
+
+
+def recommend(
+    points: Sequence[SweepPoint], target_recall: float = DEFAULT_TARGET_RECALL
+) -> Optional[SweepPoint]:
+    """The point with the lowest p99 latency reaching target_recall.
+
+    Falls back to the point with the highest recall if none reaches it.
+    """
+    if not points:
+        return None
+    reaching = [point for point in points if point.recall >= target_recall]
+    if reaching:
+        return min(reaching, key=lambda point: (point.p99_seconds, point.p50_seconds))
+    return max(points, key=lambda point: (point.recall, -point.p99_seconds))
+
+
+@dataclass
+class SweepResult:
+    """Outcome of sweep_query_options."""
+
+    k: int
+    queries: int
+    target_recall: float
+    exact: SweepPoint
+    points: list[SweepPoint] = field(default_factory=list)
+
+    @property
+    def frontier(self) -> list[SweepPoint]:
+        return pareto_frontier(self.points)
+
+    @property
+    def recommended(self) -> Optional[SweepPoint]:
+        return recommend(self.frontier, self.target_recall)
+
+    def to_dict(self) -> dict[str, Any]:
+        recommended = self.recommended
+        return {
+            "k": self.k,
+            "queries": self.queries,
+            "target_recall": self.target_recall,
+            "exact": self.exact.to_dict(),
+            "points": [point.to_dict() for point in self.points],
+            "frontier": [point.to_dict() for point in self.frontier],
+            "recommended": recommended.to_dict() if recommended else None,
+        }
+
+
+def _percentile(samples: Sequence[float], q: float) -> float:
+    return float(np.percentile(samples, q)) if len(samples) else float("nan")
+
+
+def _timed_search(
+    engine: PGEngine,
+    table_name: str,
+    queries: np.ndarray,
+    k: int,
+    query_options: QueryOptions,
+    id_column: str,
+    search_options: dict[str, Any],
+) -> tuple[list[list[Any]], list[float]]:
+    """Ids found by, and latency of, one search per query."""
+    found = []
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        rows = engine.similarity_search_batch(
+            table_name,
+            [query],
+            k,
+            id_column=id_column,
+            query_options=query_options,
+            **search_options,
+        )[0]
+        samples.append(time.perf_counter() - start)
+        found.append([row[id_column] for row in rows])
+    return found, samples
+
+
+def sweep_query_options(
+    engine: PGEngine,
+    table_name: str,
+    queries: Union[Sequence[Sequence[float]], np.ndarray],
+    candidates: Sequence[QueryOptions],
+    k: int = 10,
+    *,
+    target_recall: float = DEFAULT_TARGET_RECALL,
+    warmup: int = 10,
+    id_column: str = "langchain_id",
+    **search_options: Any,
+) -> SweepResult:
+    """Measure recall@k and latency of a table's searches with each candidate.
+
+    Queries run one at a time, as searches do in production, so latencies
+    include one round trip each. The first warmup queries of each candidate are
+    run untimed to load the index into the buffer cache.
+
+    Args:
+        engine (PGEngine): Engine connected to the table's database.
+        table_name (str): The database table name.
+        queries: Sample of query embeddings.
+        candidates (Sequence[QueryOptions]): Query options to measure, e.g.
+            from query_options_grid.
+        k (int): Number of rows per query. Default: 10.
+        target_recall (float): Recall the recommendation has to reach.
+            Default: 0.95.
+        warmup (int): Untimed queries per candidate. Default: 10.
+        id_column (str): Name of the id column. Default: "langchain_id".
+        **search_options: Other arguments of PGEngine.similarity_search_batch,
+            e.g. schema_name, embedding_column, distance_strategy or storage_type.
+
+    Returns:
+        SweepResult: The measured points, their Pareto frontier and the
+        recommended query options.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    search = dict(id_column=id_column, search_options=search_options)
+    expected, exact_samples = _timed_search(
+        engine, table_name, queries, k, ExactSearchQueryOptions(), **search
+    )
+    result = SweepResult(
+        k=k,
+        queries=len(queries),
+        target_recall=target_recall,
+        exact=SweepPoint(
+            query_options=ExactSearchQueryOptions(),
+            recall=1.0,
+            p50_seconds=_percentile(exact_samples, 50),
+            p99_seconds=_percentile(exact_samples, 99),
+        ),
+    )
+    for query_options in candidates:
+        _timed_search(engine, table_name, queries[:warmup], k, query_options, **search)
+        found, samples = _timed_search(
+            engine, table_name, queries, k, query_options, **search
+        )
+        result.points.append(
+            SweepPoint(
+                query_options=query_options,
+                recall=recall_at_k(found, expected),
+                p50_seconds=_percentile(samples, 50),
+                p99_seconds=_percentile(samples, 99),
+            )
+        )
+    return result
+
+
+def sample_query_embeddings(
+    engine: PGEngine,
+    table_name: str,
+    size: int,
+    *,
+    seed: int = 0,
+    **stream_options: Any,
+) -> np.ndarray:
+    """A uniform random sample of the table's embeddings, to use as queries.
+
+    Streams the whole table once with PGEngine.stream_rows, keeping a
+    reservoir of size rows.
+
+    Args:
+        engine (PGEngine): Engine connected to the table's database.
+        table_name (str): The database table name.
+        size (int): Number of embeddings to sample.
+        seed (int): Seed of the random generator. Default: 0.
+        **stream_options: Other arguments of PGEngine.stream_rows, e.g.
+            schema_name, embedding_column or storage_type.
+
+    Returns:
+        np.ndarray: float32 matrix of up to size rows.
+    """
+    rng = np.random.default_rng(seed)
+    reservoir: Optional[np.ndarray] = None
+    seen = 0
+    for batch in engine.stream_rows(table_name, **stream_options):
+        embeddings = batch.embeddings
+        if reservoir is None:
+            reservoir = np.empty((size, embeddings.shape[1]), dtype=np.float32)
+        fill = min(max(size - seen, 0), len(embeddings))
+        reservoir[seen : seen + fill] = embeddings[:fill]
+        # Algorithm R: row t replaces a random reservoir slot with probability size / (t + 1)
+        positions = np.arange(seen + fill, seen + len(embeddings))
+        slots = rng.integers(0, positions + 1) if len(positions) else positions
+        for row, slot in zip(np.flatnonzero(slots < size) + fill, slots[slots < size]):
+            reservoir[slot] = embeddings[row]
+        seen += len(embeddings)
+    if reservoir is None:
+        return np.empty((0, 0), dtype=np.float32)
+    return reservoir[: min(size, seen)]
@@ -0,0 +1,397 @@
+import asyncio
+import json
+import os
+from typing import Optional
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.validation import validate
+from aws_lambda_powertools.utilities.validation.exceptions import SchemaValidationError
+from .engine import PGEngine
+from .filters import compile_filter
+from .hybrid_search_config import HybridSearchConfig, reciprocal_rank_fusion, weighted_sum_ranking
+from .indexes import (
+    DISTANCE_STRATEGY_ALIASES,
+    STORAGE_TYPE_ALIASES,
+    DistanceStrategy,
+    HNSWQueryOptions,
+    IterativeScan,
+    IVFFlatQueryOptions,
+    QueryOptions,
+    SearchProfile,
+    validate_storage_type,
+)
+
+LOGGER = Logger()
+
+FUSION_FUNCTIONS = {
+    "weighted_sum": weighted_sum_ranking,
+    "rrf": reciprocal_rank_fusion,
+}
+
+# Upper bound on queries per request, to keep a single invocation within its timeout
+MAX_QUERIES_PER_REQUEST = 100
+
+class PartialDatabaseCredentialsError(Exception):
+    """Raised when only some database credentials are provided"""
+
+class SearchRequestValidationError(Exception):
+    """Raised when the search request is invalid"""
+
+# Schema for validating the similarity search request body
+SEARCH_REQUEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "table_name": {
+            "type": "string",
+            "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$",
+            "minLength": 1,
+            "maxLength": 63
+        },
+        "vectors": {
+            "type": "array",
+            "items": {"type": "array", "items": {"type": "number"}, "minItems": 1},
+            "minItems": 1,
+            "maxItems": MAX_QUERIES_PER_REQUEST
+        },
+        "texts": {
+            "type": "array",
+            "items": {"type": "string", "minLength": 1},
+            "minItems": 1,
+            "maxItems": MAX_QUERIES_PER_REQUEST
+        },
+        "k": {"type": "integer", "minimum": 1, "maximum": 1000},
+        "distance": {"type": "string", "enum": list(DISTANCE_STRATEGY_ALIASES)},
+        "storage_type": {"type": "string", "enum": list(STORAGE_TYPE_ALIASES)},
+        "metadata_columns": {
+            "type": "array",
+            "items": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$"}
+        },
+        "ef_search": {"type": "integer", "minimum": 1, "maximum": 1000},
+        "probes": {"type": "integer", "minimum": 1},
+        "iterative_scan": {"type": "string", "enum": [mode.value for mode in IterativeScan]},
+        "work_mem": {"type": "string", "pattern": "^\\d+\\s*(kB|MB|GB|TB)?$"},
+        "oversampling": {"type": "number", "minimum": 1, "maximum": 100},
+        "filter": {"type": "object", "minProperties": 1},
+        "hybrid": {
+            "type": "object",
+            "properties": {
+                "fts_query": {"type": "string", "minLength": 1},
+                "fusion": {"type": "string", "enum": list(FUSION_FUNCTIONS)},
+                "primary_top_k": {"type": "integer", "minimum": 1, "maximum": 1000},
+                "secondary_top_k": {"type": "integer", "minimum": 1, "maximum": 1000},
+                "tsv_column": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*$"},
+                "tsv_lang": {"type": "string", "pattern": "^[a-zA-Z_][a-zA-Z0-9_.]*$"},
+                "primary_results_weight": {"type": "number"},
+                "secondary_results_weight": {"type": "number"},
+                "rrf_k": {"type": "number", "minimum": 0}
+            },
+            "additionalProperties": False
+        }
+    },
+    "required": ["table_name"],
+    "oneOf": [{"required": ["vectors"]}, {"required": ["texts"]}],
+    "additionalProperties": False
+}
+
+# Embedding client for text queries, created on first use and kept for warm invocations
+_EMBEDDINGS = None
+
+# PGVECTOR_DRIVER values: the SQLAlchemy driver, and the raw driver pool
+# that runs search queries without SQLAlchemy (None: searches use SQLAlchemy)
+SUPPORTED_DRIVERS = {
+    "psycopg": ("psycopg", None),
+    "psycopg-native": ("psycopg", "psycopg"),
+    "asyncpg": ("asyncpg", None),
+    "asyncpg-native": ("asyncpg", "asyncpg"),
+}
+
+def _check_database_env_vars():
+    """Check that all DB-related environment variables are either set or unset together"""
+    db_vars = {
+        "DB_NAME": os.environ.get("DB_NAME"),
+        "DB_USER": os.environ.get("DB_USER"),
+        "DB_HOST": os.environ.get("DB_HOST"),
+        "DB_PORT": os.environ.get("DB_PORT"),
+        "DB_PASSWORD": os.environ.get("DB_PASSWORD"),
+        "EMBEDDING_MODEL_DIMENSIONS": os.environ.get("EMBEDDING_MODEL_DIMENSIONS"),
+        "PGVECTOR_DRIVER": os.environ.get("PGVECTOR_DRIVER")
+    }
+
+    present_vars = [name for name, value in db_vars.items() if value]
+    missing_vars = [name for name, value in db_vars.items() if not value]
+
+    if present_vars and missing_vars:
+        raise PartialDatabaseCredentialsError(
+            f"Some database credentials missing. Present: {present_vars}, Missing: {missing_vars}"
+        )
+    return db_vars
+
+def _connection_string_from_db_params(
+        driver: str,
+        host: str,
+        port: int,
+        database: str,
+        user: str,
+        password: str,
+    ) -> str:
+    """Construct PostgreSQL connection string from individual parameters.
+
+    Args:
+        driver: PGVECTOR_DRIVER value, one of SUPPORTED_DRIVERS
+        host: Database hostname or IP address
+        port: Database port number
+        database: Name of target database
+        user: Database authentication username
+        password: Database authentication password
+
+    Returns:
+        str: SQLAlchemy-compatible connection string
+
+    Raises:
+        NotImplementedError: If requested driver is not one of SUPPORTED_DRIVERS
+    """
+    if driver not in SUPPORTED_DRIVERS:
+        raise NotImplementedError(
+            f"Unsupported PGVECTOR_DRIVER '{driver}', expected one of {sorted(SUPPORTED_DRIVERS)}"
+        )
+    sqlalchemy_driver, _ = SUPPORTED_DRIVERS[driver]
+    return f"postgresql+{sqlalchemy_driver}://{user}:{password}@{host}:{port}/{database}"
+
+def _distance_strategy_from_request(request: dict) -> DistanceStrategy:
+    """Distance strategy of the search request; bit columns default to Hamming distance."""
+    default = "hamming" if request.get("storage_type") == "bit" else "cosine"
+    return DISTANCE_STRATEGY_ALIASES[request.get("distance", default)]
+
+def _parse_search_request(event: dict) -> dict:
+    """Parse and validate the JSON search request from the event body.
+
+    Args:
+        event: Lambda event containing a JSON string body
+
+    Returns:
+        dict: The validated search request
+
+    Raises:
+        SchemaValidationError: If the body doesn't match the expected schema
+        SearchRequestValidationError: If query vectors have mismatched dimensions,
+            the distance is not supported for the storage type, or the filter is invalid
+    """
+    body = event.get("body") or "{}"
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise SchemaValidationError(f"Request body is not valid JSON: {e}")
+    validate(event=body, schema=SEARCH_REQUEST_SCHEMA)
+
+    if "ef_search" in body and "probes" in body:
+        raise SearchRequestValidationError("Use either 'ef_search' or 'probes', not both.")
+    if "oversampling" in body and "probes" in body:
+        raise SearchRequestValidationError(
+            "'oversampling' searches a binary quantized HNSW index and does not use 'probes'."
+        )
+    if "oversampling" in body and body.get("storage_type", "vector") not in ("vector", "halfvec"):
+        raise SearchRequestValidationError(
+            "'oversampling' is only supported for vector and halfvec tables."
+        )
+    try:
+        validate_storage_type(
+            STORAGE_TYPE_ALIASES[body.get("storage_type", "vector")],
+            _distance_strategy_from_request(body),
+        )
+    except ValueError as e:
+        raise SearchRequestValidationError(str(e))
+    if "filter" in body:
+        try:
+            # Compiled again by the engine; this only checks the filter
+            compile_filter(body["filter"], typed_columns=body.get("metadata_columns", []))
+        except ValueError as e:
+            raise SearchRequestValidationError(f"Invalid filter: {e}")
+    vectors = body.get("vectors")
+    if vectors and len({len(vector) for vector in vectors}) != 1:
+        raise SearchRequestValidationError("All query vectors must have the same dimensions.")
+    return body
+
+def _query_options_from_request(request: dict) -> Optional[QueryOptions]:
+    """Build index query options from the search request, if any were given."""
+    if "iterative_scan" in request or "work_mem" in request:
+        return SearchProfile(**{
+            name: request[name]
+            for name in ("ef_search", "probes", "iterative_scan", "work_mem")
+            if name in request
+        })
+    if "ef_search" in request:
+        return HNSWQueryOptions(ef_search=request["ef_search"])
+    if "probes" in request:
+        return IVFFlatQueryOptions(probes=request["probes"])
+    return None
+
+def _hybrid_search_config_from_request(request: dict) -> Optional[HybridSearchConfig]:
+    """Build the hybrid search configuration from the search request, if hybrid search was asked for.
+
+    Raises:
+        SearchRequestValidationError: If the fusion parameters don't match the fusion function
+    """
+    settings = request.get("hybrid")
+    if settings is None:
+        return None
+
+    fusion = settings.get("fusion", "weighted_sum")
+    fusion_parameters = {
+        "weighted_sum": ["primary_results_weight", "secondary_results_weight"],
+        "rrf": ["rrf_k"],
+    }
+    unsupported = [
+        name
+        for names in fusion_parameters.values()
+        for name in names
+        if name in settings and name not in fusion_parameters[fusion]
+    ]
+    if unsupported:
+        raise SearchRequestValidationError(
+            f"Settings {unsupported} are not supported by the '{fusion}' fusion function."
+        )
+
+    config = HybridSearchConfig(
+        fusion_function=FUSION_FUNCTIONS[fusion],
+        fusion_function_parameters={
+            name: settings[name] for name in fusion_parameters[fusion] if name in settings
+        },
+    )
+    for name in ("fts_query", "primary_top_k", "secondary_top_k", "tsv_column", "tsv_lang"):
+        if name in settings:
+            setattr(config, name, settings[name])
+    if not config.fts_query and "texts" not in request:
+        raise SearchRequestValidationError(
+            "Hybrid search over query vectors needs 'hybrid.fts_query'."
+        )
+    return config
+
+async def _aembed_texts(texts: list[str], dimensions: int) -> list[list[float]]:
+    """Embed query texts with the configured OpenAI embedding model in one request.
+
+    Uses the async OpenAI client, so the handler's event loop is not blocked
+    while the request is in flight.
+
+    Environment Variables:
+        EMBEDDING_MODEL: OpenAI embedding model name (default: 'text-embedding-3-small')
+        OPENAI_API_KEY: OpenAI API key
+    """
+    global _EMBEDDINGS
+    if _EMBEDDINGS is None:
+        from langchain_openai import OpenAIEmbeddings
+
+        _EMBEDDINGS = OpenAIEmbeddings(
+            model=os.environ.get("EMBEDDING_MODEL", "text-embedding-3-small"),
+            dimensions=dimensions,
+        )
+    return await _EMBEDDINGS.aembed_documents(texts)
+
+
+@LOGGER.inject_lambda_context
+async def handler(event, context):
+    """AWS Lambda entry point for top-k similarity search over pgvector tables.
+
+    Searches tables created by PGEngine.init_vectorstore_table. The request body
+    holds one or many query vectors (or texts, which are embedded first); all
+    queries of a request are pipelined over a single pooled connection. With a
+    "hybrid" object, each query instead runs a vector and a full-text search
+    concurrently and fuses their results.
+
+    Example body:
+        {"table_name": "document_embeddings", "vectors": [[0.1, 0.2, ...]], "k": 4}
+
+    Args:
+        event: Lambda invocation event containing the JSON search request in its body
+        context: Lambda execution context (unused)
+
+    Returns:
+        dict: Lambda response format with status code and, per query, the ids,
+        distances and metadata of the nearest rows
+
+    Environment Variables:
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, EMBEDDING_MODEL_DIMENSIONS, PGVECTOR_DRIVER
+    """
+
+    try:
+        request = _parse_search_request(event)
+        table_name = request["table_name"]
+
+        db_vars = _check_database_env_vars()
+        connection_string = _connection_string_from_db_params(
+            driver=db_vars["PGVECTOR_DRIVER"],
+            database=db_vars["DB_NAME"],
+            user=db_vars["DB_USER"],
+            password=db_vars["DB_PASSWORD"],
+            host=db_vars["DB_HOST"],
+            port=db_vars["DB_PORT"],
+        )
+        _, native_driver = SUPPORTED_DRIVERS[db_vars["PGVECTOR_DRIVER"]]
+        engine = PGEngine.get_or_create(url=connection_string, native_driver=native_driver)
+        embedding_dimensions = int(db_vars["EMBEDDING_MODEL_DIMENSIONS"])
+
+        vectors = request.get("vectors") or await _aembed_texts(
+            request["texts"], embedding_dimensions
+        )
+        if len(vectors[0]) != embedding_dimensions:
+            raise SearchRequestValidationError(
+                f"Query vectors must have {embedding_dimensions} dimensions."
+            )
+
+        search_options = {
+            "metadata_columns": request.get("metadata_columns"),
+            "distance_strategy": _distance_strategy_from_request(request),
+            "query_options": _query_options_from_request(request),
+            "storage_type": STORAGE_TYPE_ALIASES[request.get("storage_type", "vector")],
+            "oversampling": request.get("oversampling"),
+            "filter": request.get("filter"),
+        }
+        hybrid_search_config = _hybrid_search_config_from_request(request)
+        if hybrid_search_config:
+            # Each hybrid query runs its vector and full-text legs concurrently
+            fts_queries = request.get("texts") or [hybrid_search_config.fts_query] * len(vectors)
+            results = await asyncio.gather(*(
+                engine.ahybrid_search(
+                    table_name,
+                    vector,
+                    request.get("k", 4),
+                    hybrid_search_config=hybrid_search_config,
+                    fts_query=hybrid_search_config.fts_query or fts_query,
+                    **search_options,
+                )
+                for vector, fts_query in zip(vectors, fts_queries)
+            ))
+        else:
+            results = await engine.asimilarity_search_batch(
+                table_name,
+                vectors,
+                request.get("k", 4),
+                **search_options,
+            )
+
+        LOGGER.info(f"Ran {len(vectors)} similarity queries against '{table_name}'.")
+        return {
+            "statusCode": 200,
+            "body": json.dumps(
+                {"results": results},
+                # ids are UUIDs by default
+                default=str,
+            )
+        }
+    except (SchemaValidationError, SearchRequestValidationError) as e:
+        LOGGER.error(f"Validation error: {e}")
+        return {
+            "statusCode": 400,
+            "body": f"Validation error: {str(e)}"
+        }
+    except PartialDatabaseCredentialsError as e:
+        LOGGER.error(f"Database credentials error: {e}")
+        return {
+            "statusCode": 400,
+            "body": f"Database credentials error: {str(e)}"
+        }
+    except Exception as e:
+        LOGGER.error(f"Failed to run similarity search: {e}")
+        return {
+            "statusCode": 500,
+            "body": "Failed to run similarity search."
+        }
@@ -0,0 +1,113 @@
+import importlib
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+engine_module = importlib.import_module("aurora-pgvector-extension-init.engine")
+indexes = importlib.import_module("aurora-pgvector-extension-init.indexes")
+ingest = importlib.import_module("aurora-pgvector-extension-init.ingest")
+
+VectorStorageType = indexes.VectorStorageType
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = engine_module.PGEngine.from_connection_string(database_url)
+    yield engine
+    engine._run_as_sync(engine.close())
+
+
+@pytest.fixture
+def table_name(engine):
+    table_name = f"test_bulk_{uuid.uuid4().hex[:8]}"
+    yield table_name
+    engine.drop_table(table_name)
+
+
+def fetch(engine, query: str, **params) -> list:
+    async def run() -> list:
+        async with engine._pool.connect() as conn:
+            return list((await conn.execute(text(query), params)).fetchall())
+
+    return engine._run_as_sync(run())
+
+
+def random_embeddings(rows: int, dimensions: int) -> np.ndarray:
+    return np.random.default_rng(0).standard_normal((rows, dimensions)).astype(np.float32)
+
+
+@pytest.mark.database
+@pytest.mark.parametrize(
+    "storage_type", [VectorStorageType.VECTOR, VectorStorageType.HALFVEC]
+)
+def test_add_embeddings_round_trip(engine, table_name, storage_type):
+    engine.init_vectorstore_table(
+        table_name,
+        4,
+        storage_type=storage_type,
+        metadata_columns=[engine_module.Column("source", "TEXT")],
+    )
+    embeddings = random_embeddings(3, 4)
+    ids = [uuid.uuid4() for _ in embeddings]
+    engine.add_embeddings(
+        table_name,
+        ingest.EmbeddingBatch(
+            contents=["a", "b", "c"],
+            embeddings=embeddings,
+            ids=ids,
+            metadatas=[{"source": "s", "page": i} for i in range(3)],
+        ),
+        metadata_columns=["source"],
+    )
+
+    rows = fetch(
+        engine,
+        f'SELECT langchain_id, source, langchain_metadata, embedding::text '
+        f'FROM "{table_name}" ORDER BY content',
+    )
+    assert [row[0] for row in rows] == ids
+    assert [row[1] for row in rows] == ["s"] * 3
+    assert [row[2] for row in rows] == [{"page": i} for i in range(3)]
+    stored = np.array([[float(x) for x in row[3].strip("[]").split(",")] for row in rows])
+    tolerance = 1e-2 if storage_type is VectorStorageType.HALFVEC else 1e-6
+    np.testing.assert_allclose(stored, embeddings, atol=tolerance)
+
+
+@pytest.mark.database
+def test_import_parquet_loads_rows_and_rebuilds_indexes(engine, table_name, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    engine.init_vectorstore_table(
+        table_name, 4, vector_index=indexes.HNSWIndex(name=f"{table_name}_hnsw")
+    )
+
+    embeddings = random_embeddings(10, 4)
+    path = tmp_path / "part-0000.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "id": [str(uuid.uuid4()) for _ in embeddings],
+                "content": [f"document {i}" for i in range(len(embeddings))],
+                "embedding": embeddings.tolist(),
+            }
+        ),
+        path,
+    )
+
+    stats = engine.import_parquet(
+        table_name, [path], batch_size=3, connections=2, maintenance_work_mem="64MB"
+    )
+
+    assert stats.rows == len(embeddings)
+    assert fetch(engine, f'SELECT count(*) FROM "{table_name}"')[0][0] == len(embeddings)
+    index_names = [
+        row[0]
+        for row in fetch(
+            engine,
+            "SELECT indexname FROM pg_indexes WHERE tablename = :table_name",
+            table_name=table_name,
+        )
+    ]
+    assert f"{table_name}_hnsw" in index_names
@@ -0,0 +1,103 @@
+import importlib
+import random
+
+import pytest
+
+hybrid_search_config = importlib.import_module(
+    "aurora-pgvector-extension-init.hybrid_search_config"
+)
+
+
+# The dict-based implementations the NumPy ones replaced, as reference
+def reference_weighted_sum_ranking(
+    primary_search_results,
+    secondary_search_results,
+    primary_results_weight=0.5,
+    secondary_results_weight=0.5,
+    fetch_top_k=4,
+):
+    weighted_scores = {}
+    for row in primary_search_results:
+        values = list(row.values())
+        doc_id = str(values[0])
+        distance = float(values[-1])
+        row_values = dict(row)
+        row_values["distance"] = primary_results_weight * distance
+        weighted_scores[doc_id] = row_values
+    for row in secondary_search_results:
+        values = list(row.values())
+        doc_id = str(values[0])
+        distance = float(values[-1])
+        primary_score = (
+            weighted_scores[doc_id]["distance"] if doc_id in weighted_scores else 0.0
+        )
+        row_values = dict(row)
+        row_values["distance"] = distance * secondary_results_weight + primary_score
+        weighted_scores[doc_id] = row_values
+    ranked_results = sorted(
+        weighted_scores.values(), key=lambda item: item["distance"], reverse=True
+    )
+    return ranked_results[:fetch_top_k]
+
+
+def reference_reciprocal_rank_fusion(
+    primary_search_results, secondary_search_results, rrf_k=60, fetch_top_k=4
+):
+    rrf_scores = {}
+    for search_results in (primary_search_results, secondary_search_results):
+        for rank, row in enumerate(
+            sorted(search_results, key=lambda item: item["distance"], reverse=True)
+        ):
+            doc_id = str(list(row.values())[0])
+            row_values = dict(row)
+            score = rrf_scores[doc_id]["distance"] if doc_id in rrf_scores else 0.0
+            row_values["distance"] = score + 1.0 / (rank + rrf_k)
+            rrf_scores[doc_id] = row_values
+    ranked_results = sorted(
+        rrf_scores.values(), key=lambda item: item["distance"], reverse=True
+    )
+    return ranked_results[:fetch_top_k]
+
+
+FUSIONS = [
+    (hybrid_search_config.weighted_sum_ranking, reference_weighted_sum_ranking),
+    (hybrid_search_config.reciprocal_rank_fusion, reference_reciprocal_rank_fusion),
+]
+
+
+def rows(leg, pairs):
+    # "content" tells which input row a result came from
+    return [
+        {"langchain_id": doc_id, "content": f"{leg}{i}", "distance": distance}
+        for i, (doc_id, distance) in enumerate(pairs)
+    ]
+
+
+@pytest.mark.parametrize("fusion, reference", FUSIONS)
+def test_duplicate_ids_and_tied_scores(fusion, reference):
+    primary = rows("p", [("a", 0.5), ("b", 0.9), ("a", 0.9), ("c", 0.5)])
+    secondary = rows("s", [("c", 0.2), ("d", 0.2), ("b", 0.7), ("c", 0.7)])
+    assert fusion(primary, secondary, fetch_top_k=10) == reference(
+        primary, secondary, fetch_top_k=10
+    )
+
+
+@pytest.mark.parametrize("fusion, reference", FUSIONS)
+def test_matches_reference_on_random_inputs(fusion, reference):
+    rng = random.Random(0)
+    for _ in range(500):
+        # Few ids and distances, so duplicates and ties are common; unsorted legs
+        primary, secondary = (
+            rows(
+                leg,
+                [
+                    (rng.choice("abcdefgh"), rng.choice([0.1, 0.2, 0.5, 0.9]))
+                    for _ in range(rng.randint(0, 8))
+                ],
+            )
+            for leg in ("p", "s")
+        )
+        fetch_top_k = rng.randint(0, 10)
+        assert fusion(primary, secondary, fetch_top_k=fetch_top_k) == reference(
+            primary, secondary, fetch_top_k=fetch_top_k
+        )
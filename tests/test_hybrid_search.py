@@ -0,0 +1,81 @@
+import importlib
+import uuid
+
+import numpy as np
+import pytest
+
+engine_module = importlib.import_module("aurora-pgvector-extension-init.engine")
+hybrid_search_config = importlib.import_module(
+    "aurora-pgvector-extension-init.hybrid_search_config"
+)
+indexes = importlib.import_module("aurora-pgvector-extension-init.indexes")
+ingest = importlib.import_module("aurora-pgvector-extension-init.ingest")
+
+DistanceStrategy = indexes.DistanceStrategy
+FUSION_FUNCTIONS = [
+    hybrid_search_config.reciprocal_rank_fusion,
+    hybrid_search_config.weighted_sum_ranking,
+]
+
+
+@pytest.mark.parametrize(
+    "distance_strategy, closer, farther",
+    [
+        (DistanceStrategy.COSINE_DISTANCE, 0.1, 0.8),
+        (DistanceStrategy.EUCLIDEAN, 0.5, 3.0),
+        (DistanceStrategy.INNER_PRODUCT, 0.9, 0.2),
+        (DistanceStrategy.HAMMING, 1, 7),
+        (DistanceStrategy.JACCARD, 0.1, 0.6),
+    ],
+)
+def test_similarity_ranks_closer_rows_higher(distance_strategy, closer, farther):
+    assert distance_strategy.similarity(closer) > distance_strategy.similarity(farther)
+
+
+@pytest.mark.parametrize("fusion_function", FUSION_FUNCTIONS)
+def test_closest_document_ranks_first_after_fusion(fusion_function):
+    # As returned by the ANN query: nearest first, by ascending cosine distance
+    dense = [
+        {"langchain_id": "near", "content": "", "distance": 0.05},
+        {"langchain_id": "middle", "content": "", "distance": 0.4},
+        {"langchain_id": "far", "content": "", "distance": 0.9},
+    ]
+    dense_scores = [
+        {**row, "distance": DistanceStrategy.COSINE_DISTANCE.similarity(row["distance"])}
+        for row in dense
+    ]
+    # The full-text search matches all three equally
+    sparse = [
+        {"langchain_id": doc_id, "content": "", "distance": 0.1}
+        for doc_id in ("far", "middle", "near")
+    ]
+    fused = fusion_function(dense_scores, sparse, fetch_top_k=3)
+    assert fused[0]["langchain_id"] == "near"
+
+
+@pytest.mark.database
+def test_hybrid_search_ranks_closest_document_first(database_url):
+    engine = engine_module.PGEngine.from_connection_string(database_url)
+    table_name = f"test_hybrid_{uuid.uuid4().hex[:8]}"
+    config = hybrid_search_config.HybridSearchConfig(
+        index_name=f"{table_name}_tsv_index"
+    )
+    engine.init_vectorstore_table(table_name, 3, hybrid_search_config=config)
+    try:
+        embeddings = np.array([[1, 0, 0], [0.6, 0.8, 0], [0, 0, 1]], dtype=np.float32)
+        ids = [uuid.uuid4() for _ in embeddings]
+        engine.add_embeddings(
+            table_name,
+            ingest.EmbeddingBatch(
+                contents=["apple pie", "apple tart", "apple juice"],
+                embeddings=embeddings,
+                ids=ids,
+            ),
+        )
+        results = engine.hybrid_search(
+            table_name, [1, 0, 0], 3, hybrid_search_config=config, fts_query="apple"
+        )
+        assert results[0]["langchain_id"] == ids[0]
+    finally:
+        engine.drop_table(table_name)
+        engine._run_as_sync(engine.close())
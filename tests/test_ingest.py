@@ -0,0 +1,77 @@
+import importlib
+import struct
+import uuid
+
+import numpy as np
+import pytest
+
+ingest = importlib.import_module("aurora-pgvector-extension-init.ingest")
+indexes = importlib.import_module("aurora-pgvector-extension-init.indexes")
+
+VectorStorageType = indexes.VectorStorageType
+
+
+def make_batch(rows: int = 3, dimensions: int = 5) -> "ingest.EmbeddingBatch":
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((rows, dimensions)).astype(np.float32)
+    # Some zeros, so sparsevec rows leave elements out
+    embeddings[:, 1] = 0
+    return ingest.EmbeddingBatch(
+        contents=[f"document {i}" for i in range(rows)],
+        embeddings=embeddings,
+        ids=[uuid.uuid4() for _ in range(rows)],
+        metadatas=[{"source": f"s{i}", "page": i} for i in range(rows)],
+    )
+
+
+@pytest.mark.parametrize("storage_type", list(VectorStorageType))
+def test_copy_rows_encodes_each_row(storage_type):
+    batch = make_batch()
+    rows = list(ingest.copy_rows(batch, storage_type, ["source"]))
+
+    assert len(rows) == len(batch)
+    for i, row in enumerate(rows):
+        row_id, content, vector, source, metadata = row
+        assert row_id == batch.ids[i]
+        assert content == batch.contents[i]
+        assert source == f"s{i}"
+        assert metadata == {"page": i}
+        # What the pre-encoded dumper hands to COPY
+        dumped = ingest.pre_encoded_dumper(0)(ingest._EncodedVector).dump(vector)
+        expected = bytes(
+            ingest.encode_embeddings(batch.embeddings[i : i + 1], storage_type)[0]
+        )
+        assert bytes(dumped) == expected
+
+
+def test_copy_rows_without_metadata_json():
+    batch = make_batch()
+    rows = list(
+        ingest.copy_rows(
+            batch, VectorStorageType.VECTOR, ["source"], include_metadata_json=False
+        )
+    )
+    assert [len(row) for row in rows] == [4] * len(batch)
+
+
+@pytest.mark.parametrize(
+    "storage_type", [VectorStorageType.VECTOR, VectorStorageType.HALFVEC]
+)
+def test_copy_rows_round_trip(storage_type):
+    batch = make_batch()
+    rows = ingest.copy_rows(batch, storage_type)
+    decoded = ingest.decode_embeddings([bytes(row[2]) for row in rows], storage_type)
+    tolerance = 1e-3 if storage_type is VectorStorageType.HALFVEC else 0
+    np.testing.assert_allclose(decoded, batch.embeddings, atol=tolerance)
+
+
+def test_encode_bits_layout():
+    encoded = ingest.encode_bits(np.array([[1, 0, 0, 0, 0, 0, 0, 0, 1]]))
+    assert bytes(encoded[0]) == struct.pack(">i", 9) + bytes([0b10000000, 0b10000000])
+
+
+def test_encode_sparsevecs_layout():
+    (encoded,) = ingest.encode_sparsevecs(np.array([[0.0, 2.0, 0.0, 3.0]]))
+    assert encoded == (
+        struct.pack(">iii", 4, 2, 0) + struct.pack(">ii", 1, 3) + struct.pack(">ff", 2.0, 3.0)
+    )
@@ -0,0 +1,92 @@
+import importlib
+
+import pytest
+
+tuning = importlib.import_module("aurora-pgvector-extension-init.tuning")
+indexes = importlib.import_module("aurora-pgvector-extension-init.indexes")
+
+SweepPoint = tuning.SweepPoint
+
+
+def point(ef_search: int, recall: float, p50_ms: float, p99_ms: float) -> "SweepPoint":
+    return SweepPoint(
+        query_options=indexes.HNSWQueryOptions(ef_search=ef_search),
+        recall=recall,
+        p50_seconds=p50_ms / 1e3,
+        p99_seconds=p99_ms / 1e3,
+    )
+
+
+def test_query_options_grid_defaults():
+    hnsw = tuning.query_options_grid("hnsw")
+    assert [options.ef_search for options in hnsw] == list(tuning.DEFAULT_EF_SEARCH_VALUES)
+    assert all(isinstance(options, indexes.HNSWQueryOptions) for options in hnsw)
+
+    ivfflat = tuning.query_options_grid("ivfflat")
+    assert [options.probes for options in ivfflat] == list(tuning.DEFAULT_PROBES_VALUES)
+    assert all(isinstance(options, indexes.IVFFlatQueryOptions) for options in ivfflat)
+
+
+def test_query_options_grid_values():
+    grid = tuning.query_options_grid("ivfflat", [3, 5])
+    assert [options.probes for options in grid] == [3, 5]
+
+
+def test_query_options_grid_rejects_other_index_types():
+    with pytest.raises(ValueError, match="index_type"):
+        tuning.query_options_grid("brin")
+
+
+def test_recall_at_k():
+    assert tuning.recall_at_k([[1, 2], [3, 9]], [[1, 2], [3, 4]]) == 0.75
+    assert tuning.recall_at_k([], []) == 1.0
+
+
+def test_dominates():
+    fast = point(10, 0.9, 1, 2)
+    slow = point(40, 0.9, 2, 3)
+    assert fast.dominates(slow)
+    assert not slow.dominates(fast)
+    # Equal points do not dominate each other
+    assert not fast.dominates(point(20, 0.9, 1, 2))
+    # Better recall but slower: a trade-off, not dominance
+    assert not point(80, 0.99, 5, 9).dominates(fast)
+
+
+def test_pareto_frontier_drops_dominated_points():
+    low = point(10, 0.80, 1, 2)
+    dominated = point(20, 0.80, 2, 3)
+    mid = point(40, 0.95, 2, 4)
+    high = point(80, 0.99, 4, 8)
+    frontier = tuning.pareto_frontier([high, dominated, mid, low])
+    assert frontier == [low, mid, high]
+
+
+def test_recommend_fastest_point_reaching_target():
+    points = [point(10, 0.80, 1, 2), point(40, 0.96, 2, 4), point(80, 0.99, 4, 8)]
+    assert tuning.recommend(points, 0.95) is points[1]
+
+
+def test_recommend_falls_back_to_highest_recall():
+    points = [point(10, 0.80, 1, 2), point(40, 0.90, 2, 4)]
+    assert tuning.recommend(points, 0.95) is points[1]
+
+
+def test_recommend_without_points():
+    assert tuning.recommend([]) is None
+
+
+def test_sweep_result_recommends_from_frontier():
+    result = tuning.SweepResult(
+        k=10,
+        queries=100,
+        target_recall=0.95,
+        exact=point(0, 1.0, 20, 30),
+        points=[point(10, 0.80, 1, 2), point(40, 0.96, 2, 4), point(80, 0.96, 3, 5)],
+    )
+    assert [p.query_options.ef_search for p in result.frontier] == [10, 40]
+    assert result.recommended.query_options.ef_search == 40
+    summary = result.to_dict()
+    assert summary["recommended"]["query_options"] == {"ef_search": 40}
+    assert summary["recommended"]["p99_ms"] == pytest.approx(4)
+    assert len(summary["points"]) == 3